@@ -22,6 +22,18 @@ class SemanticLayerConfig:
     host: str
     prod_environment_id: int
     service_token: str
+    cache_ttl_seconds: int = 300
+    cache_max_entries: int = 256
+    session_pool_size: int = 4
+    session_idle_timeout_seconds: int = 300
+    result_cache_ttl_seconds: int = 300
+    result_cache_max_bytes: int = 64 * 1024 * 1024
+    rollup_cached_results: bool = False
+    prefetch_metadata: bool = True
+    precompile_queries: bool = False
+    page_size: int = 1000
+    spill_dir: str | None = None
+    spill_max_bytes: int = 1024 * 1024 * 1024
 
 
 @dataclass
@@ -30,6 +42,9 @@ class DiscoveryConfig:
     host: str
     environment_id: int
     token: str
+    cache_ttl_seconds: int = 3600
+    cache_max_entries: int = 256
+    snapshot_dir: str | None = None
 
 
 @dataclass
@@ -55,6 +70,18 @@ class Config:
     dbt_cli_config: DbtCliConfig | None
     discovery_config: DiscoveryConfig | None
     semantic_layer_config: SemanticLayerConfig | None
+    coalesced_tools: frozenset[str] = frozenset()
+
+
+def _int_from_env(name: str, default: int, errors: list[str]) -> int:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        errors.append(f"{name} environment variable must be an integer, got {value!r}.")
+        return default
 
 
 def load_config() -> Config:
@@ -73,8 +100,48 @@ def load_config() -> Config:
     disable_discovery = os.environ.get("DISABLE_DISCOVERY", "false") == "true"
     disable_remote = os.environ.get("DISABLE_REMOTE", "true") == "true"
     multicell_account_prefix = os.environ.get("MULTICELL_ACCOUNT_PREFIX", None)
+    discovery_snapshot_dir = os.environ.get("DISCOVERY_SNAPSHOT_DIR")
+    semantic_layer_rollup_cached_results = (
+        os.environ.get("SEMANTIC_LAYER_ROLLUP_CACHED_RESULTS", "false") == "true"
+    )
+    semantic_layer_prefetch_metadata = (
+        os.environ.get("SEMANTIC_LAYER_PREFETCH_METADATA", "true") == "true"
+    )
+    semantic_layer_precompile_queries = (
+        os.environ.get("SEMANTIC_LAYER_PRECOMPILE_QUERIES", "false") == "true"
+    )
+    semantic_layer_spill_dir = os.environ.get("SEMANTIC_LAYER_SPILL_DIR")
+    coalesced_tools = os.environ.get("COALESCE_TOOL_CALLS", "")
 
-    errors = []
+    errors: list[str] = []
+    discovery_cache_ttl_seconds = _int_from_env(
+        "DISCOVERY_CACHE_TTL_SECONDS", 3600, errors
+    )
+    discovery_cache_max_entries = _int_from_env(
+        "DISCOVERY_CACHE_MAX_ENTRIES", 256, errors
+    )
+    semantic_layer_cache_ttl_seconds = _int_from_env(
+        "SEMANTIC_LAYER_CACHE_TTL_SECONDS", 300, errors
+    )
+    semantic_layer_cache_max_entries = _int_from_env(
+        "SEMANTIC_LAYER_CACHE_MAX_ENTRIES", 256, errors
+    )
+    semantic_layer_session_pool_size = _int_from_env(
+        "SEMANTIC_LAYER_SESSION_POOL_SIZE", 4, errors
+    )
+    semantic_layer_session_idle_timeout_seconds = _int_from_env(
+        "SEMANTIC_LAYER_SESSION_IDLE_TIMEOUT_SECONDS", 300, errors
+    )
+    semantic_layer_result_cache_ttl_seconds = _int_from_env(
+        "SEMANTIC_LAYER_RESULT_CACHE_TTL_SECONDS", 300, errors
+    )
+    semantic_layer_result_cache_max_bytes = _int_from_env(
+        "SEMANTIC_LAYER_RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024, errors
+    )
+    semantic_layer_page_size = _int_from_env("SEMANTIC_LAYER_PAGE_SIZE", 1000, errors)
+    semantic_layer_spill_max_bytes = _int_from_env(
+        "SEMANTIC_LAYER_SPILL_MAX_BYTES", 1024 * 1024 * 1024, errors
+    )
     if not disable_semantic_layer or not disable_discovery or not disable_remote:
         if not host:
             errors.append(
@@ -155,6 +222,9 @@ def load_config() -> Config:
             host=host,
             environment_id=actual_prod_environment_id,
             token=token,
+            cache_ttl_seconds=discovery_cache_ttl_seconds,
+            cache_max_entries=discovery_cache_max_entries,
+            snapshot_dir=discovery_snapshot_dir or None,
         )
 
     semantic_layer_config = None
@@ -164,6 +234,18 @@ def load_config() -> Config:
             host=host,
             prod_environment_id=actual_prod_environment_id,
             service_token=token,
+            cache_ttl_seconds=semantic_layer_cache_ttl_seconds,
+            cache_max_entries=semantic_layer_cache_max_entries,
+            session_pool_size=semantic_layer_session_pool_size,
+            session_idle_timeout_seconds=semantic_layer_session_idle_timeout_seconds,
+            result_cache_ttl_seconds=semantic_layer_result_cache_ttl_seconds,
+            result_cache_max_bytes=semantic_layer_result_cache_max_bytes,
+            rollup_cached_results=semantic_layer_rollup_cached_results,
+            prefetch_metadata=semantic_layer_prefetch_metadata,
+            precompile_queries=semantic_layer_precompile_queries,
+            page_size=semantic_layer_page_size,
+            spill_dir=semantic_layer_spill_dir or None,
+            spill_max_bytes=semantic_layer_spill_max_bytes,
         )
 
     local_user_id = None
@@ -189,4 +271,7 @@ def load_config() -> Config:
         dbt_cli_config=dbt_cli_config,
         discovery_config=discovery_config,
         semantic_layer_config=semantic_layer_config,
+        coalesced_tools=frozenset(
+            tool.strip() for tool in coalesced_tools.split(",") if tool.strip()
+        ),
     )
@@ -0,0 +1,54 @@
+import json
+import time
+from typing import Any
+
+from dbt_mcp.cache.ttl_cache import TTLCache
+
+LATEST_RUN_MARKER_CHECK_INTERVAL_SECONDS = 30
+
+
+class DiscoveryCache:
+    """Cache of Discovery API results keyed by environment and query.
+
+    The applied state of an environment only changes when a job runs, so
+    entries live for `ttl_seconds` unless the environment's latest run marker
+    changes, in which case they are all dropped. The marker should be
+    checked whenever `needs_marker_check` returns True, and the cache only
+    considers it checked once `update_marker` or `record_marker_check` is
+    called with the outcome.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        marker_check_interval_seconds: float = LATEST_RUN_MARKER_CHECK_INTERVAL_SECONDS,
+    ):
+        self.entries: TTLCache[tuple[int, str, str], Any] = TTLCache(
+            max_entries=max_entries, ttl_seconds=ttl_seconds
+        )
+        self.marker_check_interval_seconds = marker_check_interval_seconds
+        self._markers: dict[int, str | None] = {}
+        self._marker_checked_at: dict[int, float] = {}
+
+    def key(
+        self, environment_id: int, query_name: str, variables: dict
+    ) -> tuple[int, str, str]:
+        return (environment_id, query_name, json.dumps(variables, sort_keys=True))
+
+    def needs_marker_check(self, environment_id: int) -> bool:
+        checked_at = self._marker_checked_at.get(environment_id)
+        return (
+            checked_at is None
+            or time.monotonic() - checked_at >= self.marker_check_interval_seconds
+        )
+
+    def record_marker_check(self, environment_id: int) -> None:
+        """Don't check the marker again for an interval, even if it failed."""
+        self._marker_checked_at[environment_id] = time.monotonic()
+
+    def update_marker(self, environment_id: int, marker: str | None) -> None:
+        if environment_id in self._markers and self._markers[environment_id] != marker:
+            self.entries.invalidate_matching(lambda key: key[0] == environment_id)
+        self._markers[environment_id] = marker
+        self.record_marker_check(environment_id)
@@ -1,16 +1,87 @@
+import asyncio
+import logging
 import textwrap
-from typing import Literal, TypedDict
-
-import requests
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from functools import lru_cache
+from typing import Literal, TypedDict, TypeVar
 
+from dbt_mcp.discovery.cache import DiscoveryCache
 from dbt_mcp.gql.errors import raise_gql_error
+from dbt_mcp.gql.transport import GraphQLTransport, get_transport
+from dbt_mcp.mcp.singleflight import SingleFlight
 
 PAGE_SIZE = 100
+MIN_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 500
+# Page sizes grow while pages come back faster than this and shrink when slower
+TARGET_PAGE_LATENCY_SECONDS = 2.0
 MAX_NUM_MODELS = 1000
+# Number of models requested per `uniqueIds` filtered query
+BATCH_SIZE = 50
 
+T = TypeVar("T")
 
-class GraphQLQueries:
-    GET_MODELS = textwrap.dedent("""
+logger = logging.getLogger(__name__)
+
+# Selections of the model fields callers can ask for
+MODEL_FIELD_SELECTIONS = {
+    "name": "name",
+    "uniqueId": "uniqueId",
+    "description": "description",
+    "compiledCode": "compiledCode",
+    "database": "database",
+    "schema": "schema",
+    "catalog": textwrap.dedent("""\
+        catalog {
+            columns {
+                description
+                name
+                type
+            }
+        }"""),
+}
+# Always selected, results are keyed by them
+REQUIRED_MODEL_FIELDS = ("name", "uniqueId")
+# Only selected when asked for, their selections are added after
+# `GraphQLQueries` as they reuse its nested node fields
+LINEAGE_MODEL_FIELDS = ("parents", "children")
+DEFAULT_MODELS_FIELDS = ("name", "uniqueId", "description")
+DEFAULT_MODEL_DETAILS_FIELDS = tuple(
+    field for field in MODEL_FIELD_SELECTIONS if field not in LINEAGE_MODEL_FIELDS
+)
+
+
+def normalize_model_fields(
+    fields: Iterable[str] | None, default: tuple[str, ...]
+) -> tuple[str, ...]:
+    """Validate the requested fields and put them in a canonical order."""
+    if fields is None:
+        return default
+    requested = set(fields)
+    unknown = requested - MODEL_FIELD_SELECTIONS.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown model fields: {', '.join(sorted(unknown))}. "
+            + f"Available fields: {', '.join(MODEL_FIELD_SELECTIONS)}"
+        )
+    return tuple(
+        field
+        for field in MODEL_FIELD_SELECTIONS
+        if field in requested or field in REQUIRED_MODEL_FIELDS
+    )
+
+
+def _node_selection(fields: tuple[str, ...]) -> str:
+    return textwrap.indent(
+        "\n".join(MODEL_FIELD_SELECTIONS[field] for field in fields), " " * 24
+    )
+
+
+@lru_cache
+def get_models_query(fields: tuple[str, ...]) -> str:
+    return (
+        textwrap.dedent("""
         query GetModels(
             $environmentId: BigInt!,
             $modelsFilter: ModelAppliedFilter,
@@ -23,12 +94,13 @@ class GraphQLQueries:
                     models(filter: $modelsFilter, after: $after, first: $first, sort: $sort) {
                         pageInfo {
                             endCursor
+                            hasNextPage
                         }
                         edges {
                             node {
-                                name
-                                uniqueId
-                                description
+    """)
+        + _node_selection(fields)
+        + textwrap.dedent("""
                             }
                         }
                     }
@@ -36,8 +108,13 @@ class GraphQLQueries:
             }
         }
     """)
+    )
+
 
-    GET_MODEL_DETAILS = textwrap.dedent("""
+@lru_cache
+def get_model_details_query(fields: tuple[str, ...]) -> str:
+    return (
+        textwrap.dedent("""
         query GetModelDetails(
             $environmentId: BigInt!,
             $modelsFilter: ModelAppliedFilter
@@ -48,17 +125,91 @@ class GraphQLQueries:
                     models(filter: $modelsFilter, first: $first) {
                         edges {
                             node {
+    """)
+        + _node_selection(fields)
+        + textwrap.dedent("""
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """)
+    )
+
+
+@lru_cache
+def get_models_details_by_name_query(fields: tuple[str, ...], num_models: int) -> str:
+    """Query the details of `num_models` models, each filtered by its name.
+
+    The API filters on one identifier at a time, so each model gets its own
+    aliased `models{i}` field and `$modelsFilter{i}` variable.
+    """
+    variables = "".join(
+        f",\n    $modelsFilter{i}: ModelAppliedFilter" for i in range(num_models)
+    )
+    models = "".join(
+        f"""
+            models{i}: models(filter: $modelsFilter{i}, first: 1) {{
+                edges {{
+                    node {{
+{_node_selection(fields)}
+                    }}
+                }}
+            }}"""
+        for i in range(num_models)
+    )
+    return f"""
+query GetModelsDetailsByName(
+    $environmentId: BigInt!{variables}
+) {{
+    environment(id: $environmentId) {{
+        applied {{{models}
+        }}
+    }}
+}}
+"""
+
+
+class GraphQLQueries:
+    GET_LATEST_RUN_MARKER = textwrap.dedent("""
+        query GetLatestRunMarker($environmentId: BigInt!) {
+            environment(id: $environmentId) {
+                applied {
+                    lastUpdatedAt
+                }
+            }
+        }
+    """)
+
+    GET_MODELS = get_models_query(DEFAULT_MODELS_FIELDS)
+
+    GET_MODEL_DETAILS = get_model_details_query(DEFAULT_MODEL_DETAILS_FIELDS)
+
+    GET_MODELS_CATALOG = textwrap.dedent("""
+        query GetModelsCatalog(
+            $environmentId: BigInt!,
+            $modelsFilter: ModelAppliedFilter,
+            $after: String,
+            $first: Int,
+            $sort: AppliedModelSort
+        ) {
+            environment(id: $environmentId) {
+                applied {
+                    models(filter: $modelsFilter, after: $after, first: $first, sort: $sort) {
+                        pageInfo {
+                            endCursor
+                            hasNextPage
+                        }
+                        edges {
+                            node {
                                 name
                                 uniqueId
-                                compiledCode
                                 description
-                                database
-                                schema
                                 catalog {
                                     columns {
                                         description
                                         name
-                                        type
                                     }
                                 }
                             }
@@ -143,6 +294,7 @@ class GraphQLQueries:
                         }
                         edges {
                             node {
+                                uniqueId
                                 parents 
     """)
         + COMMON_FIELDS_PARENTS_CHILDREN
@@ -172,6 +324,7 @@ class GraphQLQueries:
                         }
                         edges {
                             node {
+                                uniqueId
                                 children 
     """)
         + COMMON_FIELDS_PARENTS_CHILDREN
@@ -186,10 +339,171 @@ class GraphQLQueries:
     """)
     )
 
+    LINEAGE_NODE_FIELDS = textwrap.dedent("""
+        {
+        ... on ExposureAppliedStateNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on ExternalModelNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on MacroDefinitionNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on MetricDefinitionNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on ModelAppliedStateNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on SavedQueryDefinitionNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on SeedAppliedStateNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on SemanticModelDefinitionNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on SnapshotAppliedStateNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on SourceAppliedStateNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        ... on TestAppliedStateNestedNode {
+            resourceType
+            uniqueId
+            name
+            description
+        }
+        }
+    """)
+
+    GET_MODELS_LINEAGE = (
+        textwrap.dedent("""
+        query GetModelsLineage(
+            $environmentId: BigInt!,
+            $modelsFilter: ModelAppliedFilter,
+            $after: String,
+            $first: Int,
+            $sort: AppliedModelSort
+        ) {
+            environment(id: $environmentId) {
+                applied {
+                    models(filter: $modelsFilter, after: $after, first: $first, sort: $sort) {
+                        pageInfo {
+                            endCursor
+                            hasNextPage
+                        }
+                        edges {
+                            node {
+                                resourceType
+                                uniqueId
+                                name
+                                description
+                                parents
+    """)
+        + LINEAGE_NODE_FIELDS
+        + textwrap.dedent("""
+                                children
+    """)
+        + LINEAGE_NODE_FIELDS
+        + textwrap.dedent("""
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """)
+    )
+
+    # Aliased to `models` so that it can be paged through with `iter_models`
+    GET_SNAPSHOTS_LINEAGE = (
+        textwrap.dedent("""
+        query GetSnapshotsLineage(
+            $environmentId: BigInt!,
+            $after: String,
+            $first: Int
+        ) {
+            environment(id: $environmentId) {
+                applied {
+                    models: snapshots(after: $after, first: $first) {
+                        pageInfo {
+                            endCursor
+                            hasNextPage
+                        }
+                        edges {
+                            node {
+                                resourceType
+                                uniqueId
+                                name
+                                description
+                                parents
+    """)
+        + LINEAGE_NODE_FIELDS
+        + textwrap.dedent("""
+                                children
+    """)
+        + LINEAGE_NODE_FIELDS
+        + textwrap.dedent("""
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    """)
+    )
+
+
+MODEL_FIELD_SELECTIONS.update(
+    {
+        field: f"{field} {GraphQLQueries.COMMON_FIELDS_PARENTS_CHILDREN}}}"
+        for field in LINEAGE_MODEL_FIELDS
+    }
+)
+
 
 class MetadataAPIClient:
     def __init__(
-        self, *, host: str, token: str, multicell_account_prefix: str | None = None
+        self,
+        *,
+        host: str,
+        token: str,
+        multicell_account_prefix: str | None = None,
+        transport: GraphQLTransport | None = None,
     ):
         if multicell_account_prefix:
             self.url = f"https://{multicell_account_prefix}.metadata.{host}/graphql"
@@ -199,14 +513,15 @@ class MetadataAPIClient:
             "Authorization": f"Bearer {token}",
             "Content-Type": "application/json",
         }
+        self.transport = transport or get_transport()
+        self.transport.register_url(self.url)
 
-    def execute_query(self, query: str, variables: dict) -> dict:
-        response = requests.post(
-            url=self.url,
+    async def execute_query(self, query: str, variables: dict) -> dict:
+        return await self.transport.post(
+            self.url,
             json={"query": query, "variables": variables},
             headers=self.headers,
         )
-        return response.json()
 
 
 class ModelFilter(TypedDict, total=False):
@@ -214,9 +529,61 @@ class ModelFilter(TypedDict, total=False):
 
 
 class ModelsFetcher:
-    def __init__(self, api_client: MetadataAPIClient, environment_id: int):
+    def __init__(
+        self,
+        api_client: MetadataAPIClient,
+        environment_id: int,
+        cache: DiscoveryCache | None = None,
+    ):
         self.api_client = api_client
         self.environment_id = environment_id
+        self.cache = cache
+        self._marker_checks: SingleFlight[None] = SingleFlight()
+
+    async def _check_latest_run_marker(self, cache: DiscoveryCache) -> None:
+        try:
+            result = await self.api_client.execute_query(
+                GraphQLQueries.GET_LATEST_RUN_MARKER,
+                {"environmentId": self.environment_id},
+            )
+            raise_gql_error(result)
+        except Exception as e:
+            logger.warning(f"Error checking the latest run marker: {e}")
+            cache.record_marker_check(self.environment_id)
+            return
+        marker = result["data"]["environment"]["applied"]["lastUpdatedAt"]
+        cache.update_marker(self.environment_id, marker)
+
+    async def _cached(
+        self, query_name: str, variables: dict, fetch: Callable[[], Awaitable[T]]
+    ) -> T:
+        if self.cache is None:
+            return await fetch()
+        cache = self.cache
+        if cache.needs_marker_check(self.environment_id):
+            # Callers wait for a check in flight, as it may drop the entries
+            await self._marker_checks.do(
+                self.environment_id,
+                "latest_run_marker",
+                lambda: self._check_latest_run_marker(cache),
+            )
+        key = cache.key(self.environment_id, query_name, variables)
+        cached_result = cache.entries.get(key)
+        if cached_result is not None:
+            return cached_result
+        result = await fetch()
+        cache.entries.set(key, result)
+        return result
+
+    async def _execute_cached_query(
+        self, query_name: str, query: str, variables: dict
+    ) -> dict:
+        async def fetch() -> dict:
+            result = await self.api_client.execute_query(query, variables)
+            raise_gql_error(result)
+            return result
+
+        return await self._cached(query_name, variables, fetch)
 
     def _parse_response_to_json(self, result: dict) -> list[dict]:
         raise_gql_error(result)
@@ -235,34 +602,107 @@ class ModelsFetcher:
             parsed_edges.append(node)
         return parsed_edges
 
-    def fetch_models(self, model_filter: ModelFilter | None = None) -> list[dict]:
-        has_next_page = True
-        after_cursor: str = ""
-        all_edges: list[dict] = []
-        while has_next_page and len(all_edges) < MAX_NUM_MODELS:
-            variables = {
-                "environmentId": self.environment_id,
-                "after": after_cursor,
-                "first": PAGE_SIZE,
-                "modelsFilter": model_filter or {},
-                "sort": {"field": "queryUsageCount", "direction": "desc"},
-            }
+    async def _fetch_models_page(
+        self,
+        query: str,
+        model_filter: ModelFilter | None,
+        after_cursor: str,
+        page_size: int,
+    ) -> tuple[dict, float]:
+        variables = {
+            "environmentId": self.environment_id,
+            "after": after_cursor,
+            "first": page_size,
+            "modelsFilter": model_filter or {},
+            "sort": {"field": "queryUsageCount", "direction": "desc"},
+        }
+        start_time = time.monotonic()
+        result = await self.api_client.execute_query(query, variables)
+        return result, time.monotonic() - start_time
 
-            result = self.api_client.execute_query(GraphQLQueries.GET_MODELS, variables)
-            all_edges.extend(self._parse_response_to_json(result))
+    def _next_page_size(self, page_size: int, page_latency_seconds: float) -> int:
+        if page_latency_seconds < TARGET_PAGE_LATENCY_SECONDS / 2:
+            return min(page_size * 2, MAX_PAGE_SIZE)
+        if page_latency_seconds > TARGET_PAGE_LATENCY_SECONDS:
+            return max(page_size // 2, MIN_PAGE_SIZE)
+        return page_size
 
-            previous_after_cursor = after_cursor
-            after_cursor = result["data"]["environment"]["applied"]["models"][
-                "pageInfo"
-            ]["endCursor"]
-            if previous_after_cursor == after_cursor:
-                has_next_page = False
+    async def iter_models(
+        self,
+        model_filter: ModelFilter | None = None,
+        limit: int | None = MAX_NUM_MODELS,
+        query: str = GraphQLQueries.GET_MODELS,
+    ) -> AsyncIterator[dict]:
+        """Stream models page by page, up to `limit` models.
 
-        return all_edges
+        The request for the next page is sent as soon as the cursor of the
+        current one is known, so parsing and consuming a page overlaps with
+        the round trip of the next one.
+        """
+        page_size = PAGE_SIZE if limit is None else min(PAGE_SIZE, limit)
+        after_cursor = ""
+        num_models = 0
+        next_page: asyncio.Task | None = asyncio.create_task(
+            self._fetch_models_page(query, model_filter, after_cursor, page_size)
+        )
+        try:
+            while next_page is not None:
+                result, page_latency_seconds = await next_page
+                next_page = None
+                raise_gql_error(result)
+                models = result["data"]["environment"]["applied"]["models"]
+                page_info = models["pageInfo"]
+                previous_after_cursor = after_cursor
+                after_cursor = page_info["endCursor"]
+                num_models_requested = num_models + len(models["edges"] or [])
+                page_size = self._next_page_size(page_size, page_latency_seconds)
+                if limit is not None:
+                    page_size = min(page_size, limit - num_models_requested)
+                if (
+                    page_info.get("hasNextPage")
+                    and after_cursor
+                    and after_cursor != previous_after_cursor
+                    and page_size > 0
+                ):
+                    next_page = asyncio.create_task(
+                        self._fetch_models_page(
+                            query, model_filter, after_cursor, page_size
+                        )
+                    )
 
-    def fetch_model_details(
-        self, model_name: str, unique_id: str | None = None
+                for node in self._parse_response_to_json(result):
+                    if limit is not None and num_models >= limit:
+                        return
+                    num_models += 1
+                    yield node
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def fetch_models(
+        self,
+        model_filter: ModelFilter | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict]:
+        fields = normalize_model_fields(fields, DEFAULT_MODELS_FIELDS)
+        query = get_models_query(fields)
+
+        async def fetch() -> list[dict]:
+            return [
+                model async for model in self.iter_models(model_filter, query=query)
+            ]
+
+        return await self._cached(
+            "models", {"modelsFilter": model_filter, "fields": fields}, fetch
+        )
+
+    async def fetch_model_details(
+        self,
+        model_name: str,
+        unique_id: str | None = None,
+        fields: Iterable[str] | None = None,
     ) -> dict:
+        fields = normalize_model_fields(fields, DEFAULT_MODEL_DETAILS_FIELDS)
         model_filters: dict[str, list[str] | str] = (
             {"uniqueIds": [unique_id]} if unique_id else {"identifier": model_name}
         )
@@ -271,16 +711,17 @@ class ModelsFetcher:
             "modelsFilter": model_filters,
             "first": 1,
         }
-        result = self.api_client.execute_query(
-            GraphQLQueries.GET_MODEL_DETAILS, variables
+        result = await self._execute_cached_query(
+            f"model_details[{','.join(fields)}]",
+            get_model_details_query(fields),
+            variables,
         )
-        raise_gql_error(result)
         edges = result["data"]["environment"]["applied"]["models"]["edges"]
         if not edges:
             return {}
         return edges[0]["node"]
 
-    def fetch_model_parents(
+    async def fetch_model_parents(
         self, model_name: str, unique_id: str | None = None
     ) -> list[dict]:
         model_filters: dict[str, list[str] | str] = (
@@ -291,16 +732,15 @@ class ModelsFetcher:
             "modelsFilter": model_filters,
             "first": 1,
         }
-        result = self.api_client.execute_query(
-            GraphQLQueries.GET_MODEL_PARENTS, variables
+        result = await self._execute_cached_query(
+            "model_parents", GraphQLQueries.GET_MODEL_PARENTS, variables
         )
-        raise_gql_error(result)
         edges = result["data"]["environment"]["applied"]["models"]["edges"]
         if not edges:
             return []
         return edges[0]["node"]["parents"]
 
-    def fetch_model_children(
+    async def fetch_model_children(
         self, model_name: str, unique_id: str | None = None
     ) -> list[dict]:
         model_filters: dict[str, list[str] | str] = (
@@ -311,11 +751,100 @@ class ModelsFetcher:
             "modelsFilter": model_filters,
             "first": 1,
         }
-        result = self.api_client.execute_query(
-            GraphQLQueries.GET_MODEL_CHILDREN, variables
+        result = await self._execute_cached_query(
+            "model_children", GraphQLQueries.GET_MODEL_CHILDREN, variables
         )
-        raise_gql_error(result)
         edges = result["data"]["environment"]["applied"]["models"]["edges"]
         if not edges:
             return []
         return edges[0]["node"]["children"]
+
+    async def _fetch_models_batch(
+        self, query_name: str, query: str, unique_ids: list[str]
+    ) -> dict[str, dict]:
+        chunks = [
+            unique_ids[i : i + BATCH_SIZE]
+            for i in range(0, len(unique_ids), BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._execute_cached_query(
+                    query_name,
+                    query,
+                    {
+                        "environmentId": self.environment_id,
+                        "modelsFilter": {"uniqueIds": chunk},
+                        "first": len(chunk),
+                    },
+                )
+                for chunk in chunks
+            )
+        )
+        return {
+            node["uniqueId"]: node
+            for result in results
+            for node in self._parse_response_to_json(result)
+        }
+
+    async def _fetch_models_by_name(
+        self, fields: tuple[str, ...], model_names: list[str]
+    ) -> dict[str, dict]:
+        chunks = [
+            model_names[i : i + BATCH_SIZE]
+            for i in range(0, len(model_names), BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._execute_cached_query(
+                    f"models_details_by_name[{','.join(fields)}]",
+                    get_models_details_by_name_query(fields, len(chunk)),
+                    {
+                        "environmentId": self.environment_id,
+                        **{
+                            f"modelsFilter{i}": {"identifier": name}
+                            for i, name in enumerate(chunk)
+                        },
+                    },
+                )
+                for chunk in chunks
+            )
+        )
+        details: dict[str, dict] = {}
+        for chunk, result in zip(chunks, results, strict=True):
+            applied = result["data"]["environment"]["applied"]
+            for i, name in enumerate(chunk):
+                edges = applied[f"models{i}"]["edges"]
+                details[name] = edges[0]["node"] if edges else {}
+        return details
+
+    async def fetch_models_details(
+        self,
+        model_names: list[str] | None = None,
+        unique_ids: list[str] | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> dict[str, dict]:
+        """Fetch the details of several models, keyed by name or uniqueId.
+
+        Models are fetched in batches of `BATCH_SIZE`. The API can only
+        filter on one name at a time, so a batch of models requested by name
+        is one query with a `models` field per model. Asking for the
+        `parents` or `children` fields batches lineage lookups the same way.
+        """
+        fields = normalize_model_fields(fields, DEFAULT_MODEL_DETAILS_FIELDS)
+        model_names = list(dict.fromkeys(model_names or []))
+        unique_ids = list(dict.fromkeys(unique_ids or []))
+        details_by_unique_id, details_by_name = await asyncio.gather(
+            self._fetch_models_batch(
+                f"model_details[{','.join(fields)}]",
+                get_model_details_query(fields),
+                unique_ids,
+            ),
+            self._fetch_models_by_name(fields, model_names),
+        )
+        return {
+            **details_by_name,
+            **{
+                unique_id: details_by_unique_id.get(unique_id, {})
+                for unique_id in unique_ids
+            },
+        }
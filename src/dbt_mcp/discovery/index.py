@@ -0,0 +1,137 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Generic, TypeVar
+
+from dbt_mcp.discovery.client import ModelsFetcher
+from dbt_mcp.discovery.snapshot import DiscoverySnapshot
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class RefreshingIndex(ABC, Generic[T]):
+    """An in-memory structure built from every model of the environment.
+
+    The index is built on first use, unless `load_snapshot` loaded it from
+    the snapshot at startup. Once it is older than the refresh interval (a
+    snapshot always is), it keeps being served while a new one is built in
+    the background.
+    """
+
+    name: str
+    query: str
+
+    def __init__(
+        self,
+        models_fetcher: ModelsFetcher,
+        refresh_interval_seconds: float,
+        snapshot: DiscoverySnapshot | None = None,
+    ):
+        self.models_fetcher = models_fetcher
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.snapshot = snapshot
+        self._value: T | None = None
+        self._built_at = 0.0
+        self._build_lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+        self._first_build_task: asyncio.Task | None = None
+
+    @abstractmethod
+    def _from_models(self, models: list[dict]) -> T: ...
+
+    async def _fetch_all(self, query: str) -> list[dict]:
+        return [
+            model
+            async for model in self.models_fetcher.iter_models(limit=None, query=query)
+        ]
+
+    async def _fetch_models(self) -> list[dict]:
+        return await self._fetch_all(self.query)
+
+    async def _build(self) -> T:
+        start_time = time.monotonic()
+        models = await self._fetch_models()
+        value = self._from_models(models)
+        self._value = value
+        self._built_at = time.monotonic()
+        logger.info(
+            f"Built {self.name} from {len(models)} models "
+            + f"in {self._built_at - start_time:.2f}s"
+        )
+        if self.snapshot is not None:
+            try:
+                await asyncio.to_thread(
+                    self.snapshot.save,
+                    self.models_fetcher.environment_id,
+                    self.name,
+                    models,
+                )
+            except Exception as e:
+                logger.warning(f"Error saving {self.name} snapshot: {e}")
+        return value
+
+    async def _load_snapshot(self) -> T | None:
+        if self.snapshot is None:
+            return None
+        try:
+            models = await asyncio.to_thread(
+                self.snapshot.load, self.models_fetcher.environment_id, self.name
+            )
+        except Exception as e:
+            logger.warning(f"Error loading {self.name} snapshot: {e}")
+            return None
+        if models is None:
+            return None
+        value = self._from_models(models)
+        self._value = value
+        # Revalidate against the API straight away
+        self._built_at = float("-inf")
+        logger.info(f"Loaded {self.name} from a snapshot of {len(models)} models")
+        return value
+
+    async def _refresh(self) -> None:
+        try:
+            await self._build()
+        except Exception as e:
+            logger.error(f"Error refreshing {self.name}: {e}")
+
+    async def load_snapshot(self) -> None:
+        """Load the snapshot, if there is one, and start revalidating it."""
+        if self.snapshot is None:
+            return
+        async with self._build_lock:
+            if self._value is None and await self._load_snapshot() is None:
+                return
+        await self.get()
+
+    async def get(self) -> T:
+        if self._value is None:
+            async with self._build_lock:
+                if self._value is None and await self._load_snapshot() is None:
+                    return await self._build()
+        assert self._value is not None
+        is_stale = time.monotonic() - self._built_at > self.refresh_interval_seconds
+        if is_stale and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return self._value
+
+    async def _get_in_background(self) -> None:
+        try:
+            await self.get()
+        except Exception as e:
+            logger.error(f"Error building {self.name}: {e}")
+
+    async def get_if_built(self) -> T | None:
+        """Like `get`, but returns None instead of waiting for a first build.
+
+        The first build is started in the background, so that later calls
+        can use the index.
+        """
+        if self._value is None:
+            if self._first_build_task is None or self._first_build_task.done():
+                self._first_build_task = asyncio.create_task(self._get_in_background())
+            return None
+        return await self.get()
@@ -0,0 +1,186 @@
+import asyncio
+from array import array
+from collections import deque
+from collections.abc import Iterable
+
+from dbt_mcp.discovery.client import GraphQLQueries, ModelsFetcher
+from dbt_mcp.discovery.index import RefreshingIndex
+from dbt_mcp.discovery.snapshot import DiscoverySnapshot
+
+LINEAGE_REFRESH_INTERVAL_SECONDS = 300
+
+# Fields of the parents and children returned by the per-model queries
+NEIGHBOUR_FIELDS = ("resourceType", "name", "description")
+
+
+def _to_csr(num_nodes: int, edges: list[tuple[int, int]]) -> tuple[array, array]:
+    """Pack (source, target) edges into CSR offsets and targets arrays."""
+    offsets = array("i", [0] * (num_nodes + 1))
+    for source, _ in edges:
+        offsets[source + 1] += 1
+    for i in range(num_nodes):
+        offsets[i + 1] += offsets[i]
+    targets = array("i", [0] * len(edges))
+    positions = offsets[:-1]
+    for source, target in edges:
+        targets[positions[source]] = target
+        positions[source] += 1
+    return offsets, targets
+
+
+class LineageGraph:
+    """Lineage DAG of an environment, stored as CSR adjacency arrays.
+
+    Nodes are the applied models and snapshots, and every node directly
+    upstream or downstream of one (sources, seeds, tests, exposures, ...).
+    """
+
+    def __init__(self, nodes: list[dict], parent_edges: Iterable[tuple[int, int]]):
+        self.nodes = nodes
+        self.index = {node["uniqueId"]: i for i, node in enumerate(nodes)}
+        self.model_names: dict[str, int] = {}
+        for i, node in enumerate(nodes):
+            if node.get("resourceType") == "model":
+                self.model_names.setdefault(node["name"], i)
+        edges = sorted(set(parent_edges))
+        self.parent_offsets, self.parent_targets = _to_csr(len(nodes), edges)
+        self.child_offsets, self.child_targets = _to_csr(
+            len(nodes), sorted((parent, child) for child, parent in edges)
+        )
+
+    @classmethod
+    def from_models(cls, models: Iterable[dict]) -> "LineageGraph":
+        """Build the graph from models and snapshots queried with
+        `GET_MODELS_LINEAGE` and `GET_SNAPSHOTS_LINEAGE`."""
+        nodes: list[dict] = []
+        index: dict[str, int] = {}
+        parent_edges: list[tuple[int, int]] = []
+
+        def node_index(node: dict) -> int:
+            unique_id = node["uniqueId"]
+            if unique_id not in index:
+                index[unique_id] = len(nodes)
+                nodes.append(
+                    {
+                        "uniqueId": unique_id,
+                        "name": node.get("name"),
+                        "resourceType": node.get("resourceType"),
+                        "description": node.get("description"),
+                    }
+                )
+            return index[unique_id]
+
+        for model in models:
+            model_index = node_index({"resourceType": "model", **model})
+            for parent in model.get("parents") or []:
+                if parent.get("uniqueId"):
+                    parent_edges.append((model_index, node_index(parent)))
+            for child in model.get("children") or []:
+                if child.get("uniqueId"):
+                    parent_edges.append((node_index(child), model_index))
+        return cls(nodes, parent_edges)
+
+    def resolve(self, model_name: str, unique_id: str | None = None) -> int | None:
+        if unique_id:
+            return self.index.get(unique_id)
+        return self.model_names.get(model_name)
+
+    def _neighbours(self, offsets: array, targets: array, node: int) -> array:
+        return targets[offsets[node] : offsets[node + 1]]
+
+    def _neighbour(self, node: int) -> dict:
+        return {field: self.nodes[node][field] for field in NEIGHBOUR_FIELDS}
+
+    def parents(self, node: int) -> list[dict]:
+        return [
+            self._neighbour(parent)
+            for parent in self._neighbours(
+                self.parent_offsets, self.parent_targets, node
+            )
+        ]
+
+    def children(self, node: int) -> list[dict]:
+        return [
+            self._neighbour(child)
+            for child in self._neighbours(self.child_offsets, self.child_targets, node)
+        ]
+
+    def _traverse(
+        self,
+        offsets: array,
+        targets: array,
+        node: int,
+        max_depth: int | None,
+        resource_types: list[str] | None,
+    ) -> list[dict]:
+        allowed_types = {t.lower() for t in resource_types} if resource_types else None
+        visited = {node}
+        queue = deque([(node, 0)])
+        results: list[dict] = []
+        while queue:
+            current, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for neighbour in self._neighbours(offsets, targets, current):
+                if neighbour in visited:
+                    continue
+                visited.add(neighbour)
+                queue.append((neighbour, depth + 1))
+                neighbour_node = self.nodes[neighbour]
+                resource_type = (neighbour_node.get("resourceType") or "").lower()
+                if allowed_types is None or resource_type in allowed_types:
+                    results.append({**neighbour_node, "depth": depth + 1})
+        return results
+
+    def ancestors(
+        self,
+        node: int,
+        max_depth: int | None = None,
+        resource_types: list[str] | None = None,
+    ) -> list[dict]:
+        return self._traverse(
+            self.parent_offsets, self.parent_targets, node, max_depth, resource_types
+        )
+
+    def descendants(
+        self,
+        node: int,
+        max_depth: int | None = None,
+        resource_types: list[str] | None = None,
+    ) -> list[dict]:
+        return self._traverse(
+            self.child_offsets, self.child_targets, node, max_depth, resource_types
+        )
+
+
+class LineageIndex(RefreshingIndex[LineageGraph]):
+    """Keeps a `LineageGraph` of the environment up to date."""
+
+    name = "lineage graph"
+    query = GraphQLQueries.GET_MODELS_LINEAGE
+
+    def __init__(
+        self,
+        models_fetcher: ModelsFetcher,
+        refresh_interval_seconds: float = LINEAGE_REFRESH_INTERVAL_SECONDS,
+        snapshot: DiscoverySnapshot | None = None,
+    ):
+        super().__init__(models_fetcher, refresh_interval_seconds, snapshot)
+
+    async def _fetch_models(self) -> list[dict]:
+        # Snapshots are fetched too, for the edges that don't touch a model,
+        # like seed -> snapshot
+        models, snapshots = await asyncio.gather(
+            super()._fetch_models(),
+            self._fetch_all(GraphQLQueries.GET_SNAPSHOTS_LINEAGE),
+        )
+        return models + snapshots
+
+    def _from_models(self, models: list[dict]) -> LineageGraph:
+        return LineageGraph.from_models(models)
+
+    async def get_graph(self) -> LineageGraph:
+        return await self.get()
+
+    async def get_graph_if_built(self) -> LineageGraph | None:
+        return await self.get_if_built()
@@ -0,0 +1,164 @@
+import hashlib
+import logging
+import math
+from collections import Counter
+from collections.abc import Iterable
+
+from dbt_mcp.discovery.client import GraphQLQueries, ModelsFetcher
+from dbt_mcp.discovery.index import RefreshingIndex
+from dbt_mcp.discovery.snapshot import DiscoverySnapshot
+from dbt_mcp.text.tokenize import tokenize
+
+logger = logging.getLogger(__name__)
+
+SEARCH_REFRESH_INTERVAL_SECONDS = 300
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Matches on a model name count this many times as much as other matches
+NAME_WEIGHT = 3
+
+
+def _model_terms(model: dict) -> Counter[str]:
+    terms: Counter[str] = Counter()
+    for token in tokenize(model.get("name")):
+        terms[token] += NAME_WEIGHT
+    terms.update(tokenize(model.get("description")))
+    for column in (model.get("catalog") or {}).get("columns") or []:
+        terms.update(tokenize(column.get("name")))
+        terms.update(tokenize(column.get("description")))
+    return terms
+
+
+def _model_hash(model: dict) -> str:
+    columns = (model.get("catalog") or {}).get("columns") or []
+    text = "\0".join(
+        [
+            model.get("name") or "",
+            model.get("description") or "",
+            *(
+                f"{column.get('name') or ''}\0{column.get('description') or ''}"
+                for column in columns
+            ),
+        ]
+    )
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class SearchIndex:
+    """Inverted index over model names, descriptions and catalog columns.
+
+    Documents are ranked with BM25. The index is updated in place: only
+    models whose indexed text changed are re-tokenized.
+    """
+
+    def __init__(self):
+        self.documents: dict[str, dict] = {}
+        self.postings: dict[str, dict[str, int]] = {}
+        self._doc_terms: dict[str, Counter[str]] = {}
+        self._doc_lengths: dict[str, int] = {}
+        self._doc_hashes: dict[str, str] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def _remove(self, unique_id: str) -> None:
+        for term in self._doc_terms.pop(unique_id):
+            postings = self.postings[term]
+            del postings[unique_id]
+            if not postings:
+                del self.postings[term]
+        self._total_length -= self._doc_lengths.pop(unique_id)
+        del self.documents[unique_id]
+        del self._doc_hashes[unique_id]
+
+    def _add(self, model: dict, doc_hash: str) -> None:
+        unique_id = model["uniqueId"]
+        terms = _model_terms(model)
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[unique_id] = frequency
+        length = sum(terms.values())
+        self.documents[unique_id] = {
+            "uniqueId": unique_id,
+            "name": model.get("name"),
+            "description": model.get("description"),
+        }
+        self._doc_terms[unique_id] = terms
+        self._doc_lengths[unique_id] = length
+        self._doc_hashes[unique_id] = doc_hash
+        self._total_length += length
+
+    def update(self, models: Iterable[dict]) -> int:
+        """Sync the index with the given models and return how many changed."""
+        seen: set[str] = set()
+        changed = 0
+        for model in models:
+            unique_id = model["uniqueId"]
+            seen.add(unique_id)
+            doc_hash = _model_hash(model)
+            if self._doc_hashes.get(unique_id) == doc_hash:
+                continue
+            if unique_id in self.documents:
+                self._remove(unique_id)
+            self._add(model, doc_hash)
+            changed += 1
+        for unique_id in [u for u in self.documents if u not in seen]:
+            self._remove(unique_id)
+            changed += 1
+        return changed
+
+    def search(self, query: str, top_k: int = 10) -> list[dict]:
+        num_documents = len(self.documents)
+        if num_documents == 0 or top_k <= 0:
+            return []
+        average_length = self._total_length / num_documents
+        scores: Counter[str] = Counter()
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(
+                1 + (num_documents - len(postings) + 0.5) / (len(postings) + 0.5)
+            )
+            for unique_id, frequency in postings.items():
+                length_norm = (
+                    1
+                    - BM25_B
+                    + BM25_B * (self._doc_lengths[unique_id] / average_length)
+                )
+                scores[unique_id] += (
+                    idf
+                    * frequency
+                    * (BM25_K1 + 1)
+                    / (frequency + BM25_K1 * length_norm)
+                )
+        return [
+            {**self.documents[unique_id], "score": round(score, 4)}
+            for unique_id, score in scores.most_common(top_k)
+        ]
+
+
+class ModelSearchIndex(RefreshingIndex[SearchIndex]):
+    """Keeps a `SearchIndex` of the environment's models up to date."""
+
+    name = "search index"
+    query = GraphQLQueries.GET_MODELS_CATALOG
+
+    def __init__(
+        self,
+        models_fetcher: ModelsFetcher,
+        refresh_interval_seconds: float = SEARCH_REFRESH_INTERVAL_SECONDS,
+        snapshot: DiscoverySnapshot | None = None,
+    ):
+        super().__init__(models_fetcher, refresh_interval_seconds, snapshot)
+        self.index = SearchIndex()
+
+    def _from_models(self, models: list[dict]) -> SearchIndex:
+        changed = self.index.update(models)
+        logger.info(
+            f"Updated {changed} of {len(self.index)} models in the search index"
+        )
+        return self.index
+
+    async def get_index(self) -> SearchIndex:
+        return await self.get()
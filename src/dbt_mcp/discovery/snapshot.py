@@ -0,0 +1,66 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE_NAME = "discovery.sqlite3"
+
+
+class DiscoverySnapshot:
+    """SQLite store of the models fetched for each environment.
+
+    Lets a restarted server answer from the last known catalog and lineage
+    while the fresh ones are being fetched. A connection is opened per call
+    so the store can be used from worker threads.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                environment_id INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                saved_at REAL NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (environment_id, name)
+            )
+            """
+        )
+        return connection
+
+    def load(self, environment_id: int, name: str) -> list[dict] | None:
+        # The connection's context manager commits but doesn't close it
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT data FROM snapshots WHERE environment_id = ? AND name = ?",
+                (environment_id, name),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, environment_id: int, name: str, models: list[dict]) -> bool:
+        """Store the models, returning False if they had not changed."""
+        data = json.dumps(models, sort_keys=True)
+        digest = hashlib.sha256(data.encode()).hexdigest()
+        with closing(self._connect()) as connection, connection:
+            row = connection.execute(
+                "SELECT digest FROM snapshots WHERE environment_id = ? AND name = ?",
+                (environment_id, name),
+            ).fetchone()
+            if row and row[0] == digest:
+                return False
+            connection.execute(
+                "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?)",
+                (environment_id, name, digest, time.time(), data),
+            )
+        return True
@@ -1,47 +1,158 @@
 import logging
+from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
 from dbt_mcp.config.config import DiscoveryConfig
+from dbt_mcp.discovery.cache import DiscoveryCache
 from dbt_mcp.discovery.client import MetadataAPIClient, ModelsFetcher
+from dbt_mcp.discovery.index import RefreshingIndex
+from dbt_mcp.discovery.lineage import LineageGraph, LineageIndex
+from dbt_mcp.discovery.search import ModelSearchIndex
+from dbt_mcp.discovery.snapshot import SNAPSHOT_FILE_NAME, DiscoverySnapshot
 from dbt_mcp.prompts.prompts import get_prompt
 
 logger = logging.getLogger(__name__)
 
 
-def register_discovery_tools(dbt_mcp: FastMCP, config: DiscoveryConfig) -> None:
+def register_discovery_tools(
+    dbt_mcp: FastMCP, config: DiscoveryConfig
+) -> list[RefreshingIndex]:
+    """Register the discovery tools, returning the indexes they are served from."""
     api_client = MetadataAPIClient(
         host=config.host,
         token=config.token,
         multicell_account_prefix=config.multicell_account_prefix,
     )
     models_fetcher = ModelsFetcher(
-        api_client=api_client, environment_id=config.environment_id
+        api_client=api_client,
+        environment_id=config.environment_id,
+        cache=DiscoveryCache(
+            ttl_seconds=config.cache_ttl_seconds,
+            max_entries=config.cache_max_entries,
+        )
+        if config.cache_ttl_seconds > 0
+        else None,
+    )
+    snapshot = (
+        DiscoverySnapshot(Path(config.snapshot_dir) / SNAPSHOT_FILE_NAME)
+        if config.snapshot_dir
+        else None
     )
+    lineage_index = LineageIndex(models_fetcher, snapshot=snapshot)
+    search_index = ModelSearchIndex(models_fetcher, snapshot=snapshot)
+
+    async def get_lineage_graph() -> LineageGraph | None:
+        try:
+            return await lineage_index.get_graph()
+        except Exception as e:
+            logger.error(f"Error building lineage graph: {e}")
+            return None
+
+    def model_not_found(model_name: str, unique_id: str | None) -> str:
+        return f"Model {unique_id or model_name} not found."
 
     @dbt_mcp.tool(description=get_prompt("discovery/get_mart_models"))
-    def get_mart_models() -> list[dict] | str:
-        mart_models = models_fetcher.fetch_models(
-            model_filter={"modelingLayer": "marts"}
+    async def get_mart_models(fields: list[str] | None = None) -> list[dict] | str:
+        mart_models = await models_fetcher.fetch_models(
+            model_filter={"modelingLayer": "marts"}, fields=fields
         )
         return [m for m in mart_models if m["name"] != "metricflow_time_spine"]
 
     @dbt_mcp.tool(description=get_prompt("discovery/get_all_models"))
-    def get_all_models() -> list[dict] | str:
-        return models_fetcher.fetch_models()
+    async def get_all_models(fields: list[str] | None = None) -> list[dict] | str:
+        return await models_fetcher.fetch_models(fields=fields)
+
+    @dbt_mcp.tool(description=get_prompt("discovery/search_models"))
+    async def search_models(query: str, top_k: int = 10) -> list[dict] | str:
+        index = await search_index.get_index()
+        return index.search(query, top_k)
 
     @dbt_mcp.tool(description=get_prompt("discovery/get_model_details"))
-    def get_model_details(model_name: str, unique_id: str | None = None) -> dict | str:
-        return models_fetcher.fetch_model_details(model_name, unique_id)
+    async def get_model_details(
+        model_name: str,
+        unique_id: str | None = None,
+        fields: list[str] | None = None,
+    ) -> dict | str:
+        return await models_fetcher.fetch_model_details(model_name, unique_id, fields)
+
+    @dbt_mcp.tool(description=get_prompt("discovery/get_models_details"))
+    async def get_models_details(
+        model_names: list[str] | None = None,
+        unique_ids: list[str] | None = None,
+        fields: list[str] | None = None,
+    ) -> dict[str, dict] | str:
+        # Names known to the lineage graph, if it is already built, can be
+        # fetched in uniqueId batches
+        graph = await lineage_index.get_graph_if_built()
+        resolved_names: dict[str, str] = {}
+        unresolved_names: list[str] = []
+        for name in model_names or []:
+            node = graph.resolve(name) if graph else None
+            if graph is not None and node is not None:
+                resolved_names[name] = graph.nodes[node]["uniqueId"]
+            else:
+                unresolved_names.append(name)
+        details = await models_fetcher.fetch_models_details(
+            model_names=unresolved_names,
+            unique_ids=[*(unique_ids or []), *resolved_names.values()],
+            fields=fields,
+        )
+        return {
+            **{name: details[unique_id] for name, unique_id in resolved_names.items()},
+            **{name: details[name] for name in unresolved_names},
+            **{unique_id: details[unique_id] for unique_id in unique_ids or []},
+        }
 
     @dbt_mcp.tool(description=get_prompt("discovery/get_model_parents"))
-    def get_model_parents(
+    async def get_model_parents(
         model_name: str, unique_id: str | None = None
     ) -> list[dict] | str:
-        return models_fetcher.fetch_model_parents(model_name, unique_id)
+        # Until the graph is built, parents are queried model by model
+        graph = await lineage_index.get_graph_if_built()
+        node = graph.resolve(model_name, unique_id) if graph else None
+        if graph is None or node is None:
+            return await models_fetcher.fetch_model_parents(model_name, unique_id)
+        return graph.parents(node)
 
     @dbt_mcp.tool(description=get_prompt("discovery/get_model_children"))
-    def get_model_children(
+    async def get_model_children(
         model_name: str, unique_id: str | None = None
     ) -> list[dict] | str:
-        return models_fetcher.fetch_model_children(model_name, unique_id)
+        graph = await lineage_index.get_graph_if_built()
+        node = graph.resolve(model_name, unique_id) if graph else None
+        if graph is None or node is None:
+            return await models_fetcher.fetch_model_children(model_name, unique_id)
+        return graph.children(node)
+
+    @dbt_mcp.tool(description=get_prompt("discovery/get_model_ancestors"))
+    async def get_model_ancestors(
+        model_name: str,
+        unique_id: str | None = None,
+        max_depth: int | None = None,
+        resource_types: list[str] | None = None,
+    ) -> list[dict] | str:
+        graph = await get_lineage_graph()
+        if graph is None:
+            return "Error building lineage graph."
+        node = graph.resolve(model_name, unique_id)
+        if node is None:
+            return model_not_found(model_name, unique_id)
+        return graph.ancestors(node, max_depth, resource_types)
+
+    @dbt_mcp.tool(description=get_prompt("discovery/get_model_descendants"))
+    async def get_model_descendants(
+        model_name: str,
+        unique_id: str | None = None,
+        max_depth: int | None = None,
+        resource_types: list[str] | None = None,
+    ) -> list[dict] | str:
+        graph = await get_lineage_graph()
+        if graph is None:
+            return "Error building lineage graph."
+        node = graph.resolve(model_name, unique_id)
+        if node is None:
+            return model_not_found(model_name, unique_id)
+        return graph.descendants(node, max_depth, resource_types)
+
+    return [lineage_index, search_index]
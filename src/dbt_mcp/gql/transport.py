@@ -0,0 +1,79 @@
+import asyncio
+import logging
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT_SECONDS = 60
+CONNECT_TIMEOUT_SECONDS = 10
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY_SECONDS = 120
+
+
+class GraphQLTransport:
+    """Pooled HTTP/2 client shared by the Discovery and Semantic Layer GraphQL APIs.
+
+    Connections are kept alive between calls (and multiplexed over HTTP/2),
+    so only the first request to a host pays for the TCP and TLS handshakes.
+    gzip and brotli responses are negotiated and decoded by httpx.
+    """
+
+    def __init__(self, http_transport: httpx.AsyncBaseTransport | None = None):
+        self._http_transport = http_transport
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._warm_up_urls: set[str] = set()
+
+    def register_url(self, url: str) -> None:
+        """Register an endpoint to connect to during warm up."""
+        self._warm_up_urls.add(url)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        # Pooled connections are bound to the event loop that opened them
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                transport=self._http_transport,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                timeout=httpx.Timeout(
+                    REQUEST_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS
+                ),
+            )
+            self._loop = loop
+        return self._client
+
+    async def post(self, url: str, *, json: dict, headers: dict[str, str]) -> dict:
+        response = await self._get_client().post(url, json=json, headers=headers)
+        return response.json()
+
+    async def warm_up(self) -> None:
+        """Open a pooled connection to every registered endpoint."""
+        client = self._get_client()
+        urls = sorted(self._warm_up_urls)
+        results = await asyncio.gather(
+            *(client.head(url) for url in urls),
+            return_exceptions=True,
+        )
+        for url, result in zip(urls, results, strict=True):
+            if isinstance(result, Exception):
+                logger.warning(f"Error warming up connection to {url}: {result}")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+
+_transport = GraphQLTransport()
+
+
+def get_transport() -> GraphQLTransport:
+    return _transport
@@ -1,6 +1,7 @@
+import asyncio
 import logging
 import time
-from collections.abc import AsyncIterator, Sequence
+from collections.abc import AsyncIterator, Awaitable, Callable, Coroutine, Sequence
 from contextlib import (
     asynccontextmanager,
 )
@@ -17,6 +18,8 @@ from mcp.types import (
 from dbt_mcp.config.config import load_config
 from dbt_mcp.dbt_cli.tools import register_dbt_cli_tools
 from dbt_mcp.discovery.tools import register_discovery_tools
+from dbt_mcp.gql.transport import get_transport
+from dbt_mcp.mcp.singleflight import SingleFlight, tool_call_key
 from dbt_mcp.remote.tools import register_remote_tools
 from dbt_mcp.semantic_layer.tools import register_sl_tools
 from dbt_mcp.tracking.tracking import UsageTracker
@@ -28,6 +31,12 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[None]:
     logger.info("Starting MCP server")
+    # Run the startup hooks while the client is still initializing
+    startup_tasks: list[asyncio.Task[None]] = (
+        [asyncio.create_task(hook()) for hook in server.startup_hooks]
+        if isinstance(server, DbtMCP)
+        else []
+    )
     try:
         yield
     except Exception as e:
@@ -35,13 +44,58 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[None]:
         raise e
     finally:
         logger.info("Shutting down MCP server")
+        for task in startup_tasks:
+            task.cancel()
+        if isinstance(server, DbtMCP):
+            for hook in server.shutdown_hooks:
+                try:
+                    await hook()
+                except Exception as e:
+                    logger.warning(f"Error in shutdown hook: {e}")
+        await get_transport().aclose()
         shutdown()
 
 
 class DbtMCP(FastMCP):
-    def __init__(self, usage_tracker: UsageTracker, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        usage_tracker: UsageTracker,
+        *args: Any,
+        coalesced_tools: frozenset[str] = frozenset(),
+        **kwargs: Any,
+    ) -> None:
         super().__init__(*args, **kwargs)
         self.usage_tracker = usage_tracker
+        self.coalesced_tools = coalesced_tools
+        self.singleflight: SingleFlight[
+            Sequence[TextContent | ImageContent | EmbeddedResource]
+        ] = SingleFlight()
+        self.startup_hooks: list[Callable[[], Coroutine[Any, Any, None]]] = []
+        self.shutdown_hooks: list[Callable[[], Awaitable[None]]] = []
+
+    def add_startup_hook(self, hook: Callable[[], Coroutine[Any, Any, None]]) -> None:
+        """Run `hook` in the background when the server starts."""
+        self.startup_hooks.append(hook)
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        """Run `hook` when the server shuts down."""
+        self.shutdown_hooks.append(hook)
+
+    async def _call_tool(
+        self, name: str, arguments: dict[str, Any]
+    ) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+        if name not in self.coalesced_tools:
+            return await super().call_tool(name, arguments)
+        key = tool_call_key(name, arguments)
+        if self.singleflight.is_in_flight(key):
+            logger.info(
+                f"Tool {name} is already running with the same arguments, "
+                + f"sharing its result ({self.singleflight.deduplicated[name] + 1} "
+                + "calls shared so far)"
+            )
+        return await self.singleflight.do(
+            key, name, lambda: super(DbtMCP, self).call_tool(name, arguments)
+        )
 
     async def call_tool(
         self, name: str, arguments: dict[str, Any]
@@ -50,7 +104,7 @@ class DbtMCP(FastMCP):
         result = None
         start_time = int(time.time() * 1000)
         try:
-            result = await super().call_tool(
+            result = await self._call_tool(
                 name,
                 arguments,
             )
@@ -88,17 +142,32 @@ class DbtMCP(FastMCP):
 
 
 async def create_dbt_mcp():
-    dbt_mcp = DbtMCP(usage_tracker=UsageTracker(), name="dbt", lifespan=app_lifespan)
+    dbt_mcp = DbtMCP(
+        usage_tracker=UsageTracker(),
+        name="dbt",
+        lifespan=app_lifespan,
+        coalesced_tools=config.coalesced_tools,
+    )
 
     logger.info("Registering tools for dbt_mcp. NEW VERSION")
+    # Open the GraphQL connections early
+    dbt_mcp.add_startup_hook(get_transport().warm_up)
 
     if config.semantic_layer_config:
         logger.info("Registering semantic layer tools")
-        register_sl_tools(dbt_mcp, config.semantic_layer_config)
+        semantic_layer_fetcher = register_sl_tools(
+            dbt_mcp, config.semantic_layer_config
+        )
+        dbt_mcp.add_shutdown_hook(semantic_layer_fetcher.session_pool.aclose)
+        if config.semantic_layer_config.prefetch_metadata:
+            dbt_mcp.add_startup_hook(semantic_layer_fetcher.prefetch_metadata)
 
     if config.discovery_config:
         logger.info("Registering discovery tools")
-        register_discovery_tools(dbt_mcp, config.discovery_config)
+        discovery_indexes = register_discovery_tools(dbt_mcp, config.discovery_config)
+        # Answer the first calls from the snapshot of the previous session
+        for index in discovery_indexes:
+            dbt_mcp.add_startup_hook(index.load_snapshot)
 
     if config.dbt_cli_config:
         logger.info("Registering dbt cli tools")
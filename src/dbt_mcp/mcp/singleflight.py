@@ -0,0 +1,63 @@
+import asyncio
+import json
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+def tool_call_key(name: str, arguments: dict[str, Any]) -> tuple[str, str]:
+    """Key tool calls so that equivalent arguments map to the same key.
+
+    Arguments left at None are dropped, since they are the defaults of every
+    optional tool parameter.
+    """
+    normalized = {k: v for k, v in arguments.items() if v is not None}
+    return name, json.dumps(normalized, sort_keys=True, default=str)
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the call, later callers wait for its
+    result (or exception). The call runs in its own task, so a caller
+    that is cancelled does not cancel it for the others. It is only
+    cancelled once every caller waiting for it is.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[Hashable, asyncio.Task[T]] = {}
+        self._waiters: Counter[Hashable] = Counter()
+        self.executions: Counter[str] = Counter()
+        self.deduplicated: Counter[str] = Counter()
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def is_in_flight(self, key: Hashable) -> bool:
+        return key in self._in_flight
+
+    async def do(self, key: Hashable, name: str, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions[name] += 1
+            task = asyncio.ensure_future(call())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.deduplicated[name] += 1
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[key] == 1:
+                # Later callers start a new execution instead of joining this one
+                self._forget(key, task)
+                task.cancel()
+            raise
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] <= 0:
+                del self._waiters[key]
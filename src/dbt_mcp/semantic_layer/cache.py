@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import math
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+from dbt_mcp.cache.ttl_cache import TTLCache
+from dbt_mcp.mcp.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SemanticLayerMetadataCache:
+    """Stale-while-revalidate cache of Semantic Layer metadata.
+
+    Entries older than `ttl_seconds` are still served, but trigger a refresh
+    in the background, so only the first fetch of a key blocks its caller.
+    Concurrent fetches of the same key share one request. Entries that
+    depend on the metric catalog are dropped when its hash changes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        # Stale entries are kept until evicted or invalidated
+        self.entries: TTLCache[Hashable, Any] = TTLCache(
+            max_entries=max_entries if ttl_seconds > 0 else 0,
+            ttl_seconds=math.inf,
+        )
+        self.catalog_hash: str | None = None
+        self._fetches: SingleFlight[Any] = SingleFlight()
+        self._refresh_tasks: set[asyncio.Task] = set()
+
+    async def _fetch(
+        self, key: Hashable, name: str, fetch: Callable[[], Awaitable[T]]
+    ) -> T:
+        async def fetch_and_store() -> T:
+            value = await fetch()
+            self.entries.set(key, value)
+            return value
+
+        return await self._fetches.do(key, name, fetch_and_store)
+
+    async def _refresh(
+        self, key: Hashable, name: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> None:
+        try:
+            await self._fetch(key, name, fetch)
+        except Exception as e:
+            logger.warning(f"Error refreshing {name}: {e}")
+
+    def _refresh_in_background(
+        self, key: Hashable, name: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> None:
+        if self._fetches.is_in_flight(key):
+            return
+        task = asyncio.create_task(self._refresh(key, name, fetch))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def get(
+        self, key: Hashable, name: str, fetch: Callable[[], Awaitable[T]]
+    ) -> T:
+        entry = self.entries.get_with_age(key)
+        if entry is None:
+            return await self._fetch(key, name, fetch)
+        value, age = entry
+        if age > self.ttl_seconds:
+            self._refresh_in_background(key, name, fetch)
+        return value
+
+    def get_if_cached(
+        self, key: Hashable, name: str, fetch: Callable[[], Awaitable[T]]
+    ) -> T | None:
+        """Like `get`, but returns None instead of waiting for a first fetch.
+
+        The first fetch is started in the background.
+        """
+        entry = self.entries.get_with_age(key)
+        if entry is None or entry[1] > self.ttl_seconds:
+            self._refresh_in_background(key, name, fetch)
+        return entry[0] if entry is not None else None
+
+    def update_catalog_hash(self, catalog_hash: str, catalog_key: Hashable) -> None:
+        """Record the metric catalog hash, invalidating what depends on it."""
+        if self.catalog_hash is not None and catalog_hash != self.catalog_hash:
+            logger.info("Metric catalog changed, invalidating cached metadata")
+            self.entries.invalidate_matching(lambda key: key != catalog_key)
+        self.catalog_hash = catalog_hash
+
+    def invalidate(self) -> None:
+        self.entries.clear()
+        self.catalog_hash = None
@@ -1,37 +1,186 @@
-from functools import cache
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import asdict
+from typing import Any
 
+import pyarrow as pa
 from dbtsl.api.shared.query_params import GroupByParam, OrderByGroupBy
-from dbtsl.client.sync import SyncSemanticLayerClient
+from dbtsl.client.asyncio import AsyncSemanticLayerClient
 from dbtsl.error import QueryFailedError
+from dbtsl.models.dimension import DimensionType
+from dbtsl.models.metric import MetricType
+from gql.transport.exceptions import TransportQueryError
 
+from dbt_mcp.cache.ttl_cache import TTLCache
 from dbt_mcp.config.config import SemanticLayerConfig
-from dbt_mcp.semantic_layer.gql.gql import GRAPHQL_QUERIES
+from dbt_mcp.gql.transport import get_transport
+from dbt_mcp.semantic_layer.cache import SemanticLayerMetadataCache
+from dbt_mcp.semantic_layer.gql.gql import (
+    GRAPHQL_QUERIES,
+    get_metrics_metadata_query,
+)
 from dbt_mcp.semantic_layer.gql.gql_request import ConnAttr, submit_request
-from dbt_mcp.semantic_layer.levenshtein import get_misspellings
+from dbt_mcp.semantic_layer.levenshtein import WordIndex, get_misspellings
+from dbt_mcp.semantic_layer.metadata_index import MetricMetadataIndex
+from dbt_mcp.semantic_layer.query_validation import validate_where_and_grains
+from dbt_mcp.semantic_layer.result_cache import MetricQuery, QueryResultCache
+from dbt_mcp.semantic_layer.rollup import (
+    ROLLUP_AGGREGATIONS,
+    TIME_DIMENSION,
+    plan_rollup,
+    rollup,
+)
+from dbt_mcp.semantic_layer.serialization import (
+    MIME_TYPES,
+    OutputFormat,
+    serialize_table,
+)
+from dbt_mcp.semantic_layer.session_pool import SemanticLayerSessionPool
+from dbt_mcp.semantic_layer.spill_store import ResultSpillStore
 from dbt_mcp.semantic_layer.types import (
+    CompileSqlResult,
+    CompileSqlSuccess,
     DimensionToolResponse,
     EntityToolResponse,
+    MetricQuerySpec,
     MetricToolResponse,
     OrderByParam,
+    QueryMetricsBatchResult,
     QueryMetricsError,
     QueryMetricsResult,
     QueryMetricsSuccess,
 )
 
+logger = logging.getLogger(__name__)
+
+METRICS_CACHE_KEY = ("metrics",)
+METADATA_INDEX_CACHE_KEY = ("metadata_index",)
+# Metrics whose dimensions and entities are fetched in one request
+METRICS_PER_METADATA_REQUEST = 50
+
+
+def get_catalog_hash(metrics: list[MetricToolResponse]) -> str:
+    catalog = json.dumps([asdict(m) for m in metrics], sort_keys=True, default=str)
+    return hashlib.sha256(catalog.encode()).hexdigest()
+
+
+def _to_dimension(d: dict[str, Any]) -> DimensionToolResponse:
+    return DimensionToolResponse(
+        name=d["name"],
+        type=d["type"],
+        description=d.get("description"),
+        label=d.get("label"),
+        granularities=(d.get("queryableGranularities") or [])
+        + (d.get("queryableTimeGranularities") or []),
+    )
+
+
+def _to_entity(e: dict[str, Any]) -> EntityToolResponse:
+    return EntityToolResponse(
+        name=e["name"],
+        type=e["type"],
+        description=e.get("description"),
+    )
+
 
 class SemanticLayerFetcher:
     def __init__(
-        self, sl_client: SyncSemanticLayerClient, host: str, config: SemanticLayerConfig
+        self,
+        sl_client_factory: Callable[[], AsyncSemanticLayerClient],
+        host: str,
+        config: SemanticLayerConfig,
+        cache: SemanticLayerMetadataCache | None = None,
     ):
-        self.sl_client = sl_client
         self.host = host
         self.config = config
-        self.entities_cache: dict[str, list[EntityToolResponse]] = {}
-        self.dimensions_cache: dict[str, list[DimensionToolResponse]] = {}
+        # The SDK's async clients bind to the running event loop when created
+        # and only allow one session at a time, so the pool holds one client
+        # per open session
+        self.session_pool = SemanticLayerSessionPool(
+            sl_client_factory,
+            max_size=config.session_pool_size,
+            idle_timeout_seconds=config.session_idle_timeout_seconds,
+        )
+        self.cache = cache or SemanticLayerMetadataCache(
+            ttl_seconds=config.cache_ttl_seconds,
+            max_entries=config.cache_max_entries,
+        )
+        self.result_cache = QueryResultCache(
+            ttl_seconds=config.result_cache_ttl_seconds,
+            max_bytes=config.result_cache_max_bytes,
+        )
+        self.spill_store = ResultSpillStore(
+            max_bytes=config.spill_max_bytes, directory=config.spill_dir
+        )
+        # Keyed by catalog hash too, as the SQL depends on the semantic models
+        self.compiled_sql: TTLCache[tuple[str | None, MetricQuery], str] = TTLCache(
+            max_entries=config.cache_max_entries,
+            ttl_seconds=config.cache_ttl_seconds,
+        )
+        self.word_indexes: TTLCache[str, tuple[list, WordIndex]] = TTLCache(
+            max_entries=config.cache_max_entries, ttl_seconds=math.inf
+        )
+        self._prefetch_tasks: set[asyncio.Task] = set()
+        get_transport().register_url(f"{host}/api/graphql")
+
+    async def list_metrics(self) -> list[MetricToolResponse]:
+        return await self.cache.get(
+            METRICS_CACHE_KEY, "list_metrics", self._fetch_metrics
+        )
+
+    async def get_metadata_index(self) -> MetricMetadataIndex:
+        return await self.cache.get(
+            METADATA_INDEX_CACHE_KEY, "metadata_index", self._fetch_metadata_index
+        )
+
+    async def prefetch_metadata(self) -> None:
+        """Fetch the dimensions and entities of every metric."""
+        try:
+            await self.get_metadata_index()
+        except Exception as e:
+            logger.warning(f"Error prefetching semantic layer metadata: {e}")
 
-    @cache
-    def list_metrics(self) -> list[MetricToolResponse]:
-        metrics_result = submit_request(
+    def _get_indexed_metadata(self) -> MetricMetadataIndex | None:
+        """The metadata index, or None while it is built.
+
+        Building the index fetches the whole catalog, so lookups fall back to
+        fetching the metadata of their metrics until it is ready.
+        """
+        if not self.config.prefetch_metadata or self.cache.ttl_seconds <= 0:
+            return None
+        return self.cache.get_if_cached(
+            METADATA_INDEX_CACHE_KEY, "metadata_index", self._fetch_metadata_index
+        )
+
+    async def get_dimensions(self, metrics: list[str]) -> list[DimensionToolResponse]:
+        index = self._get_indexed_metadata()
+        dimensions = index.dimensions.get(metrics) if index else None
+        if dimensions is not None:
+            return dimensions
+        return await self.cache.get(
+            ("dimensions", ",".join(sorted(metrics))),
+            "get_dimensions",
+            lambda: self._fetch_dimensions(metrics),
+        )
+
+    async def get_entities(self, metrics: list[str]) -> list[EntityToolResponse]:
+        index = self._get_indexed_metadata()
+        entities = index.entities.get(metrics) if index else None
+        if entities is not None:
+            return entities
+        return await self.cache.get(
+            ("entities", ",".join(sorted(metrics))),
+            "get_entities",
+            lambda: self._fetch_entities(metrics),
+        )
+
+    async def _fetch_metrics(self) -> list[MetricToolResponse]:
+        metrics_result = await submit_request(
             ConnAttr(
                 host=self.host,
                 params={"environmentid": self.config.prod_environment_id},
@@ -39,78 +188,154 @@ class SemanticLayerFetcher:
             ),
             {"query": GRAPHQL_QUERIES["metrics"]},
         )
-        return [
-            MetricToolResponse(
-                name=m.get("name"),
-                type=m.get("type"),
-                label=m.get("label"),
-                description=m.get("description"),
+        metrics = []
+        for m in metrics_result["data"]["metrics"]:
+            measures = m.get("measures") or []
+            metrics.append(
+                MetricToolResponse(
+                    name=m.get("name"),
+                    type=m.get("type"),
+                    label=m.get("label"),
+                    description=m.get("description"),
+                    aggregation=measures[0].get("agg")
+                    if m.get("type") == MetricType.SIMPLE.value and len(measures) == 1
+                    else None,
+                )
             )
-            for m in metrics_result["data"]["metrics"]
-        ]
+        self.cache.update_catalog_hash(get_catalog_hash(metrics), METRICS_CACHE_KEY)
+        return metrics
 
-    def get_dimensions(self, metrics: list[str]) -> list[DimensionToolResponse]:
-        metrics_key = ",".join(sorted(metrics))
-        if metrics_key not in self.dimensions_cache:
-            dimensions_result = submit_request(
-                ConnAttr(
-                    host=self.host,
-                    params={"environmentid": self.config.prod_environment_id},
-                    auth_header=f"Bearer {self.config.service_token}",
-                ),
-                {
-                    "query": GRAPHQL_QUERIES["dimensions"],
-                    "variables": {"metrics": [{"name": m} for m in metrics]},
+    async def _fetch_metadata_batch(
+        self, metrics: list[str]
+    ) -> tuple[
+        dict[str, list[DimensionToolResponse]], dict[str, list[EntityToolResponse]]
+    ]:
+        result = await submit_request(
+            ConnAttr(
+                host=self.host,
+                params={"environmentid": self.config.prod_environment_id},
+                auth_header=f"Bearer {self.config.service_token}",
+            ),
+            {
+                "query": get_metrics_metadata_query(len(metrics)),
+                "variables": {
+                    f"metrics{i}": [{"name": metric}]
+                    for i, metric in enumerate(metrics)
                 },
+            },
+        )
+        data = result["data"]
+        return (
+            {
+                metric: [_to_dimension(d) for d in data[f"dimensions{i}"]]
+                for i, metric in enumerate(metrics)
+            },
+            {
+                metric: [_to_entity(e) for e in data[f"entities{i}"]]
+                for i, metric in enumerate(metrics)
+            },
+        )
+
+    async def _fetch_metadata_index(self) -> MetricMetadataIndex:
+        names = [m.name for m in await self.list_metrics()]
+        batches = await asyncio.gather(
+            *(
+                self._fetch_metadata_batch(names[i : i + METRICS_PER_METADATA_REQUEST])
+                for i in range(0, len(names), METRICS_PER_METADATA_REQUEST)
             )
-            dimensions = []
-            for d in dimensions_result["data"]["dimensions"]:
-                dimensions.append(
-                    DimensionToolResponse(
-                        name=d.get("name"),
-                        type=d.get("type"),
-                        description=d.get("description"),
-                        label=d.get("label"),
-                        granularities=d.get("queryableGranularities")
-                        + d.get("queryableTimeGranularities"),
-                    )
-                )
-            self.dimensions_cache[metrics_key] = dimensions
-        return self.dimensions_cache[metrics_key]
+        )
+        dimensions: dict[str, list[DimensionToolResponse]] = {}
+        entities: dict[str, list[EntityToolResponse]] = {}
+        for batch_dimensions, batch_entities in batches:
+            dimensions.update(batch_dimensions)
+            entities.update(batch_entities)
+        logger.info(
+            f"Fetched the dimensions and entities of {len(names)} metrics "
+            + f"in {len(batches)} requests"
+        )
+        return await asyncio.to_thread(MetricMetadataIndex, dimensions, entities)
 
-    def get_entities(self, metrics: list[str]) -> list[EntityToolResponse]:
-        metrics_key = ",".join(sorted(metrics))
-        if metrics_key not in self.entities_cache:
-            entities_result = submit_request(
-                ConnAttr(
-                    host=self.host,
-                    params={"environmentid": self.config.prod_environment_id},
-                    auth_header=f"Bearer {self.config.service_token}",
-                ),
-                {
-                    "query": GRAPHQL_QUERIES["entities"],
-                    "variables": {"metrics": [{"name": m} for m in metrics]},
-                },
+    async def _fetch_dimensions(
+        self, metrics: list[str]
+    ) -> list[DimensionToolResponse]:
+        dimensions_result = await submit_request(
+            ConnAttr(
+                host=self.host,
+                params={"environmentid": self.config.prod_environment_id},
+                auth_header=f"Bearer {self.config.service_token}",
+            ),
+            {
+                "query": GRAPHQL_QUERIES["dimensions"],
+                "variables": {"metrics": [{"name": m} for m in metrics]},
+            },
+        )
+        return [_to_dimension(d) for d in dimensions_result["data"]["dimensions"]]
+
+    async def _fetch_entities(self, metrics: list[str]) -> list[EntityToolResponse]:
+        entities_result = await submit_request(
+            ConnAttr(
+                host=self.host,
+                params={"environmentid": self.config.prod_environment_id},
+                auth_header=f"Bearer {self.config.service_token}",
+            ),
+            {
+                "query": GRAPHQL_QUERIES["entities"],
+                "variables": {"metrics": [{"name": m} for m in metrics]},
+            },
+        )
+        return [_to_entity(e) for e in entities_result["data"]["entities"]]
+
+    async def _get_word_index(
+        self,
+        key: str,
+        items: list[MetricToolResponse]
+        | list[DimensionToolResponse]
+        | list[EntityToolResponse],
+    ) -> WordIndex:
+        """Index of the names of cached metadata, built once per version of it.
+
+        The metadata cache hands out the same list until it is refreshed, so the
+        list itself identifies the version the index was built from.
+        """
+        cached = self.word_indexes.get(key)
+        if cached is not None and cached[0] is items:
+            return cached[1]
+        index = await asyncio.to_thread(WordIndex, [item.name for item in items])
+        self.word_indexes.set(key, (items, index))
+        return index
+
+    async def _prefetch_query_metadata(self, metrics: list[str]) -> None:
+        try:
+            dimensions, entities = await asyncio.gather(
+                self.get_dimensions(metrics), self.get_entities(metrics)
             )
-            entities = [
-                EntityToolResponse(
-                    name=e.get("name"),
-                    type=e.get("type"),
-                    description=e.get("description"),
-                )
-                for e in entities_result["data"]["entities"]
-            ]
-            self.entities_cache[metrics_key] = entities
-        return self.entities_cache[metrics_key]
+            metrics_key = ",".join(sorted(metrics))
+            await self._get_word_index(f"dimensions:{metrics_key}", dimensions)
+            await self._get_word_index(f"entities:{metrics_key}", entities)
+        except Exception as e:
+            logger.warning(f"Error prefetching metadata of {metrics}: {e}")
+
+    def prefetch_query_metadata(self, metrics: list[str]) -> asyncio.Task[None]:
+        """Start fetching what validating a query of `metrics` needs.
+
+        Cancelling the returned task cancels the fetches, unless something
+        else is waiting for them too.
+        """
+        task = asyncio.create_task(self._prefetch_query_metadata(metrics))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+        return task
 
-    def validate_query_metrics_params(
-        self, metrics: list[str], group_by: list[GroupByParam] | None
+    async def validate_query_metrics_params(
+        self,
+        metrics: list[str],
+        group_by: list[GroupByParam] | None,
+        where: str | None = None,
     ) -> str | None:
         errors = []
-        available_metrics_names = [m.name for m in self.list_metrics()]
         metric_misspellings = get_misspellings(
             targets=metrics,
-            words=available_metrics_names,
+            words=await self._get_word_index("metrics", await self.list_metrics()),
             top_k=5,
         )
         for metric_misspelling in metric_misspellings:
@@ -126,10 +351,14 @@ class SemanticLayerFetcher:
         if errors:
             return f"Errors: {', '.join(errors)}"
 
-        available_dimensions = [d.name for d in self.get_dimensions(metrics)]
+        metrics_key = ",".join(sorted(metrics))
+        dimensions = await self.get_dimensions(metrics)
+        dimension_index = await self._get_word_index(
+            f"dimensions:{metrics_key}", dimensions
+        )
         dimension_misspellings = get_misspellings(
             targets=[g.name for g in group_by or []],
-            words=available_dimensions,
+            words=dimension_index,
             top_k=5,
         )
         for dimension_misspelling in dimension_misspellings:
@@ -144,13 +373,71 @@ class SemanticLayerFetcher:
                 else ""
             )
 
+        if errors:
+            return f"Errors: {', '.join(errors)}"
+
+        # Checked against cached metadata, so bad filters and grains are
+        # rejected without a round trip to the warehouse
+        errors = validate_where_and_grains(
+            where=where,
+            group_by=group_by,
+            dimensions=dimensions,
+            dimension_index=dimension_index,
+            entity_index=await self._get_word_index(
+                f"entities:{metrics_key}", await self.get_entities(metrics)
+            ),
+        )
         if errors:
             return f"Errors: {', '.join(errors)}"
         return None
 
+    async def _rollup_cached_result(
+        self, metric_query: MetricQuery, metrics: list[str]
+    ) -> pa.Table | None:
+        """Compute the result of a query from a finer-grained cached result."""
+        if not self.config.rollup_cached_results:
+            return None
+        candidates = [
+            (cached_query, table)
+            for cached_query, table in self.result_cache.items()
+            if cached_query.limit is None
+            and cached_query.where == metric_query.where
+            and set(metric_query.metrics) <= set(cached_query.metrics)
+        ]
+        if not candidates:
+            return None
+        aggregations = {
+            m.name.lower(): ROLLUP_AGGREGATIONS[m.aggregation]
+            for m in await self.list_metrics()
+            if m.aggregation in ROLLUP_AGGREGATIONS
+        }
+        if any(m not in aggregations for m in metric_query.metrics):
+            return None
+        time_granularities = {}
+        if any(kind == TIME_DIMENSION for _, kind, _ in metric_query.group_by):
+            time_granularities = {
+                d.name.lower(): d.granularities or []
+                for d in await self.get_dimensions(metrics)
+                if d.type == DimensionType.TIME.value
+            }
+        for cached_query, table in candidates:
+            plan = plan_rollup(
+                metric_query, cached_query, table, aggregations, time_granularities
+            )
+            if plan is not None:
+                logger.info(f"Rolling up the cached result of {cached_query}")
+                return await asyncio.to_thread(
+                    rollup, table, plan, aggregations, metric_query.limit
+                )
+        return None
+
     # TODO: move this to the SDK
     def _format_query_failed_error(self, query_error: Exception) -> QueryMetricsError:
-        if isinstance(query_error, QueryFailedError):
+        if isinstance(query_error, TransportQueryError) and query_error.errors:
+            return QueryMetricsError(
+                error="\n".join(str(e.get("message", e)) for e in query_error.errors)
+            )
+        elif isinstance(query_error, QueryFailedError):
             return QueryMetricsError(
                 error=str(query_error)
                 .replace("QueryFailedError(", "")
@@ -172,51 +459,207 @@ class SemanticLayerFetcher:
         else:
             return QueryMetricsError(error=str(query_error))
 
-    def query_metrics(
+    @staticmethod
+    def _query_params(
+        metrics: list[str],
+        group_by: list[GroupByParam] | None,
+        order_by: list[OrderByParam] | None,
+        where: str | None,
+        limit: int | None,
+    ) -> dict:
+        return {
+            "metrics": metrics,
+            "group_by": group_by,
+            "order_by": [
+                OrderByGroupBy(
+                    name=o.name,
+                    descending=o.descending,
+                    grain=None,
+                )
+                for o in order_by or []
+            ],
+            "where": [where] if where else None,
+            "limit": limit,
+        }
+
+    async def _compile_on(
+        self,
+        sl_client: AsyncSemanticLayerClient,
+        metric_query: MetricQuery,
+        params: dict,
+    ) -> str:
+        key = (self.cache.catalog_hash, metric_query)
+        sql = self.compiled_sql.get(key)
+        if sql is None:
+            sql = await sl_client.compile_sql(**params)
+            self.compiled_sql.set(key, sql)
+        return sql
+
+    async def compile_sql(
+        self,
+        metrics: list[str],
+        group_by: list[GroupByParam] | None = None,
+        order_by: list[OrderByParam] | None = None,
+        where: str | None = None,
+        limit: int | None = None,
+    ) -> CompileSqlResult:
+        """Get the SQL a query would run on the warehouse, without running it."""
+        validation_error = await self.validate_query_metrics_params(
+            metrics=metrics,
+            group_by=group_by,
+            where=where,
+        )
+        if validation_error:
+            return QueryMetricsError(error=validation_error)
+
+        metric_query = MetricQuery.from_params(
+            metrics, group_by, order_by, where, limit
+        )
+        key = (self.cache.catalog_hash, metric_query)
+        params = self._query_params(metrics, group_by, order_by, where, limit)
+        try:
+            sql = self.compiled_sql.get(key)
+            if sql is None:
+                sql = await self.session_pool.run(
+                    lambda sl_client: self._compile_on(sl_client, metric_query, params)
+                )
+            return CompileSqlSuccess(sql=sql)
+        except Exception as e:
+            return self._format_query_failed_error(e)
+
+    async def query_metrics(
         self,
         metrics: list[str],
         group_by: list[GroupByParam] | None = None,
         order_by: list[OrderByParam] | None = None,
         where: str | None = None,
         limit: int | None = None,
+        output_format: OutputFormat = "json",
     ) -> QueryMetricsResult:
-        validation_error = self.validate_query_metrics_params(
+        validation_error = await self.validate_query_metrics_params(
             metrics=metrics,
             group_by=group_by,
+            where=where,
         )
         if validation_error:
             return QueryMetricsError(error=validation_error)
 
+        # Validation refreshed the catalog hash the cached results depend on
+        self.result_cache.update_catalog_hash(self.cache.catalog_hash)
+        metric_query = MetricQuery.from_params(
+            metrics, group_by, order_by, where, limit
+        )
+
+        params = self._query_params(metrics, group_by, order_by, where, limit)
+
+        async def query(sl_client: AsyncSemanticLayerClient) -> pa.Table:
+            if self.config.precompile_queries:
+                # Compiling is a GraphQL round trip, so malformed queries are
+                # rejected without taking up the warehouse
+                await self._compile_on(sl_client, metric_query, params)
+            return await sl_client.query(**params)
+
         try:
-            query_error = None
-            with self.sl_client.session():
-                # Catching any exception within the session
-                # to ensure it is closed properly
-                try:
-                    query_result = self.sl_client.query(
-                        metrics=metrics,
-                        # TODO: remove this type ignore once this PR is merged: https://github.com/dbt-labs/semantic-layer-sdk-python/pull/80
-                        group_by=group_by,  # type: ignore
-                        order_by=[
-                            OrderByGroupBy(
-                                name=o.name,
-                                descending=o.descending,
-                                grain=None,
-                            )
-                            for o in order_by or []
-                        ],
-                        where=[where] if where else None,
-                        limit=limit,
-                    )
-                except Exception as e:
-                    query_error = e
-            if query_error:
-                return self._format_query_failed_error(query_error)
-            json_result = query_result.to_pandas().to_json(orient="records", indent=2)
-            return QueryMetricsSuccess(result=json_result)
+            query_result = self.result_cache.get(metric_query)
+            if query_result is None:
+                query_result = await self._rollup_cached_result(metric_query, metrics)
+                if query_result is None:
+                    query_result = await self.session_pool.run(query)
+                self.result_cache.set(metric_query, query_result)
+            return await self._first_page(query_result, output_format)
         except Exception as e:
             return self._format_query_failed_error(e)
 
+    async def _first_page(
+        self, table: pa.Table, output_format: OutputFormat
+    ) -> QueryMetricsSuccess:
+        """Serialize the first page of `table`, spilling it to disk if larger.
+
+        Arrow results are meant for programs rather than the LLM's context,
+        so they aren't paged.
+        """
+        page_size = self.config.page_size
+        if output_format == "arrow" or page_size <= 0 or table.num_rows <= page_size:
+            return QueryMetricsSuccess(
+                result=await asyncio.to_thread(serialize_table, table, output_format),
+                mime_type=MIME_TYPES[output_format],
+            )
+        result_id = await asyncio.to_thread(self.spill_store.put, table)
+        return QueryMetricsSuccess(
+            result=await asyncio.to_thread(
+                serialize_table, table.slice(0, page_size), output_format
+            ),
+            mime_type=MIME_TYPES[output_format],
+            total_rows=table.num_rows,
+            num_rows=page_size,
+            next_page_token=f"{result_id}:{page_size}" if result_id else None,
+        )
+
+    async def get_results_page(
+        self, page_token: str, output_format: OutputFormat = "json"
+    ) -> QueryMetricsResult:
+        """Read the page of a spilled result that `page_token` points to."""
+        result_id, _, offset = page_token.partition(":")
+        if not offset.isdigit():
+            return QueryMetricsError(error=f"Invalid page token: {page_token}")
+        total_rows = self.spill_store.num_rows(result_id)
+        page = await asyncio.to_thread(
+            self.spill_store.read, result_id, int(offset), self.config.page_size
+        )
+        if page is None or total_rows is None:
+            return QueryMetricsError(
+                error="This page token has expired. "
+                "Run the query again to get its results."
+            )
+        next_offset = int(offset) + page.num_rows
+        return QueryMetricsSuccess(
+            result=await asyncio.to_thread(serialize_table, page, output_format),
+            mime_type=MIME_TYPES[output_format],
+            total_rows=total_rows,
+            num_rows=page.num_rows,
+            offset=int(offset),
+            next_page_token=(
+                f"{result_id}:{next_offset}" if next_offset < total_rows else None
+            ),
+        )
+
+    async def query_metrics_batch(
+        self,
+        queries: list[MetricQuerySpec],
+        output_format: OutputFormat = "json",
+    ) -> list[QueryMetricsBatchResult]:
+        """Run independent queries concurrently, at most as many as the pool
+        has sessions at a time."""
+        slots = asyncio.Semaphore(self.config.session_pool_size)
+
+        async def run(query: MetricQuerySpec) -> QueryMetricsBatchResult:
+            async with slots:
+                start = time.perf_counter()
+                result = await self.query_metrics(
+                    metrics=query.metrics,
+                    group_by=query.group_by,
+                    order_by=query.order_by,
+                    where=query.where,
+                    limit=query.limit,
+                    output_format=output_format,
+                )
+                duration_ms = int((time.perf_counter() - start) * 1000)
+                if isinstance(result, QueryMetricsError):
+                    return QueryMetricsBatchResult(
+                        metrics=query.metrics,
+                        duration_ms=duration_ms,
+                        error=result.error,
+                    )
+                return QueryMetricsBatchResult(
+                    metrics=query.metrics,
+                    duration_ms=duration_ms,
+                    result=result.result,
+                    total_rows=result.total_rows,
+                    next_page_token=result.next_page_token,
+                )
+
+        return await asyncio.gather(*(run(query) for query in queries))
+
 
 def get_semantic_layer_fetcher(config: SemanticLayerConfig) -> SemanticLayerFetcher:
     is_local = config.host and config.host.startswith("localhost")
@@ -228,14 +671,15 @@ def get_semantic_layer_fetcher(config: SemanticLayerConfig) -> SemanticLayerFetc
         host = f"semantic-layer.{config.host}"
     assert host is not None
 
-    semantic_layer_client = SyncSemanticLayerClient(
-        environment_id=config.prod_environment_id,
-        auth_token=config.service_token,
-        host=host,
-    )
+    def sl_client_factory() -> AsyncSemanticLayerClient:
+        return AsyncSemanticLayerClient(
+            environment_id=config.prod_environment_id,
+            auth_token=config.service_token,
+            host=host,
+        )
 
     return SemanticLayerFetcher(
-        sl_client=semantic_layer_client,
+        sl_client_factory=sl_client_factory,
         host=f"http://{host}" if is_local else f"https://{host}",
         config=config,
     )
@@ -6,6 +6,9 @@ query GetMetrics($environmentId: BigInt!) {
     label
     description
     type
+    measures {
+      agg
+    }
   }
 }
     """,
@@ -30,3 +33,32 @@ query GetEntities($environmentId: BigInt!, $metrics: [MetricInput!]!) {
 }
     """,
 }
+
+
+def get_metrics_metadata_query(num_metrics: int) -> str:
+    """Query the dimensions and entities of several metrics at once.
+
+    The metrics are passed one by one as `$metrics<i>`, and their dimensions
+    and entities are returned as `dimensions<i>` and `entities<i>`.
+    """
+    variables = "".join(f", $metrics{i}: [MetricInput!]!" for i in range(num_metrics))
+    fields = "".join(
+        f"""
+  dimensions{i}: dimensions(environmentId: $environmentId, metrics: $metrics{i}) {{
+    description
+    name
+    type
+    queryableGranularities
+    queryableTimeGranularities
+  }}
+  entities{i}: entities(environmentId: $environmentId, metrics: $metrics{i}) {{
+    description
+    name
+    type
+  }}"""
+        for i in range(num_metrics)
+    )
+    return f"""
+query GetMetricsMetadata($environmentId: BigInt!{variables}) {{{fields}
+}}
+    """
@@ -1,8 +1,7 @@
 from dataclasses import dataclass
 
-import requests
-
 from dbt_mcp.gql.errors import raise_gql_error
+from dbt_mcp.gql.transport import get_transport
 
 
 @dataclass
@@ -12,7 +11,7 @@ class ConnAttr:
     auth_header: str
 
 
-def submit_request(
+async def submit_request(
     conn_attr: ConnAttr,
     payload: dict,
 ) -> dict:
@@ -20,7 +19,7 @@ def submit_request(
     if "variables" not in payload:
         payload["variables"] = {}
     payload["variables"]["environmentId"] = conn_attr.params["environmentid"]
-    r = requests.post(
+    result = await get_transport().post(
         url,
         json=payload,
         headers={
@@ -28,6 +27,5 @@ def submit_request(
             "x-dbt-partner-source": "dbt-mcp",
         },
     )
-    result = r.json()
     raise_gql_error(result)
     return result
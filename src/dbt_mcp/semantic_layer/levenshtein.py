@@ -1,3 +1,4 @@
+import heapq
 from dataclasses import dataclass
 
 
@@ -7,24 +8,81 @@ class Misspelling:
     similar_words: list[str]
 
 
-def levenshtein(s1: str, s2: str) -> int:
-    len_s1, len_s2 = len(s1), len(s2)
-    dp = [[0] * (len_s2 + 1) for _ in range(len_s1 + 1)]
+def _pattern_bitmasks(pattern: str) -> dict[str, int]:
+    """Map each character to the bitmask of its positions in the pattern."""
+    bitmasks: dict[str, int] = {}
+    for i, char in enumerate(pattern):
+        bitmasks[char] = bitmasks.get(char, 0) | (1 << i)
+    return bitmasks
 
-    for i in range(len_s1 + 1):
-        dp[i][0] = i
-    for j in range(len_s2 + 1):
-        dp[0][j] = j
 
-    for i in range(1, len_s1 + 1):
-        for j in range(1, len_s2 + 1):
-            cost = 0 if s1[i - 1] == s2[j - 1] else 1
-            dp[i][j] = min(
-                dp[i - 1][j] + 1,  # Deletion
-                dp[i][j - 1] + 1,  # Insertion
-                dp[i - 1][j - 1] + cost,  # Substitution
-            )
-    return dp[len_s1][len_s2]
+def _bit_parallel_distance(
+    pattern_length: int,
+    bitmasks: dict[str, int],
+    text: str,
+    max_distance: int | None,
+) -> int:
+    """Myers' bit-parallel edit distance, in Hyyrö's formulation.
+
+    A DP column is encoded as bit vectors of its vertical +1/-1 deltas, so each
+    character of `text` is processed in a constant number of integer operations.
+    Returns `max_distance + 1` as soon as the distance is known to exceed it.
+    """
+    if max_distance is not None and abs(pattern_length - len(text)) > max_distance:
+        return max_distance + 1
+    if pattern_length == 0:
+        return len(text)
+    mask = (1 << pattern_length) - 1
+    last_bit = 1 << (pattern_length - 1)
+    positive_vertical = mask
+    negative_vertical = 0
+    score = pattern_length
+    remaining = len(text)
+    for char in text:
+        remaining -= 1
+        matches = bitmasks.get(char, 0)
+        x_vertical = matches | negative_vertical
+        x_horizontal = (
+            ((matches & positive_vertical) + positive_vertical) ^ positive_vertical
+        ) | matches
+        positive_horizontal = negative_vertical | ~(x_horizontal | positive_vertical)
+        negative_horizontal = positive_vertical & x_horizontal
+        if positive_horizontal & last_bit:
+            score += 1
+        elif negative_horizontal & last_bit:
+            score -= 1
+        # The first row of the DP matrix grows by one per character of text
+        positive_horizontal = (positive_horizontal << 1) | 1
+        negative_horizontal <<= 1
+        positive_vertical = (
+            negative_horizontal | ~(x_vertical | positive_horizontal)
+        ) & mask
+        negative_vertical = positive_horizontal & x_vertical & mask
+        # The score can drop by at most one per remaining character
+        if max_distance is not None and score - remaining > max_distance:
+            return max_distance + 1
+    return score
+
+
+def levenshtein(s1: str, s2: str, max_distance: int | None = None) -> int:
+    """Edit distance between s1 and s2.
+
+    With `max_distance`, any distance above it is reported as `max_distance + 1`.
+    """
+    return _bit_parallel_distance(len(s1), _pattern_bitmasks(s1), s2, max_distance)
+
+
+def get_distances(
+    target: str, words: list[str], max_distance: int | None = None
+) -> list[tuple[str, int]]:
+    """Edit distances from target to each word, dropping those above max_distance."""
+    bitmasks = _pattern_bitmasks(target)
+    distances = []
+    for word in words:
+        distance = _bit_parallel_distance(len(target), bitmasks, word, max_distance)
+        if max_distance is None or distance <= max_distance:
+            distances.append((word, distance))
+    return distances
 
 
 def get_closest_words(
@@ -33,11 +91,7 @@ def get_closest_words(
     top_k: int | None = None,
     threshold: int | None = None,
 ) -> list[str]:
-    distances = [(word, levenshtein(target, word)) for word in words]
-
-    # Filter by threshold if provided
-    if threshold is not None:
-        distances = [(word, dist) for word, dist in distances if dist <= threshold]
+    distances = get_distances(target, words, max_distance=threshold)
 
     # Sort by distance
     distances.sort(key=lambda x: x[1])
@@ -49,22 +103,115 @@ def get_closest_words(
     return [word for word, _ in distances]
 
 
+class _BKTreeNode:
+    __slots__ = ("children", "order", "word")
+
+    def __init__(self, word: str, order: int):
+        self.word = word
+        self.order = order
+        self.children: dict[int, _BKTreeNode] = {}
+
+
+class WordIndex:
+    """BK-tree of words under the Levenshtein distance.
+
+    Every child of a node sits at a known distance from it, so by the triangle
+    inequality a search within `threshold` of a target only descends into
+    children whose distance is within `threshold` of the node's own distance.
+    """
+
+    def __init__(self, words: list[str]):
+        self.words = list(dict.fromkeys(words))
+        self._word_set = set(self.words)
+        self._root: _BKTreeNode | None = None
+        for order, word in enumerate(self.words):
+            self._add(_BKTreeNode(word, order))
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._word_set
+
+    def _add(self, node: _BKTreeNode) -> None:
+        if self._root is None:
+            self._root = node
+            return
+        current = self._root
+        while True:
+            distance = levenshtein(node.word, current.word)
+            child = current.children.get(distance)
+            if child is None:
+                current.children[distance] = node
+                return
+            current = child
+
+    def search(
+        self, target: str, threshold: int | None = None, top_k: int | None = None
+    ) -> list[tuple[str, int]]:
+        """The top_k words within threshold of target, closest first.
+
+        Ties keep the order the words were indexed in. Nodes are visited
+        best-first, so once top_k close words are found the search bound
+        tightens and most of the tree is pruned.
+        """
+        if self._root is None or (top_k is not None and top_k <= 0):
+            return []
+        # Max-heap of the best matches so far, as (-distance, -order, word)
+        best: list[tuple[int, int, str]] = []
+        # Min-heap of nodes to visit, by a lower bound of their distance
+        to_visit: list[tuple[int, int, _BKTreeNode]] = [(0, 0, self._root)]
+        target_bitmasks = _pattern_bitmasks(target)
+        while to_visit:
+            lower_bound, _, node = heapq.heappop(to_visit)
+            bound = threshold
+            if top_k is not None and len(best) == top_k:
+                bound = -best[0][0] if bound is None else min(bound, -best[0][0])
+            if bound is not None and lower_bound > bound:
+                break
+            # Children can only be within bound if the node is within
+            # bound + (largest child distance) of the target
+            cutoff = None if bound is None else bound + max(node.children, default=0)
+            distance = _bit_parallel_distance(
+                len(target), target_bitmasks, node.word, cutoff
+            )
+            if bound is None or distance <= bound:
+                heapq.heappush(best, (-distance, -node.order, node.word))
+                if top_k is not None and len(best) > top_k:
+                    heapq.heappop(best)
+            for child_distance, child in node.children.items():
+                child_lower_bound = abs(child_distance - distance)
+                if bound is None or child_lower_bound <= bound:
+                    heapq.heappush(to_visit, (child_lower_bound, child.order, child))
+        return [
+            (word, -distance)
+            for distance, _, word in sorted(best, key=lambda m: (-m[0], -m[1]))
+        ]
+
+    def get_closest_words(
+        self, target: str, top_k: int | None = None, threshold: int | None = None
+    ) -> list[str]:
+        return [word for word, _ in self.search(target, threshold, top_k)]
+
+
 def get_misspellings(
     targets: list[str],
-    words: list[str],
+    words: list[str] | WordIndex,
     top_k: int | None = None,
 ) -> list[Misspelling]:
     misspellings = []
     for target in targets:
         if target not in words:
+            threshold = max(1, len(target) // 2)
             misspellings.append(
                 Misspelling(
                     word=target,
-                    similar_words=get_closest_words(
+                    similar_words=words.get_closest_words(
+                        target=target, top_k=top_k, threshold=threshold
+                    )
+                    if isinstance(words, WordIndex)
+                    else get_closest_words(
                         target=target,
                         words=words,
                         top_k=top_k,
-                        threshold=max(1, len(target) // 2),
+                        threshold=threshold,
                     ),
                 )
             )
@@ -0,0 +1,104 @@
+import math
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+from dbt_mcp.cache.ttl_cache import TTLCache
+from dbt_mcp.semantic_layer.types import DimensionToolResponse, EntityToolResponse
+
+T = TypeVar("T", DimensionToolResponse, EntityToolResponse)
+
+# Number of memoized metric combinations
+MAX_COMBINATIONS = 256
+
+
+class MetricBitsets(Generic[T]):
+    """Items (dimensions or entities) available to each metric, as bitsets.
+
+    Items are numbered by name, and the items available to a combination of
+    metrics are the intersection of their bitsets. Items whose details
+    differ between metrics, like the granularities of `metric_time`, are
+    merged by `merge`.
+    """
+
+    def __init__(
+        self,
+        items_by_metric: dict[str, list[T]],
+        merge: Callable[[list[T]], T],
+    ):
+        self.merge: Callable[[list[T]], T] = merge
+        self.names: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.bitsets: dict[str, int] = {}
+        self.variants: dict[str, dict[str, T]] = {}
+        for metric, items in items_by_metric.items():
+            bitset = 0
+            for item in items:
+                if item.name not in self.positions:
+                    self.positions[item.name] = len(self.names)
+                    self.names.append(item.name)
+                    self.variants[item.name] = {}
+                bitset |= 1 << self.positions[item.name]
+                self.variants[item.name][metric] = item
+            self.bitsets[metric] = bitset
+        self._combinations: TTLCache[Hashable, list[T]] = TTLCache(
+            max_entries=MAX_COMBINATIONS, ttl_seconds=math.inf
+        )
+
+    def _item(self, name: str, metrics: list[str]) -> T:
+        variants = [self.variants[name][m] for m in metrics]
+        if all(v == variants[0] for v in variants[1:]):
+            return variants[0]
+        return self.merge(variants)
+
+    def get(self, metrics: list[str]) -> list[T] | None:
+        """Items available to all of `metrics`, or None if one is unknown.
+
+        The same list is returned for the same combination of metrics.
+        """
+        key = tuple(sorted(set(metrics)))
+        if not key or any(m not in self.bitsets for m in key):
+            return None
+        items = self._combinations.get(key)
+        if items is not None:
+            return items
+        bitset = -1
+        for metric in key:
+            bitset &= self.bitsets[metric]
+        items = []
+        while bitset:
+            lowest = bitset & -bitset
+            items.append(self._item(self.names[lowest.bit_length() - 1], list(key)))
+            bitset ^= lowest
+        self._combinations.set(key, items)
+        return items
+
+
+def merge_dimensions(variants: list[DimensionToolResponse]) -> DimensionToolResponse:
+    """Keep the granularities every metric can be queried at."""
+    granularities = variants[0].granularities or []
+    for variant in variants[1:]:
+        allowed = set(variant.granularities or [])
+        granularities = [g for g in granularities if g in allowed]
+    return DimensionToolResponse(
+        name=variants[0].name,
+        type=variants[0].type,
+        description=variants[0].description,
+        label=variants[0].label,
+        granularities=granularities,
+    )
+
+
+def merge_entities(variants: list[EntityToolResponse]) -> EntityToolResponse:
+    return variants[0]
+
+
+class MetricMetadataIndex:
+    """Dimensions and entities of every metric in the catalog."""
+
+    def __init__(
+        self,
+        dimensions: dict[str, list[DimensionToolResponse]],
+        entities: dict[str, list[EntityToolResponse]],
+    ):
+        self.dimensions = MetricBitsets(dimensions, merge_dimensions)
+        self.entities = MetricBitsets(entities, merge_entities)
@@ -1,28 +1,84 @@
-from urllib import response
-import boto3
+import functools
+import json
 import logging
 import os
-from dbt_mcp.semantic_layer.client import get_semantic_layer_fetcher
+import threading
+from dataclasses import dataclass
+
+import boto3
 from dotenv import load_dotenv
-import json
+
+from dbt_mcp.cache.ttl_cache import TTLCache
+from dbt_mcp.semantic_layer.client import get_catalog_hash
+from dbt_mcp.semantic_layer.metric_retrieval import MetricRetriever
+from dbt_mcp.text.tokenize import tokenize
+
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Number of candidate metrics shown to the LLM
+SHORTLIST_SIZE = 10
+
+
+@dataclass
+class MetricCatalog:
+    metrics: list
+    retriever: MetricRetriever
+    hash: str
+
+
+_metric_catalog: MetricCatalog | None = None
 
+# Decisions of the LLM, keyed by normalized query and metric catalog hash
+_decisions: TTLCache[tuple[str, str], list[str]] = TTLCache(
+    max_entries=int(os.environ.get("METRIC_PICKER_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=int(os.environ.get("METRIC_PICKER_CACHE_TTL_SECONDS", "3600")),
+)
+# Metrics are picked in worker threads, and neither cache is thread safe
+_lock = threading.Lock()
+
+
+def get_metric_catalog(all_metrics: list) -> MetricCatalog:
+    """Returns the retrieval index and hash of the metrics, rebuilt when they change."""
+    global _metric_catalog
+    with _lock:
+        # The fetcher hands out the same list until the metric catalog is refreshed
+        if _metric_catalog is None or _metric_catalog.metrics is not all_metrics:
+            _metric_catalog = MetricCatalog(
+                metrics=all_metrics,
+                retriever=MetricRetriever(all_metrics),
+                hash=get_catalog_hash(all_metrics),
+            )
+        return _metric_catalog
+
+
+def normalize_query(user_input: str) -> str:
+    return " ".join(tokenize(user_input))
+
+
+def _remember(key: tuple[str, str], decision: list[str]) -> list[str]:
+    with _lock:
+        _decisions.set(key, decision)
+    return list(decision)
+
+
+@functools.cache
 def get_bedrock_client():
     """
     Creates and returns a properly configured AWS Bedrock client based on environment variables.
+    The client is created once and reused, as boto3 clients are thread safe.
 
     Returns:
         boto3.client: Configured Bedrock client
     """
     try:
-        load_dotenv()
         # Get AWS credentials from environment variables
         aws_access_key = os.environ.get("AWS_ACCESS_KEY_ID")
         aws_secret_key = os.environ.get("AWS_SECRET_ACCESS_KEY")
         aws_region = os.environ.get("AWS_REGION", "eu-west-1")
+        # Lets requests go to a proxy or, in tests, to a stub server
+        endpoint_url = os.environ.get("AWS_BEDROCK_ENDPOINT_URL") or None
 
         # Create the Bedrock client with explicit credentials
         if aws_access_key and aws_secret_key:
@@ -32,7 +88,8 @@ def get_bedrock_client():
                 service_name="bedrock-runtime",
                 region_name=aws_region,
                 aws_access_key_id=aws_access_key,
-                aws_secret_access_key=aws_secret_key
+                aws_secret_access_key=aws_secret_key,
+                endpoint_url=endpoint_url
             )
         else:
             raise Exception("AWS credentials are not present!")
@@ -51,11 +108,32 @@ def determine_correct_metric(all_metrics: list, user_input) -> list:
         all_metrics: List of MetricToolResponse objects containing available metrics
         user_input: The user's natural language query
 
+    Metrics named in the query are returned without calling the LLM. Otherwise,
+    only the metrics most similar to the query are shown to it, and its decision
+    is reused for the same query until the metric catalog changes.
+
     Returns:
         list: Either an empty list if no match is found, or a list containing the name
              of the single metric that best matches the user's query
     """
     logger.info("Starting metric determination process...")
+    catalog = get_metric_catalog(all_metrics)
+    exact_match = catalog.retriever.exact_match(user_input)
+    if exact_match is not None:
+        logger.info(f"Query names a single metric: {exact_match.name}")
+        return [exact_match.name]
+
+    decision_key = (normalize_query(user_input), catalog.hash)
+    with _lock:
+        decision = _decisions.get(decision_key)
+    if decision is not None:
+        logger.info(f"Reusing earlier decision for the same query: {decision}")
+        return list(decision)
+
+    candidate_metrics = catalog.retriever.shortlist(user_input, SHORTLIST_SIZE)
+    logger.info(
+        f"Shortlisted metrics: {[metric.name for metric in candidate_metrics]}")
+
     llm = get_bedrock_client()
 
     prompt = f"""
@@ -65,7 +143,7 @@ def determine_correct_metric(all_metrics: list, user_input) -> list:
     "{user_input}"
 
     # Available Metrics
-    {all_metrics}
+    {candidate_metrics}
 
     # CRITICAL INSTRUCTION
     Your default action MUST be to return an empty list []. Only in extremely rare cases where there is PERFECT alignment should you return a metric.
@@ -130,7 +208,6 @@ def determine_correct_metric(all_metrics: list, user_input) -> list:
 
     logger.info(f"Prompt for Bedrock: {prompt}")
     try:
-        load_dotenv()
         bedrock_model = os.environ.get("AWS_BEDROCK_MODEL")
         logger.info(f"Using Bedrock model: {bedrock_model}")
         request_body = {
@@ -170,15 +247,15 @@ def determine_correct_metric(all_metrics: list, user_input) -> list:
 
             if result_text == "[]" or "empty list" in result_text.lower():
                 logger.info("No matching metric found, returning empty list")
-                return []
+                return _remember(decision_key, [])
 
-            for metric in all_metrics:
+            for metric in candidate_metrics:
                 metric_str = str(metric).replace(" ", "")
                 result_text_normalized = result_text.replace(" ", "")
 
                 if metric_str in result_text_normalized:
                     logger.info(f"Found matching metric: {metric}")
-                    return [metric.name]
+                    return _remember(decision_key, [metric.name])
 
             logger.warning(
                 f"Couldn't find exact match for LLM response: {result_text}")
@@ -0,0 +1,105 @@
+import zlib
+
+import numpy as np
+
+from dbt_mcp.semantic_layer.types import MetricToolResponse
+from dbt_mcp.text.tokenize import tokenize
+
+# Dimensions of the hashed feature vectors
+NUM_FEATURES = 2**11
+# Matches on a metric name or label count this many times as much as others
+NAME_WEIGHT = 3
+
+
+def _features(tokens: list[str]) -> list[str]:
+    """Words and character trigrams, so that partial words still match."""
+    features = list(tokens)
+    for token in tokens:
+        padded = f" {token} "
+        features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+    return features
+
+
+def _feature_index(feature: str) -> int:
+    return zlib.crc32(feature.encode()) % NUM_FEATURES
+
+
+def _contains(tokens: list[str], phrase: list[str]) -> list[tuple[int, int]]:
+    """Spans of `tokens` where `phrase` occurs."""
+    return [
+        (i, i + len(phrase))
+        for i in range(len(tokens) - len(phrase) + 1)
+        if phrase and tokens[i : i + len(phrase)] == phrase
+    ]
+
+
+class MetricRetriever:
+    """TF-IDF index of metric names, labels and descriptions.
+
+    Features are hashed into fixed size vectors, so queries are scored
+    against every metric with a single matrix product.
+    """
+
+    def __init__(self, metrics: list[MetricToolResponse]):
+        self.metrics = metrics
+        counts = np.zeros((len(metrics), NUM_FEATURES), dtype=np.float32)
+        for row, metric in enumerate(metrics):
+            for feature in _features(tokenize(metric.name) + tokenize(metric.label)):
+                counts[row, _feature_index(feature)] += NAME_WEIGHT
+            for feature in _features(tokenize(metric.description)):
+                counts[row, _feature_index(feature)] += 1
+        document_frequencies = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(metrics)) / (1 + document_frequencies)) + 1).astype(
+            np.float32
+        )
+        self.vectors = self._normalize(np.log1p(counts) * self.idf)
+        self.phrases = [
+            [p for p in (tokenize(metric.name), tokenize(metric.label)) if p]
+            for metric in metrics
+        ]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+    def _vectorize(self, text: str) -> np.ndarray:
+        counts = np.zeros(NUM_FEATURES, dtype=np.float32)
+        for feature in _features(tokenize(text)):
+            counts[_feature_index(feature)] += 1
+        return self._normalize(np.log1p(counts) * self.idf)
+
+    def shortlist(self, query: str, top_k: int) -> list[MetricToolResponse]:
+        """The `top_k` metrics most similar to `query`, most similar first."""
+        if len(self.metrics) <= top_k:
+            return list(self.metrics)
+        scores = self.vectors @ self._vectorize(query)
+        top = np.argpartition(-scores, top_k)[:top_k]
+        return [self.metrics[i] for i in top[np.argsort(-scores[top], kind="stable")]]
+
+    def exact_match(self, query: str) -> MetricToolResponse | None:
+        """The only metric whose name or label appears in `query`, if any.
+
+        A match within a longer match ("revenue" in "total revenue") is
+        ignored. Queries mentioning several metrics have no exact match.
+        """
+        tokens = tokenize(query)
+        matches: list[tuple[int, tuple[int, int]]] = [
+            (row, span)
+            for row, phrases in enumerate(self.phrases)
+            for phrase in phrases
+            for span in _contains(tokens, phrase)
+        ]
+        matched_rows = {
+            row
+            for row, (start, end) in matches
+            if not any(
+                other_start <= start
+                and end <= other_end
+                and (other_start, other_end) != (start, end)
+                for _, (other_start, other_end) in matches
+            )
+        }
+        if len(matched_rows) != 1:
+            return None
+        return self.metrics[matched_rows.pop()]
@@ -0,0 +1,121 @@
+import re
+from dataclasses import dataclass
+
+from dbtsl.api.shared.query_params import GroupByParam
+
+from dbt_mcp.semantic_layer.levenshtein import WordIndex, get_misspellings
+from dbt_mcp.semantic_layer.types import DimensionToolResponse
+
+# Jinja references to semantic objects in a where clause, like
+# {{ TimeDimension('metric_time', 'month') }} or
+# {{ Dimension('order__ordered_at').grain('week') }}
+_REFERENCE_PATTERN = re.compile(
+    r"\{\{\s*(?P<kind>Dimension|TimeDimension|Entity)\s*\((?P<args>.*?)\)"
+    r"(?:\s*\.\s*grain\s*\(\s*(?P<quote>['\"])(?P<grain>.*?)(?P=quote)\s*\))?"
+    r"\s*\}\}",
+    re.DOTALL,
+)
+_ARGUMENT_PATTERN = re.compile(
+    r"(?:(?P<key>\w+)\s*=\s*)?(?P<value>\[[^\]]*\]|(?P<quote>['\"]).*?(?P=quote))"
+)
+_STRING_PATTERN = re.compile(r"(['\"])(.*?)\1")
+
+# Keyword arguments setting the grain of a time dimension
+_GRAIN_ARGUMENTS = ("time_granularity_name", "grain")
+
+
+@dataclass
+class FilterReference:
+    kind: str
+    name: str
+    grain: str | None = None
+
+
+def _strings(value: str) -> list[str]:
+    return [match.group(2) for match in _STRING_PATTERN.finditer(value)]
+
+
+def parse_where_references(where: str | None) -> list[FilterReference]:
+    """The dimensions, time dimensions and entities a where clause refers to."""
+    references = []
+    for match in _REFERENCE_PATTERN.finditer(where or ""):
+        positional: list[str] = []
+        keywords: dict[str, list[str]] = {}
+        for argument in _ARGUMENT_PATTERN.finditer(match.group("args")):
+            values = _strings(argument.group("value"))
+            if argument.group("key"):
+                keywords[argument.group("key")] = values
+            else:
+                positional.extend(values)
+        if not positional:
+            continue
+        # Entity paths prefix the name, as in customer__region
+        name = "__".join([*keywords.get("entity_path", []), positional[0]])
+        grain = match.group("grain")
+        if grain is None and match.group("kind") == "TimeDimension":
+            grain = next(
+                (keywords[k][0] for k in _GRAIN_ARGUMENTS if keywords.get(k)),
+                positional[1] if len(positional) > 1 else None,
+            )
+        references.append(
+            FilterReference(kind=match.group("kind"), name=name, grain=grain)
+        )
+    return references
+
+
+def _not_found(kind: str, name: str, similar_words: list[str]) -> str:
+    if similar_words:
+        return f"{kind} {name} not found. Did you mean: {', '.join(similar_words)}?"
+    return f"{kind} {name} not found."
+
+
+def _check_grain(
+    name: str, grain: str, dimensions: dict[str, DimensionToolResponse]
+) -> str | None:
+    dimension = dimensions.get(name)
+    if dimension is None:
+        return None
+    granularities = [g.lower() for g in dimension.granularities or []]
+    if grain.lower() in granularities:
+        return None
+    if not granularities:
+        return f"Dimension {name} is not a time dimension, so it has no grain."
+    return (
+        f"Grain {grain} is not available for {name}."
+        f" Available grains: {', '.join(granularities)}."
+    )
+
+
+def validate_where_and_grains(
+    where: str | None,
+    group_by: list[GroupByParam] | None,
+    dimensions: list[DimensionToolResponse],
+    dimension_index: WordIndex,
+    entity_index: WordIndex,
+) -> list[str]:
+    """Check a query's filter references and grains against its metadata.
+
+    `dimensions`, `dimension_index` and `entity_index` describe the
+    dimensions and entities available to the queried metrics.
+    """
+    errors = []
+    references = parse_where_references(where)
+    dimension_names = list(
+        dict.fromkeys(r.name for r in references if r.kind != "Entity")
+    )
+    entity_names = list(dict.fromkeys(r.name for r in references if r.kind == "Entity"))
+    for kind, names, index in (
+        ("Dimension", dimension_names, dimension_index),
+        ("Entity", entity_names, entity_index),
+    ):
+        for misspelling in get_misspellings(targets=names, words=index, top_k=5):
+            errors.append(_not_found(kind, misspelling.word, misspelling.similar_words))
+
+    dimensions_by_name = {d.name: d for d in dimensions}
+    grains = [(r.name, r.grain) for r in references if r.grain]
+    grains += [(g.name, g.grain) for g in group_by or [] if g.grain]
+    for name, grain in dict.fromkeys(grains):
+        error = _check_grain(name, grain, dimensions_by_name)
+        if error:
+            errors.append(error)
+    return errors
@@ -0,0 +1,150 @@
+import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import pyarrow as pa
+from dbtsl.api.shared.query_params import GroupByParam
+
+from dbt_mcp.semantic_layer.types import OrderByParam
+
+logger = logging.getLogger(__name__)
+
+# Quoted string literals, with quotes escaped by doubling them as in SQL
+_STRING_LITERAL_PATTERN = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def _normalize_where(where: str | None) -> str | None:
+    """Collapse the whitespace of a where clause outside its string literals."""
+    parts = _STRING_LITERAL_PATTERN.split((where or "").strip())
+    # Literals are at the odd indices of the split
+    normalized = "".join(
+        part if i % 2 else _WHITESPACE_PATTERN.sub(" ", part)
+        for i, part in enumerate(parts)
+    )
+    return normalized or None
+
+
+@dataclass(frozen=True)
+class MetricQuery:
+    """Canonical form of a metrics query, used to key its cached result.
+
+    Names are case-insensitive and the where clause is whitespace-insensitive
+    outside of its string literals.
+    The order of metrics and group bys is kept, as it sets the column order.
+    """
+
+    metrics: tuple[str, ...]
+    group_by: tuple[tuple[str, str, str | None], ...]
+    order_by: tuple[tuple[str, bool], ...]
+    where: str | None
+    limit: int | None
+
+    @classmethod
+    def from_params(
+        cls,
+        metrics: list[str],
+        group_by: list[GroupByParam] | None = None,
+        order_by: list[OrderByParam] | None = None,
+        where: str | None = None,
+        limit: int | None = None,
+    ) -> "MetricQuery":
+        return cls(
+            metrics=tuple(m.strip().lower() for m in metrics),
+            group_by=tuple(
+                (
+                    g.name.strip().lower(),
+                    g.type.value,
+                    g.grain.strip().lower() if g.grain else None,
+                )
+                for g in group_by or []
+            ),
+            order_by=tuple(
+                (o.name.strip().lower(), o.descending) for o in order_by or []
+            ),
+            where=_normalize_where(where),
+            limit=limit,
+        )
+
+
+@dataclass
+class CachedResult:
+    table: pa.Table
+    stored_at: float
+    size_bytes: int
+
+
+class QueryResultCache:
+    """Cache of query results, bounded by their total size in bytes.
+
+    Results expire after `ttl_seconds`, and the least recently used ones are
+    evicted once they take up more than `max_bytes`. Results are computed from
+    a version of the metric catalog, so they are all dropped when its hash
+    changes.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_bytes: int,
+        timer: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.timer = timer
+        self.size_bytes = 0
+        self.catalog_hash: str | None = None
+        self._entries: OrderedDict[MetricQuery, CachedResult] = OrderedDict()
+
+    def _remove(self, query: MetricQuery) -> None:
+        entry = self._entries.pop(query)
+        self.size_bytes -= entry.size_bytes
+
+    def get(self, query: MetricQuery) -> pa.Table | None:
+        entry = self._entries.get(query)
+        if entry is None:
+            return None
+        if self.timer() - entry.stored_at > self.ttl_seconds:
+            self._remove(query)
+            return None
+        self._entries.move_to_end(query)
+        return entry.table
+
+    def items(self) -> list[tuple[MetricQuery, pa.Table]]:
+        """Return the unexpired results, most recently used first."""
+        now = self.timer()
+        return [
+            (query, entry.table)
+            for query, entry in reversed(self._entries.items())
+            if now - entry.stored_at <= self.ttl_seconds
+        ]
+
+    def set(self, query: MetricQuery, table: pa.Table) -> None:
+        size_bytes = table.nbytes
+        if self.ttl_seconds <= 0 or size_bytes > self.max_bytes:
+            return
+        if query in self._entries:
+            self._remove(query)
+        self._entries[query] = CachedResult(
+            table=table, stored_at=self.timer(), size_bytes=size_bytes
+        )
+        self.size_bytes += size_bytes
+        while self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def update_catalog_hash(self, catalog_hash: str | None) -> None:
+        """Record the metric catalog hash, dropping results if it changed."""
+        if self.catalog_hash is not None and catalog_hash != self.catalog_hash:
+            logger.info("Metric catalog changed, invalidating cached query results")
+            self.invalidate()
+        self.catalog_hash = catalog_hash
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+        self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
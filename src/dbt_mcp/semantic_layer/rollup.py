@@ -0,0 +1,183 @@
+from dataclasses import dataclass
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dbt_mcp.semantic_layer.result_cache import MetricQuery
+
+# Measure aggregations whose results can be aggregated again, and how.
+# Semi-additive measures (with a non_additive_dimension, like balances) also
+# report these aggregations but can't be rolled up over time, and the metrics
+# API doesn't tell them apart, so rolling up is opt-in.
+ROLLUP_AGGREGATIONS = {
+    "SUM": "sum",
+    "SUM_BOOLEAN": "sum",
+    "COUNT": "sum",
+    "MIN": "min",
+    "MAX": "max",
+}
+
+# Grains each time grain can be truncated to. Weeks straddle months, so a
+# weekly result can't be rolled up any further. Days aren't rolled up to
+# weeks either, as the day weeks start on depends on the project.
+TIME_GRAIN_ROLLUPS = {
+    "day": ("day", "month", "quarter", "year"),
+    "week": ("week",),
+    "month": ("month", "quarter", "year"),
+    "quarter": ("quarter", "year"),
+    "year": ("year",),
+}
+
+TIME_DIMENSION = "time_dimension"
+
+
+@dataclass
+class GroupByColumn:
+    source: str
+    output: str
+    truncate_to: str | None = None
+
+
+@dataclass
+class RollupPlan:
+    group_by_columns: list[GroupByColumn]
+    metric_columns: list[tuple[str, str]]
+    order_by_columns: list[tuple[str, bool]]
+
+
+def _column_name(name: str, grain: str | None) -> str:
+    return f"{name}__{grain}" if grain else name
+
+
+def _find_column(table: pa.Table, name: str) -> str | None:
+    # Warehouses differ in the case of the column names they return
+    for column in table.column_names:
+        if column.lower() == name:
+            return column
+    return None
+
+
+def _plan_group_by(
+    name: str,
+    kind: str,
+    grain: str | None,
+    cached_grains: list[str | None],
+    table: pa.Table,
+    time_granularities: dict[str, list[str]],
+) -> GroupByColumn | None:
+    if grain in cached_grains:
+        source = _find_column(table, _column_name(name, grain))
+        return GroupByColumn(source, source) if source else None
+    if kind != TIME_DIMENSION or grain is None:
+        return None
+    if grain not in (g.lower() for g in time_granularities.get(name, [])):
+        return None
+    for cached_grain in cached_grains:
+        if cached_grain is None or grain not in TIME_GRAIN_ROLLUPS.get(
+            cached_grain, ()
+        ):
+            continue
+        source = _find_column(table, _column_name(name, cached_grain))
+        if source is not None:
+            output = _column_name(name, grain)
+            return GroupByColumn(
+                source=source,
+                output=output.upper() if source.isupper() else output,
+                truncate_to=grain,
+            )
+    return None
+
+
+def plan_rollup(
+    query: MetricQuery,
+    cached_query: MetricQuery,
+    table: pa.Table,
+    aggregations: dict[str, str],
+    time_granularities: dict[str, list[str]],
+) -> RollupPlan | None:
+    """Plan how to compute `query` from `table`, the result of `cached_query`.
+
+    `aggregations` maps the metrics that can be rolled up to the aggregation
+    that does it, and `time_granularities` maps time dimensions to the grains
+    they can be queried at. Returns None unless every metric of `query` can be
+    rolled up and the cached result is unlimited, filtered the same way and
+    at least as fine-grained as `query`.
+    """
+    if cached_query.limit is not None or cached_query.where != query.where:
+        return None
+    if len(set(query.metrics)) != len(query.metrics):
+        return None
+    metric_columns: list[tuple[str, str]] = []
+    for metric in query.metrics:
+        metric_column = _find_column(table, metric)
+        if metric not in aggregations or metric_column is None:
+            return None
+        metric_columns.append((metric, metric_column))
+
+    cached_grains: dict[tuple[str, str], list[str | None]] = {}
+    for name, kind, grain in cached_query.group_by:
+        cached_grains.setdefault((name, kind), []).append(grain)
+    group_by_columns: list[GroupByColumn] = []
+    for name, kind, grain in query.group_by:
+        group_by_column = _plan_group_by(
+            name,
+            kind,
+            grain,
+            cached_grains.get((name, kind), []),
+            table,
+            time_granularities,
+        )
+        if group_by_column is None:
+            return None
+        group_by_columns.append(group_by_column)
+    if len({c.output for c in group_by_columns}) != len(group_by_columns):
+        return None
+
+    # Metrics and group bys are ordered by name, group bys without their grain
+    order_names = dict(metric_columns)
+    for (name, _, _), group_by_column in zip(
+        query.group_by, group_by_columns, strict=True
+    ):
+        order_names.setdefault(name, group_by_column.output)
+    order_by_columns: list[tuple[str, bool]] = []
+    for name, descending in query.order_by:
+        if name not in order_names:
+            return None
+        order_by_columns.append((order_names[name], descending))
+    return RollupPlan(
+        group_by_columns=group_by_columns,
+        metric_columns=metric_columns,
+        order_by_columns=order_by_columns,
+    )
+
+
+def rollup(
+    table: pa.Table, plan: RollupPlan, aggregations: dict[str, str], limit: int | None
+) -> pa.Table:
+    """Aggregate the finer-grained result `table` as planned."""
+    keys = {}
+    for column in plan.group_by_columns:
+        keys[column.output] = (
+            pc.floor_temporal(table[column.source], unit=column.truncate_to)
+            if column.truncate_to
+            else table[column.source]
+        )
+    values = {column: table[column] for _, column in plan.metric_columns}
+    result = (
+        pa.table({**keys, **values})
+        .group_by(list(keys), use_threads=False)
+        .aggregate([(column, aggregations[m]) for m, column in plan.metric_columns])
+    )
+    result = result.select(
+        [*keys, *(f"{column}_{aggregations[m]}" for m, column in plan.metric_columns)]
+    ).rename_columns([*keys, *values])
+    if plan.order_by_columns:
+        result = result.sort_by(
+            [
+                (column, "descending" if descending else "ascending")
+                for column, descending in plan.order_by_columns
+            ]
+        )
+    if limit is not None:
+        result = result.slice(0, limit)
+    return result
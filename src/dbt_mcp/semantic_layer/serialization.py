@@ -0,0 +1,91 @@
+import base64
+import datetime
+import decimal
+import json
+from typing import Any, Literal
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+OutputFormat = Literal["json", "csv", "arrow"]
+
+MIME_TYPES: dict[OutputFormat, str] = {
+    "json": "application/json",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+# Rows converted to Python objects at a time when writing JSON
+JSON_BATCH_SIZE = 10_000
+
+
+def _epoch_ms(value: datetime.date) -> int:
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.UTC)
+    return round(value.timestamp() * 1000)
+
+
+def _json_default(value: Any) -> Any:
+    # Dates and timestamps are written as epoch milliseconds (naive ones as
+    # UTC), matching the pandas output that query results used to go through
+    if isinstance(value, datetime.date):
+        return _epoch_ms(value)
+    if isinstance(value, datetime.timedelta):
+        return round(value.total_seconds() * 1000)
+    if isinstance(value, datetime.time):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value) if value.is_finite() else None
+    return str(value)
+
+
+def _without_non_finite_floats(batch: pa.RecordBatch) -> pa.RecordBatch:
+    """Replace NaN and infinities, which aren't valid JSON, with nulls."""
+    columns = [
+        pc.if_else(pc.is_finite(column), column, None)
+        if pa.types.is_floating(column.type)
+        else column
+        for column in batch.columns
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=batch.schema)
+
+
+def table_to_json(table: pa.Table) -> str:
+    """Serialize a table to a compact JSON array of records, batch by batch."""
+    parts = []
+    for batch in table.to_batches(max_chunksize=JSON_BATCH_SIZE):
+        if batch.num_rows == 0:
+            continue
+        rows = json.dumps(
+            _without_non_finite_floats(batch).to_pylist(),
+            separators=(",", ":"),
+            default=_json_default,
+        )
+        # Strip the brackets so batches can be joined into one array
+        parts.append(rows[1:-1])
+    return "[" + ",".join(parts) + "]"
+
+
+def table_to_csv(table: pa.Table) -> str:
+    sink = pa.BufferOutputStream()
+    pa_csv.write_csv(table, sink)
+    return sink.getvalue().to_pybytes().decode()
+
+
+def table_to_arrow_ipc(table: pa.Table) -> bytes:
+    """Serialize a table to the Arrow IPC streaming format."""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def serialize_table(table: pa.Table, output_format: OutputFormat) -> str:
+    """Serialize a table to text, Arrow IPC being base64 encoded."""
+    if output_format == "csv":
+        return table_to_csv(table)
+    if output_format == "arrow":
+        return base64.b64encode(table_to_arrow_ipc(table)).decode()
+    return table_to_json(table)
@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from typing import TypeVar
+
+from dbtsl.client.asyncio import AsyncSemanticLayerClient
+from dbtsl.error import QueryFailedError
+from gql.transport.exceptions import TransportClosed, TransportQueryError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors raised by a query that leave its session usable
+QUERY_ERRORS = (QueryFailedError, TransportQueryError)
+# Errors raised before a request reaches the server, so that retrying it
+# can't run a query twice
+RECONNECT_ERRORS = (ConnectionRefusedError, BrokenPipeError, TransportClosed)
+
+
+async def ping(sl_client: AsyncSemanticLayerClient) -> None:
+    """Check the session with a cheap metadata round trip.
+
+    This goes through the GraphQL API, as the SDK doesn't expose a way to ping
+    the ADBC connection. A query failing on a stale ADBC connection is
+    retried on a new session anyway.
+    """
+    await sl_client.saved_queries()
+
+
+@dataclass
+class PooledSession:
+    client: AsyncSemanticLayerClient
+    exit_stack: AsyncExitStack
+    last_used_at: float
+    last_checked_at: float
+    uses: int = 0
+
+
+class SemanticLayerSessionPool:
+    """Pool of Semantic Layer clients with an open session.
+
+    Opening a session connects and authenticates to the ADBC API, so sessions
+    are kept open and reused across queries. At most `max_size` sessions are
+    open at once. Sessions idle for longer than `idle_timeout_seconds` are
+    closed, and sessions idle for longer than `health_check_interval_seconds`
+    are pinged before being reused. A query that can't be sent on a reused
+    session because its connection is gone is retried once on a new session.
+    Other failures, like timeouts, are not retried as the query may already
+    be running.
+
+    Idle sessions are closed in the background once they time out, and
+    `aclose` closes them all on shutdown.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], AsyncSemanticLayerClient],
+        max_size: int = 4,
+        idle_timeout_seconds: float = 300,
+        health_check_interval_seconds: float = 60,
+        health_check: Callable[[AsyncSemanticLayerClient], Awaitable[None]] = ping,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.client_factory = client_factory
+        self.max_size = max_size
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.health_check_interval_seconds = health_check_interval_seconds
+        self.health_check = health_check
+        self.clock = clock
+        self.idle: list[PooledSession] = []
+        self.sessions_opened = 0
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._eviction: asyncio.TimerHandle | None = None
+        self._eviction_tasks: set[asyncio.Task] = set()
+
+    async def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        # Sessions are bound to the event loop that opened them
+        if self._slots is None or self._loop is not loop:
+            stale, self.idle = self.idle, []
+            if self._eviction is not None:
+                self._eviction.cancel()
+                self._eviction = None
+            self._slots = asyncio.Semaphore(self.max_size)
+            old_loop, self._loop = self._loop, loop
+            await self._close_on(old_loop, stale)
+        return self._slots
+
+    async def _close_on(
+        self, loop: asyncio.AbstractEventLoop | None, sessions: list[PooledSession]
+    ) -> None:
+        """Close sessions opened on another event loop, if it still runs."""
+        if not sessions:
+            return
+        logger.info(f"Closing {len(sessions)} sessions of a previous event loop")
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            future = asyncio.run_coroutine_threadsafe(self._close_all(sessions), loop)
+            await asyncio.wrap_future(future)
+        else:
+            # Closing fails if their loop is gone, which _close logs
+            await self._close_all(sessions)
+
+    async def _close_all(self, sessions: list[PooledSession]) -> None:
+        await asyncio.gather(*(self._close(s) for s in sessions))
+
+    async def _open(self) -> PooledSession:
+        client = self.client_factory()
+        exit_stack = AsyncExitStack()
+        await exit_stack.enter_async_context(client.session())
+        self.sessions_opened += 1
+        now = self.clock()
+        return PooledSession(
+            client=client,
+            exit_stack=exit_stack,
+            last_used_at=now,
+            last_checked_at=now,
+        )
+
+    async def _close(self, session: PooledSession) -> None:
+        try:
+            await session.exit_stack.aclose()
+        except Exception as e:
+            logger.warning(f"Error closing semantic layer session: {e}")
+
+    async def _evict_idle(self) -> None:
+        now = self.clock()
+        expired = [
+            s for s in self.idle if now - s.last_used_at > self.idle_timeout_seconds
+        ]
+        if not expired:
+            return
+        self.idle = [s for s in self.idle if s not in expired]
+        logger.info(f"Closing {len(expired)} idle semantic layer sessions")
+        await self._close_all(expired)
+
+    def _schedule_eviction(self) -> None:
+        if self._eviction is not None or not self.idle:
+            return
+        oldest = min(s.last_used_at for s in self.idle)
+        # Sessions are evicted once idle for strictly longer than the timeout
+        delay = max(0.0, oldest + self.idle_timeout_seconds - self.clock()) + 0.01
+        self._eviction = asyncio.get_running_loop().call_later(delay, self._on_eviction)
+
+    def _on_eviction(self) -> None:
+        self._eviction = None
+        task = asyncio.create_task(self._evict_idle())
+        self._eviction_tasks.add(task)
+        task.add_done_callback(self._eviction_tasks.discard)
+        # Sessions used since are evicted later
+        task.add_done_callback(lambda _: self._schedule_eviction())
+
+    async def _is_healthy(self, session: PooledSession) -> bool:
+        if self.clock() - session.last_checked_at <= self.health_check_interval_seconds:
+            return True
+        try:
+            await self.health_check(session.client)
+        except Exception as e:
+            logger.info(f"Semantic layer session failed its health check: {e}")
+            return False
+        session.last_checked_at = self.clock()
+        return True
+
+    async def _acquire(self) -> PooledSession:
+        await self._evict_idle()
+        while self.idle:
+            # Most recently used sessions are the most likely to be healthy
+            session = self.idle.pop()
+            if await self._is_healthy(session):
+                return session
+            await self._close(session)
+        return await self._open()
+
+    def _release(self, session: PooledSession) -> None:
+        now = self.clock()
+        session.last_used_at = now
+        session.last_checked_at = now
+        session.uses += 1
+        self.idle.append(session)
+        self._schedule_eviction()
+
+    async def _run_on(
+        self,
+        session: PooledSession,
+        operation: Callable[[AsyncSemanticLayerClient], Awaitable[T]],
+    ) -> T:
+        try:
+            result = await operation(session.client)
+        except QUERY_ERRORS:
+            self._release(session)
+            raise
+        except BaseException:
+            await self._close(session)
+            raise
+        self._release(session)
+        return result
+
+    async def run(
+        self, operation: Callable[[AsyncSemanticLayerClient], Awaitable[T]]
+    ) -> T:
+        """Run `operation` on a pooled session, reconnecting once if it
+        couldn't be sent."""
+        async with await self._get_slots():
+            session = await self._acquire()
+            try:
+                return await self._run_on(session, operation)
+            except RECONNECT_ERRORS as e:
+                # A failure on a new session isn't caused by a stale connection
+                if session.uses == 0:
+                    raise
+                logger.info(f"Reconnecting semantic layer session after: {e}")
+                return await self._run_on(await self._open(), operation)
+
+    async def aclose(self) -> None:
+        if self._eviction is not None:
+            self._eviction.cancel()
+            self._eviction = None
+        idle, self.idle = self.idle, []
+        await self._close_all(idle)
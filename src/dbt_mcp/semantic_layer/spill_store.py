@@ -0,0 +1,128 @@
+import logging
+import tempfile
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpilledResult:
+    path: Path
+    num_rows: int
+    size_bytes: int
+    table: weakref.ref[pa.Table]
+
+
+class ResultSpillStore:
+    """Query results written to disk as Arrow files, to be read page by page.
+
+    Files are memory mapped when read, so reading a page doesn't load the
+    rest of the result. Once the files take up more than `max_bytes`, the
+    least recently read ones are deleted. Without a `directory`, results are
+    written to a temporary directory removed when the store is. Storing the
+    same table object again returns the id it was stored under.
+
+    Results are written and read from worker threads, so bookkeeping is
+    done under a lock.
+    """
+
+    def __init__(self, max_bytes: int, directory: str | None = None):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._tempdir: tempfile.TemporaryDirectory | None = None
+        if directory is None:
+            self._tempdir = tempfile.TemporaryDirectory(prefix="dbt-mcp-results-")
+            directory = self._tempdir.name
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._results: OrderedDict[str, SpilledResult] = OrderedDict()
+        # Ids of stored tables by object id, checked against the table's weakref
+        self._ids_by_table: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def _remove(self, result_id: str) -> None:
+        result = self._results.pop(result_id, None)
+        if result is None:
+            return
+        self.size_bytes -= result.size_bytes
+        for table_id, stored_id in list(self._ids_by_table.items()):
+            if stored_id == result_id:
+                del self._ids_by_table[table_id]
+        result.path.unlink(missing_ok=True)
+
+    def _stored_id(self, table: pa.Table) -> str | None:
+        result_id = self._ids_by_table.get(id(table))
+        result = self._results.get(result_id) if result_id else None
+        if result is None or result.table() is not table:
+            return None
+        return result_id
+
+    def put(self, table: pa.Table) -> str | None:
+        """Write `table` to disk, returning its id, or None if it's too large."""
+        if table.nbytes > self.max_bytes:
+            return None
+        with self._lock:
+            result_id = self._stored_id(table)
+            if result_id is not None:
+                self._results.move_to_end(result_id)
+                return result_id
+        result_id = uuid.uuid4().hex
+        path = self.directory / f"{result_id}.arrow"
+        with (
+            pa.OSFile(str(path), "wb") as sink,
+            pa.ipc.new_file(sink, table.schema) as writer,
+        ):
+            writer.write_table(table)
+        size_bytes = path.stat().st_size
+        with self._lock:
+            self._results[result_id] = SpilledResult(
+                path=path,
+                num_rows=table.num_rows,
+                size_bytes=size_bytes,
+                table=weakref.ref(table),
+            )
+            self._ids_by_table[id(table)] = result_id
+            self.size_bytes += size_bytes
+            while self.size_bytes > self.max_bytes and len(self._results) > 1:
+                oldest = next(iter(self._results))
+                logger.info(f"Evicting spilled query result {oldest}")
+                self._remove(oldest)
+        return result_id
+
+    def read(self, result_id: str, offset: int, limit: int) -> pa.Table | None:
+        """Read `limit` rows from `offset`, or None if the result is gone."""
+        with self._lock:
+            result = self._results.get(result_id)
+            if result is None:
+                return None
+            self._results.move_to_end(result_id)
+        try:
+            # The table keeps the mapping alive once the file is closed
+            with pa.memory_map(str(result.path)) as source:
+                table = pa.ipc.open_file(source).read_all()
+        except FileNotFoundError:
+            # Evicted by another thread since it was looked up
+            with self._lock:
+                self._remove(result_id)
+            return None
+        return table.slice(offset, limit)
+
+    def num_rows(self, result_id: str) -> int | None:
+        with self._lock:
+            result = self._results.get(result_id)
+        return result.num_rows if result else None
+
+    def clear(self) -> None:
+        with self._lock:
+            for result_id in list(self._results):
+                self._remove(result_id)
+
+    def __len__(self) -> int:
+        return len(self._results)
@@ -1,50 +1,103 @@
+import asyncio
 import logging
+import uuid
+from typing import Literal
 
 from dbtsl.api.shared.query_params import GroupByParam
 from mcp.server.fastmcp import FastMCP
+from mcp.types import BlobResourceContents, EmbeddedResource
+from pydantic import AnyUrl
 
 from dbt_mcp.config.config import SemanticLayerConfig
 from dbt_mcp.prompts.prompts import get_prompt
-from dbt_mcp.semantic_layer.client import get_semantic_layer_fetcher
+from dbt_mcp.semantic_layer.client import (
+    SemanticLayerFetcher,
+    get_semantic_layer_fetcher,
+)
+from dbt_mcp.semantic_layer.metric_picker import (
+    determine_correct_metric,
+    get_metric_catalog,
+)
+from dbt_mcp.semantic_layer.serialization import OutputFormat
 from dbt_mcp.semantic_layer.types import (
+    CompileSqlSuccess,
     DimensionToolResponse,
     EntityToolResponse,
+    MetricQuerySpec,
     MetricToolResponse,
     OrderByParam,
+    QueryMetricsBatchResult,
     QueryMetricsSuccess,
 )
-from dbt_mcp.semantic_layer.metric_picker import determine_correct_metric
 
 logger = logging.getLogger(__name__)
 
+# Number of likely metrics whose metadata is prefetched while one is picked
+PREFETCH_CANDIDATES = 3
+
+
+def format_page(result: QueryMetricsSuccess) -> str:
+    """The result, followed by which rows of the full result it holds if paged."""
+    if result.total_rows is None or result.num_rows is None:
+        return result.result
+    last_row = result.offset + result.num_rows
+    note = f"Rows {result.offset + 1} to {last_row} of {result.total_rows}."
+    if result.next_page_token:
+        note += (
+            " To get the next rows, call get_query_results_page with"
+            f' page_token="{result.next_page_token}".'
+        )
+    elif last_row < result.total_rows:
+        note += " The result is too large to page through, narrow the query."
+    return f"{result.result}\n\n{note}"
+
 
-def register_sl_tools(dbt_mcp: FastMCP, config: SemanticLayerConfig) -> None:
+def register_sl_tools(
+    dbt_mcp: FastMCP, config: SemanticLayerConfig
+) -> SemanticLayerFetcher:
     semantic_layer_fetcher = get_semantic_layer_fetcher(config)
 
     @dbt_mcp.tool(description=get_prompt("semantic_layer/list_metrics"))
-    def list_metrics() -> list[MetricToolResponse] | str:
-        return semantic_layer_fetcher.list_metrics()
+    async def list_metrics() -> list[MetricToolResponse] | str:
+        return await semantic_layer_fetcher.list_metrics()
 
     @dbt_mcp.tool(description=get_prompt("semantic_layer/get_dimensions"))
-    def get_dimensions(metrics: list[str]) -> list[DimensionToolResponse] | str:
-        return semantic_layer_fetcher.get_dimensions(metrics=metrics)
+    async def get_dimensions(metrics: list[str]) -> list[DimensionToolResponse] | str:
+        return await semantic_layer_fetcher.get_dimensions(metrics=metrics)
 
     @dbt_mcp.tool(description=get_prompt("semantic_layer/get_entities"))
-    def get_entities(metrics: list[str]) -> list[EntityToolResponse] | str:
-        return semantic_layer_fetcher.get_entities(metrics=metrics)
+    async def get_entities(metrics: list[str]) -> list[EntityToolResponse] | str:
+        return await semantic_layer_fetcher.get_entities(metrics=metrics)
 
     @dbt_mcp.tool(description=get_prompt("semantic_layer/query_metrics"))
-    def query_metrics(
-        query: str
-    ) -> str:
-
-        all_metrics = semantic_layer_fetcher.list_metrics()
-
+    async def query_metrics(
+        query: str,
+        group_by: list[GroupByParam] | None = None,
+        order_by: list[OrderByParam] | None = None,
+        where: str | None = None,
+        limit: int | None = None,
+        output_format: OutputFormat = "json",
+    ) -> str | EmbeddedResource:
+        all_metrics = await semantic_layer_fetcher.list_metrics()
+        catalog = await asyncio.to_thread(get_metric_catalog, all_metrics)
+
+        # Warm validation for the likeliest metrics while the LLM picks one
+        prefetches = {
+            metric.name: semantic_layer_fetcher.prefetch_query_metadata([metric.name])
+            for metric in catalog.retriever.shortlist(query, PREFETCH_CANDIDATES)
+        }
         logger.info(f"Before bedrock. Available metrics: {all_metrics}")
-        metrics = determine_correct_metric(
-            all_metrics=all_metrics,
-            user_input=query,
-        )
+        metrics: list[str] = []
+        try:
+            metrics = await asyncio.to_thread(
+                determine_correct_metric,
+                all_metrics=all_metrics,
+                user_input=query,
+            )
+        finally:
+            for name, prefetch in prefetches.items():
+                if metrics != [name]:
+                    prefetch.cancel()
         logger.info(f"After bedrock. Selected metrics: {metrics}")
 
         # Check if determine_correct_metric returned an empty list
@@ -72,10 +125,65 @@ Examples of clear queries:
 NO FURTHER ACTIONS WILL BE TAKEN until you provide a clarified query.
 """
 
-        result = semantic_layer_fetcher.query_metrics(
+        result = await semantic_layer_fetcher.query_metrics(
             metrics=metrics,
+            group_by=group_by,
+            order_by=order_by,
+            where=where,
+            limit=limit,
+            output_format=output_format,
         )
         if isinstance(result, QueryMetricsSuccess):
-            return result.result
+            if output_format == "arrow":
+                return EmbeddedResource(
+                    type="resource",
+                    resource=BlobResourceContents(
+                        uri=AnyUrl(f"dbt-sl://query-results/{uuid.uuid4()}.arrows"),
+                        mimeType=result.mime_type,
+                        blob=result.result,
+                    ),
+                )
+            return format_page(result)
         else:
             return result.error
+
+    @dbt_mcp.tool(description=get_prompt("semantic_layer/get_query_results_page"))
+    async def get_query_results_page(
+        page_token: str, output_format: Literal["json", "csv"] = "json"
+    ) -> str:
+        result = await semantic_layer_fetcher.get_results_page(
+            page_token=page_token, output_format=output_format
+        )
+        if isinstance(result, QueryMetricsSuccess):
+            return format_page(result)
+        return result.error
+
+    @dbt_mcp.tool(description=get_prompt("semantic_layer/compile_metrics_sql"))
+    async def compile_metrics_sql(
+        metrics: list[str],
+        group_by: list[GroupByParam] | None = None,
+        order_by: list[OrderByParam] | None = None,
+        where: str | None = None,
+        limit: int | None = None,
+    ) -> str:
+        result = await semantic_layer_fetcher.compile_sql(
+            metrics=metrics,
+            group_by=group_by,
+            order_by=order_by,
+            where=where,
+            limit=limit,
+        )
+        if isinstance(result, CompileSqlSuccess):
+            return result.sql
+        return result.error
+
+    @dbt_mcp.tool(description=get_prompt("semantic_layer/query_metrics_batch"))
+    async def query_metrics_batch(
+        queries: list[MetricQuerySpec],
+        output_format: Literal["json", "csv"] = "json",
+    ) -> list[QueryMetricsBatchResult]:
+        return await semantic_layer_fetcher.query_metrics_batch(
+            queries=queries, output_format=output_format
+        )
+
+    return semantic_layer_fetcher
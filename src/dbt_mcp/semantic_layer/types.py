@@ -1,5 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from dbtsl.api.shared.query_params import GroupByParam
 from dbtsl.models.dimension import DimensionType
 from dbtsl.models.entity import EntityType
 from dbtsl.models.metric import MetricType
@@ -17,6 +18,9 @@ class MetricToolResponse:
     type: MetricType
     label: str | None = None
     description: str | None = None
+    # Aggregation of the measure of simple metrics. Left out of the repr,
+    # which the metric picker shows to the LLM and matches its answer against
+    aggregation: str | None = field(default=None, repr=False)
 
 
 @dataclass
@@ -39,6 +43,12 @@ class EntityToolResponse:
 class QueryMetricsSuccess:
     result: str
     error: None = None
+    mime_type: str = "application/json"
+    # Set when only a page of the result is returned
+    total_rows: int | None = None
+    num_rows: int | None = None
+    offset: int = 0
+    next_page_token: str | None = None
 
 
 @dataclass
@@ -48,3 +58,31 @@ class QueryMetricsError:
 
 
 QueryMetricsResult = QueryMetricsSuccess | QueryMetricsError
+
+
+@dataclass
+class CompileSqlSuccess:
+    sql: str
+    error: None = None
+
+
+CompileSqlResult = CompileSqlSuccess | QueryMetricsError
+
+
+@dataclass
+class MetricQuerySpec:
+    metrics: list[str]
+    group_by: list[GroupByParam] | None = None
+    order_by: list[OrderByParam] | None = None
+    where: str | None = None
+    limit: int | None = None
+
+
+@dataclass
+class QueryMetricsBatchResult:
+    metrics: list[str]
+    duration_ms: int
+    result: str | None = None
+    error: str | None = None
+    total_rows: int | None = None
+    next_page_token: str | None = None
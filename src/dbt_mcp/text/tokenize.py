@@ -0,0 +1,8 @@
+import re
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Lowercase words and numbers, splitting on anything else like _ or -."""
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
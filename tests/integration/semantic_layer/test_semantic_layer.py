@@ -1,3 +1,4 @@
+import pytest
 from dbtsl.api.shared.query_params import GroupByParam, GroupByType
 
 from dbt_mcp.config.config import load_config
@@ -7,22 +8,25 @@ from dbt_mcp.semantic_layer.types import OrderByParam
 config = load_config()
 
 
-def test_semantic_layer_list_metrics():
+@pytest.mark.asyncio
+async def test_semantic_layer_list_metrics():
     semantic_layer_fetcher = get_semantic_layer_fetcher(config.semantic_layer_config)
-    metrics = semantic_layer_fetcher.list_metrics()
+    metrics = await semantic_layer_fetcher.list_metrics()
     assert len(metrics) > 0
 
 
-def test_semantic_layer_list_dimensions():
+@pytest.mark.asyncio
+async def test_semantic_layer_list_dimensions():
     semantic_layer_fetcher = get_semantic_layer_fetcher(config.semantic_layer_config)
-    metrics = semantic_layer_fetcher.list_metrics()
-    dimensions = semantic_layer_fetcher.get_dimensions(metrics=[metrics[0].name])
+    metrics = await semantic_layer_fetcher.list_metrics()
+    dimensions = await semantic_layer_fetcher.get_dimensions(metrics=[metrics[0].name])
     assert len(dimensions) > 0
 
 
-def test_semantic_layer_query_metrics():
+@pytest.mark.asyncio
+async def test_semantic_layer_query_metrics():
     semantic_layer_fetcher = get_semantic_layer_fetcher(config.semantic_layer_config)
-    result = semantic_layer_fetcher.query_metrics(
+    result = await semantic_layer_fetcher.query_metrics(
         metrics=["revenue"],
         group_by=[
             GroupByParam(
@@ -35,9 +39,10 @@ def test_semantic_layer_query_metrics():
     assert result is not None
 
 
-def test_semantic_layer_query_metrics_invalid_query():
+@pytest.mark.asyncio
+async def test_semantic_layer_query_metrics_invalid_query():
     semantic_layer_fetcher = get_semantic_layer_fetcher(config.semantic_layer_config)
-    result = semantic_layer_fetcher.query_metrics(
+    result = await semantic_layer_fetcher.query_metrics(
         metrics=["food_revenue"],
         group_by=[
             GroupByParam(
@@ -66,9 +71,10 @@ def test_semantic_layer_query_metrics_invalid_query():
     assert result is not None
 
 
-def test_semantic_layer_query_metrics_with_group_by_grain():
+@pytest.mark.asyncio
+async def test_semantic_layer_query_metrics_with_group_by_grain():
     semantic_layer_fetcher = get_semantic_layer_fetcher(config.semantic_layer_config)
-    result = semantic_layer_fetcher.query_metrics(
+    result = await semantic_layer_fetcher.query_metrics(
         metrics=["revenue"],
         group_by=[
             GroupByParam(
@@ -81,9 +87,10 @@ def test_semantic_layer_query_metrics_with_group_by_grain():
     assert result is not None
 
 
-def test_semantic_layer_query_metrics_with_order_by():
+@pytest.mark.asyncio
+async def test_semantic_layer_query_metrics_with_order_by():
     semantic_layer_fetcher = get_semantic_layer_fetcher(config.semantic_layer_config)
-    result = semantic_layer_fetcher.query_metrics(
+    result = await semantic_layer_fetcher.query_metrics(
         metrics=["revenue"],
         group_by=[
             GroupByParam(
@@ -97,16 +104,18 @@ def test_semantic_layer_query_metrics_with_order_by():
     assert result is not None
 
 
-def test_semantic_layer_query_metrics_with_misspellings():
+@pytest.mark.asyncio
+async def test_semantic_layer_query_metrics_with_misspellings():
     semantic_layer_fetcher = get_semantic_layer_fetcher(config.semantic_layer_config)
-    result = semantic_layer_fetcher.query_metrics(["revehue"])
+    result = await semantic_layer_fetcher.query_metrics(["revehue"])
     assert result is not None
     assert "revenue" in result
 
 
-def test_semantic_layer_get_entities():
+@pytest.mark.asyncio
+async def test_semantic_layer_get_entities():
     semantic_layer_fetcher = get_semantic_layer_fetcher(config.semantic_layer_config)
-    entities = semantic_layer_fetcher.get_entities(
+    entities = await semantic_layer_fetcher.get_entities(
         metrics=["count_dbt_copilot_requests"]
     )
     assert len(entities) > 0
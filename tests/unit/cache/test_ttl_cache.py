@@ -0,0 +1,46 @@
+import unittest
+
+from dbt_mcp.cache.ttl_cache import TTLCache
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_entries_expire_after_ttl(self):
+        timer = FakeTimer()
+        cache: TTLCache[str, int] = TTLCache(max_entries=10, ttl_seconds=5, timer=timer)
+        cache.set("a", 1)
+
+        timer.now = 5
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get_with_age("a"), (1, 5))
+        timer.now = 5.1
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache: TTLCache[str, int] = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_invalidate_matching(self):
+        cache: TTLCache[tuple[int, str], int] = TTLCache(max_entries=10, ttl_seconds=60)
+        cache.set((1, "a"), 1)
+        cache.set((2, "a"), 2)
+
+        cache.invalidate_matching(lambda key: key[0] == 1)
+
+        self.assertIsNone(cache.get((1, "a")))
+        self.assertEqual(cache.get((2, "a")), 2)
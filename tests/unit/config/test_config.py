@@ -0,0 +1,43 @@
+import os
+import unittest
+from unittest.mock import patch
+
+from dbt_mcp.config.config import load_config
+
+ENV = {
+    "DBT_HOST": "cloud.getdbt.com",
+    "DBT_PROD_ENV_ID": "1",
+    "DBT_TOKEN": "token",
+    "DISABLE_DBT_CLI": "true",
+}
+
+
+@patch("dbt_mcp.config.config.load_dotenv")
+class TestLoadConfig(unittest.TestCase):
+    def test_int_settings(self, _):
+        env = ENV | {"SEMANTIC_LAYER_PAGE_SIZE": "0"}
+        with patch.dict(os.environ, env, clear=True):
+            config = load_config()
+
+        assert config.semantic_layer_config is not None
+        self.assertEqual(config.semantic_layer_config.page_size, 0)
+        self.assertEqual(config.semantic_layer_config.session_pool_size, 4)
+
+    def test_malformed_int_settings(self, _):
+        env = ENV | {
+            "SEMANTIC_LAYER_PAGE_SIZE": "1k",
+            "DISCOVERY_CACHE_TTL_SECONDS": "1.5",
+        }
+        with (
+            patch.dict(os.environ, env, clear=True),
+            self.assertRaises(ValueError) as context,
+        ):
+            load_config()
+
+        message = str(context.exception)
+        self.assertIn(
+            "SEMANTIC_LAYER_PAGE_SIZE environment variable must be an integer,"
+            " got '1k'.",
+            message,
+        )
+        self.assertIn("DISCOVERY_CACHE_TTL_SECONDS", message)
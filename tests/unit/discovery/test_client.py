@@ -0,0 +1,246 @@
+import asyncio
+import unittest
+
+from dbt_mcp.discovery.cache import DiscoveryCache
+from dbt_mcp.discovery.client import (
+    BATCH_SIZE,
+    DEFAULT_MODELS_FIELDS,
+    MAX_PAGE_SIZE,
+    PAGE_SIZE,
+    GraphQLQueries,
+    ModelsFetcher,
+    get_model_details_query,
+    get_models_query,
+    normalize_model_fields,
+)
+
+
+class FakeMetadataAPIClient:
+    def __init__(self, num_models: int):
+        self.models = [
+            {"name": f"model_{i}", "uniqueId": f"model.project.model_{i}"}
+            for i in range(num_models)
+        ]
+        self.requested_page_sizes: list[int] = []
+        self.queries: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.latest_run_marker = "2026-01-01T00:00:00Z"
+        self.marker_checks = 0
+
+    async def execute_query(self, query: str, variables: dict) -> dict:
+        if "GetLatestRunMarker" in query:
+            self.marker_checks += 1
+            await asyncio.sleep(0)
+            return {
+                "data": {
+                    "environment": {
+                        "applied": {"lastUpdatedAt": self.latest_run_marker}
+                    }
+                }
+            }
+        if "first" in variables:
+            self.requested_page_sizes.append(variables["first"])
+        self.queries.append(query)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        if "GetModelsDetailsByName" in query:
+            applied = {}
+            for key, models_filter in variables.items():
+                if key.startswith("modelsFilter"):
+                    applied[key.replace("modelsFilter", "models")] = {
+                        "edges": [
+                            {"node": m}
+                            for m in self.models
+                            if m["name"] == models_filter["identifier"]
+                        ]
+                    }
+            return {"data": {"environment": {"applied": applied}}}
+        models = self.models
+        models_filter = variables.get("modelsFilter") or {}
+        if "uniqueIds" in models_filter:
+            models = [m for m in models if m["uniqueId"] in models_filter["uniqueIds"]]
+        if "identifier" in models_filter:
+            models = [m for m in models if m["name"] == models_filter["identifier"]]
+        start = int(variables.get("after") or 0)
+        end = min(start + variables["first"], len(models))
+        return {
+            "data": {
+                "environment": {
+                    "applied": {
+                        "models": {
+                            "pageInfo": {
+                                "endCursor": str(end),
+                                "hasNextPage": end < len(models),
+                            },
+                            "edges": [{"node": m} for m in models[start:end]],
+                        }
+                    }
+                }
+            }
+        }
+
+
+class TestModelsFetcherPagination(unittest.IsolatedAsyncioTestCase):
+    async def test_fetch_models_grows_page_size(self):
+        api_client = FakeMetadataAPIClient(num_models=2500)
+        models_fetcher = ModelsFetcher(api_client=api_client, environment_id=1)  # type: ignore
+
+        models = await models_fetcher.fetch_models()
+
+        self.assertEqual(len(models), 1000)
+        self.assertEqual(models[0]["name"], "model_0")
+        self.assertEqual(models[-1]["name"], "model_999")
+        self.assertEqual(api_client.requested_page_sizes[0], PAGE_SIZE)
+        self.assertLessEqual(max(api_client.requested_page_sizes), MAX_PAGE_SIZE)
+        self.assertEqual(sum(api_client.requested_page_sizes), 1000)
+        self.assertLess(len(api_client.requested_page_sizes), 1000 // PAGE_SIZE)
+
+    async def test_iter_models_requests_next_page_while_consuming(self):
+        api_client = FakeMetadataAPIClient(num_models=300)
+        models_fetcher = ModelsFetcher(api_client=api_client, environment_id=1)  # type: ignore
+
+        names = []
+        async for model in models_fetcher.iter_models(limit=None):
+            if model["name"] == "model_0":
+                # Give the prefetch of the next page a chance to run
+                await asyncio.sleep(0)
+                self.assertEqual(len(api_client.requested_page_sizes), 2)
+            names.append(model["name"])
+
+        self.assertEqual(len(names), 300)
+        self.assertEqual(api_client.max_in_flight, 1)
+
+    async def test_iter_models_stops_at_last_page(self):
+        api_client = FakeMetadataAPIClient(num_models=0)
+        models_fetcher = ModelsFetcher(api_client=api_client, environment_id=1)  # type: ignore
+
+        models = [m async for m in models_fetcher.iter_models()]
+
+        self.assertEqual(models, [])
+        self.assertEqual(len(api_client.requested_page_sizes), 1)
+
+
+class TestModelsFetcherBatch(unittest.IsolatedAsyncioTestCase):
+    async def test_fetch_models_details_batches_unique_ids(self):
+        api_client = FakeMetadataAPIClient(num_models=200)
+        models_fetcher = ModelsFetcher(api_client=api_client, environment_id=1)  # type: ignore
+        unique_ids = [f"model.project.model_{i}" for i in range(BATCH_SIZE + 10)]
+
+        details = await models_fetcher.fetch_models_details(
+            model_names=["model_150", "missing_model"],
+            unique_ids=[*unique_ids, "model.project.missing_model"],
+        )
+
+        self.assertEqual(details["model.project.model_0"]["name"], "model_0")
+        self.assertEqual(details[unique_ids[-1]]["uniqueId"], unique_ids[-1])
+        self.assertEqual(details["model.project.missing_model"], {})
+        self.assertEqual(details["model_150"]["uniqueId"], "model.project.model_150")
+        self.assertEqual(details["missing_model"], {})
+        # Two uniqueIds batches and one query for all names
+        self.assertEqual(sorted(api_client.requested_page_sizes), [11, BATCH_SIZE])
+        self.assertEqual(
+            sum("GetModelsDetailsByName" in q for q in api_client.queries), 1
+        )
+        self.assertGreater(api_client.max_in_flight, 1)
+
+    async def test_fetch_models_details_batches_lineage(self):
+        api_client = FakeMetadataAPIClient(num_models=200)
+        models_fetcher = ModelsFetcher(api_client=api_client, environment_id=1)  # type: ignore
+        unique_ids = [f"model.project.model_{i}" for i in range(BATCH_SIZE + 10)]
+
+        details = await models_fetcher.fetch_models_details(
+            unique_ids=unique_ids, fields=["parents", "children"]
+        )
+
+        self.assertEqual(list(details), unique_ids)
+        self.assertEqual(sorted(api_client.requested_page_sizes), [10, BATCH_SIZE])
+        self.assertTrue(
+            all("parents" in q and "children" in q for q in api_client.queries)
+        )
+        self.assertNotIn("compiledCode", api_client.queries[0])
+
+
+class TestModelsFetcherCache(unittest.IsolatedAsyncioTestCase):
+    async def test_fetch_models_is_cached_until_latest_run_marker_changes(self):
+        api_client = FakeMetadataAPIClient(num_models=10)
+        models_fetcher = ModelsFetcher(
+            api_client=api_client,  # type: ignore
+            environment_id=1,
+            cache=DiscoveryCache(
+                ttl_seconds=60, max_entries=10, marker_check_interval_seconds=0
+            ),
+        )
+
+        first_models = await models_fetcher.fetch_models()
+        second_models = await models_fetcher.fetch_models()
+        self.assertIs(second_models, first_models)
+        self.assertEqual(len(api_client.requested_page_sizes), 1)
+
+        await models_fetcher.fetch_models(model_filter={"modelingLayer": "marts"})
+        self.assertEqual(len(api_client.requested_page_sizes), 2)
+
+        api_client.latest_run_marker = "2026-01-02T00:00:00Z"
+        third_models = await models_fetcher.fetch_models()
+        self.assertIsNot(third_models, first_models)
+        self.assertEqual(len(api_client.requested_page_sizes), 3)
+
+    async def test_concurrent_callers_wait_for_marker_check(self):
+        api_client = FakeMetadataAPIClient(num_models=10)
+        cache = DiscoveryCache(ttl_seconds=60, max_entries=10)
+        models_fetcher = ModelsFetcher(
+            api_client=api_client,  # type: ignore
+            environment_id=1,
+            cache=cache,
+        )
+        first_models = await models_fetcher.fetch_models()
+
+        api_client.latest_run_marker = "2026-01-02T00:00:00Z"
+        cache._marker_checked_at.clear()
+        models = await asyncio.gather(
+            models_fetcher.fetch_models(), models_fetcher.fetch_models()
+        )
+
+        self.assertTrue(all(m is not first_models for m in models))
+        self.assertEqual(api_client.marker_checks, 2)
+
+
+class TestModelFieldProjection(unittest.IsolatedAsyncioTestCase):
+    def test_normalize_model_fields(self):
+        self.assertEqual(
+            normalize_model_fields(None, DEFAULT_MODELS_FIELDS), DEFAULT_MODELS_FIELDS
+        )
+        self.assertEqual(
+            normalize_model_fields(["catalog", "description", "catalog"], ()),
+            ("name", "uniqueId", "description", "catalog"),
+        )
+        with self.assertRaisesRegex(ValueError, "Unknown model fields: rawCode"):
+            normalize_model_fields(["rawCode"], ())
+
+    def test_queries_are_generated_once_per_field_set(self):
+        self.assertIs(
+            get_models_query(DEFAULT_MODELS_FIELDS), GraphQLQueries.GET_MODELS
+        )
+        query = get_model_details_query(("name", "uniqueId", "catalog"))
+        self.assertIs(query, get_model_details_query(("name", "uniqueId", "catalog")))
+        self.assertIn("columns", query)
+        self.assertNotIn("compiledCode", query)
+        self.assertIn("compiledCode", GraphQLQueries.GET_MODEL_DETAILS)
+
+    async def test_fetch_model_details_with_fields(self):
+        api_client = FakeMetadataAPIClient(num_models=1)
+        models_fetcher = ModelsFetcher(
+            api_client=api_client,  # type: ignore
+            environment_id=1,
+            cache=DiscoveryCache(ttl_seconds=60, max_entries=10),
+        )
+
+        await models_fetcher.fetch_model_details("model_0")
+        await models_fetcher.fetch_model_details("model_0", fields=["description"])
+        await models_fetcher.fetch_model_details("model_0", fields=["description"])
+
+        self.assertEqual(len(api_client.queries), 2)
+        self.assertIn("compiledCode", api_client.queries[0])
+        self.assertNotIn("compiledCode", api_client.queries[1])
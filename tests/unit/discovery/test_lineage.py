@@ -0,0 +1,140 @@
+import unittest
+
+from dbt_mcp.discovery.client import GraphQLQueries
+from dbt_mcp.discovery.lineage import LineageGraph, LineageIndex
+
+
+def node(unique_id: str, resource_type: str = "model") -> dict:
+    return {
+        "uniqueId": unique_id,
+        "name": unique_id.split(".")[-1],
+        "resourceType": resource_type,
+        "description": None,
+    }
+
+
+# source.raw_orders -> stg_orders -> orders -> customers -> exposure.dashboard
+#                                          \-> test.not_null_orders_id
+# seed.countries -> snapshot.countries_snapshot
+LINEAGE_MODELS = [
+    {
+        **node("model.jaffle.stg_orders"),
+        "parents": [node("source.jaffle.raw_orders", "source")],
+        "children": [node("model.jaffle.orders")],
+    },
+    {
+        **node("model.jaffle.orders"),
+        "parents": [node("model.jaffle.stg_orders")],
+        "children": [
+            node("model.jaffle.customers"),
+            node("test.jaffle.not_null_orders_id", "test"),
+        ],
+    },
+    {
+        **node("model.jaffle.customers"),
+        "parents": [node("model.jaffle.orders")],
+        "children": [node("exposure.jaffle.dashboard", "exposure")],
+    },
+]
+LINEAGE_SNAPSHOTS = [
+    {
+        **node("snapshot.jaffle.countries_snapshot", "snapshot"),
+        "parents": [node("seed.jaffle.countries", "seed")],
+        "children": [],
+    },
+]
+
+
+class TestLineageGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = LineageGraph.from_models(LINEAGE_MODELS + LINEAGE_SNAPSHOTS)
+
+    def test_parents_and_children(self):
+        orders = self.graph.resolve("orders")
+        assert orders is not None
+
+        self.assertEqual(
+            self.graph.parents(orders),
+            [{"resourceType": "model", "name": "stg_orders", "description": None}],
+        )
+        self.assertEqual(
+            sorted(n["name"] for n in self.graph.children(orders)),
+            ["customers", "not_null_orders_id"],
+        )
+
+    def test_edges_between_non_model_nodes(self):
+        countries = self.graph.resolve("", "seed.jaffle.countries")
+        assert countries is not None
+
+        self.assertEqual(
+            [n["uniqueId"] for n in self.graph.descendants(countries)],
+            ["snapshot.jaffle.countries_snapshot"],
+        )
+        self.assertIsNone(self.graph.resolve("countries_snapshot"))
+
+    def test_resolve_prefers_unique_id(self):
+        self.assertEqual(
+            self.graph.resolve("", "source.jaffle.raw_orders"),
+            self.graph.index["source.jaffle.raw_orders"],
+        )
+        self.assertIsNone(self.graph.resolve("raw_orders"))
+        self.assertIsNone(self.graph.resolve("unknown"))
+
+    def test_ancestors_with_depth(self):
+        customers = self.graph.resolve("customers")
+        assert customers is not None
+
+        ancestors = self.graph.ancestors(customers)
+        self.assertEqual(
+            [(n["name"], n["depth"]) for n in ancestors],
+            [("orders", 1), ("stg_orders", 2), ("raw_orders", 3)],
+        )
+        self.assertEqual(len(self.graph.ancestors(customers, max_depth=2)), 2)
+
+    def test_descendants_with_resource_types(self):
+        stg_orders = self.graph.resolve("stg_orders")
+        assert stg_orders is not None
+
+        descendants = self.graph.descendants(stg_orders, resource_types=["Exposure"])
+        self.assertEqual(
+            [(n["name"], n["depth"]) for n in descendants], [("dashboard", 3)]
+        )
+
+
+class FakeModelsFetcher:
+    def __init__(self):
+        self.num_builds = 0
+
+    async def iter_models(self, query: str, **kwargs):
+        if query == GraphQLQueries.GET_SNAPSHOTS_LINEAGE:
+            for snapshot in LINEAGE_SNAPSHOTS:
+                yield snapshot
+            return
+        self.num_builds += 1
+        for model in LINEAGE_MODELS:
+            yield model
+
+
+class TestLineageIndex(unittest.IsolatedAsyncioTestCase):
+    async def test_stale_graph_is_refreshed_in_background(self):
+        models_fetcher = FakeModelsFetcher()
+        lineage_index = LineageIndex(models_fetcher, refresh_interval_seconds=0)  # type: ignore
+
+        first_graph = await lineage_index.get_graph()
+        second_graph = await lineage_index.get_graph()
+        self.assertIs(second_graph, first_graph)
+
+        await lineage_index._refresh_task  # type: ignore
+        self.assertEqual(models_fetcher.num_builds, 2)
+        self.assertIsNot(await lineage_index.get_graph(), first_graph)
+
+    async def test_get_graph_if_built_does_not_wait(self):
+        models_fetcher = FakeModelsFetcher()
+        lineage_index = LineageIndex(models_fetcher, refresh_interval_seconds=60)  # type: ignore
+
+        self.assertIsNone(await lineage_index.get_graph_if_built())
+        await lineage_index._first_build_task  # type: ignore
+
+        graph = await lineage_index.get_graph_if_built()
+        self.assertIsNotNone(graph)
+        self.assertEqual(models_fetcher.num_builds, 1)
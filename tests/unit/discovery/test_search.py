@@ -0,0 +1,55 @@
+import unittest
+
+from dbt_mcp.discovery.search import SearchIndex
+
+
+def model(name: str, description: str, columns: list[str] | None = None) -> dict:
+    return {
+        "uniqueId": f"model.jaffle.{name}",
+        "name": name,
+        "description": description,
+        "catalog": {
+            "columns": [{"name": c, "description": None} for c in columns or []]
+        },
+    }
+
+
+MODELS = [
+    model("customers", "One row per customer", ["customer_id", "lifetime_value"]),
+    model("orders", "One row per order", ["order_id", "customer_id", "amount"]),
+    model("stg_payments", "Payments from the payment processor", ["payment_id"]),
+]
+
+
+class TestSearchIndex(unittest.TestCase):
+    def test_search_ranks_name_matches_first(self):
+        index = SearchIndex()
+        index.update([*MODELS, model("order_items", "Line items of orders")])
+
+        results = index.search("orders")
+
+        self.assertEqual([r["name"] for r in results], ["orders", "order_items"])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+    def test_search_matches_columns(self):
+        index = SearchIndex()
+        index.update(MODELS)
+
+        results = index.search("lifetime value", top_k=1)
+
+        self.assertEqual(results[0]["uniqueId"], "model.jaffle.customers")
+
+    def test_update_only_reindexes_changed_models(self):
+        index = SearchIndex()
+        self.assertEqual(index.update(MODELS), 3)
+
+        changed_models = [
+            MODELS[0],
+            model("orders", "Completed refunds", ["order_id"]),
+        ]
+        self.assertEqual(index.update(changed_models), 2)
+
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.search("payments"), [])
+        self.assertEqual(index.search("refunds")[0]["name"], "orders")
+        self.assertNotIn("amount", index.postings)
@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from dbt_mcp.discovery.lineage import LineageIndex
+from dbt_mcp.discovery.snapshot import DiscoverySnapshot
+from tests.unit.discovery.test_lineage import LINEAGE_MODELS, FakeModelsFetcher
+
+
+class TestDiscoverySnapshot(unittest.TestCase):
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot = DiscoverySnapshot(Path(tmp_dir) / "cache" / "snapshot.sqlite3")
+
+            self.assertIsNone(snapshot.load(1, "lineage graph"))
+            self.assertTrue(snapshot.save(1, "lineage graph", LINEAGE_MODELS))
+            self.assertFalse(snapshot.save(1, "lineage graph", LINEAGE_MODELS))
+
+            self.assertEqual(snapshot.load(1, "lineage graph"), LINEAGE_MODELS)
+            self.assertIsNone(snapshot.load(2, "lineage graph"))
+
+
+class TestLineageIndexSnapshot(unittest.IsolatedAsyncioTestCase):
+    async def test_restart_serves_snapshot_and_revalidates(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot = DiscoverySnapshot(Path(tmp_dir) / "snapshot.sqlite3")
+            models_fetcher = FakeModelsFetcher()
+            models_fetcher.environment_id = 1  # type: ignore
+
+            await LineageIndex(models_fetcher, snapshot=snapshot).get_graph()  # type: ignore
+            self.assertEqual(models_fetcher.num_builds, 1)
+
+            restarted_index = LineageIndex(models_fetcher, snapshot=snapshot)  # type: ignore
+            graph = await restarted_index.get_graph()
+            self.assertEqual(models_fetcher.num_builds, 1)
+            self.assertIsNotNone(graph.resolve("orders"))
+
+            await restarted_index._refresh_task  # type: ignore
+            self.assertEqual(models_fetcher.num_builds, 2)
+
+    async def test_load_snapshot_at_startup(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            snapshot = DiscoverySnapshot(Path(tmp_dir) / "snapshot.sqlite3")
+            models_fetcher = FakeModelsFetcher()
+            models_fetcher.environment_id = 1  # type: ignore
+
+            await LineageIndex(models_fetcher, snapshot=snapshot).get_graph()  # type: ignore
+
+            restarted_index = LineageIndex(models_fetcher, snapshot=snapshot)  # type: ignore
+            await restarted_index.load_snapshot()
+            self.assertEqual(models_fetcher.num_builds, 1)
+            graph = await restarted_index.get_graph_if_built()
+            self.assertIsNotNone(graph)
+            self.assertIsNotNone(graph.resolve("orders"))  # type: ignore
+
+            await restarted_index._refresh_task  # type: ignore
+            self.assertEqual(models_fetcher.num_builds, 2)
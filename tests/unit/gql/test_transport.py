@@ -0,0 +1,55 @@
+import unittest
+
+import httpx
+
+from dbt_mcp.gql.transport import GraphQLTransport
+
+
+class TestGraphQLTransport(unittest.IsolatedAsyncioTestCase):
+    async def test_post_reuses_pooled_client(self):
+        requests: list[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={"data": {"ok": True}})
+
+        transport = GraphQLTransport(http_transport=httpx.MockTransport(handler))
+        first_client = transport._get_client()
+
+        result = await transport.post(
+            "https://metadata.example.com/graphql",
+            json={"query": "{ ok }"},
+            headers={"Authorization": "Bearer token"},
+        )
+        await transport.post(
+            "https://metadata.example.com/graphql",
+            json={"query": "{ ok }"},
+            headers={"Authorization": "Bearer token"},
+        )
+
+        self.assertEqual(result, {"data": {"ok": True}})
+        self.assertIs(transport._get_client(), first_client)
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[0].headers["Authorization"], "Bearer token")
+        self.assertIn("br", requests[0].headers["Accept-Encoding"])
+        await transport.aclose()
+
+    async def test_warm_up_connects_to_registered_urls(self):
+        warmed_up_urls: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.host == "semantic-layer.example.com":
+                raise httpx.ConnectError("unreachable")
+            warmed_up_urls.append(str(request.url))
+            return httpx.Response(405)
+
+        transport = GraphQLTransport(http_transport=httpx.MockTransport(handler))
+        transport.register_url("https://metadata.example.com/graphql")
+        transport.register_url("https://metadata.example.com/graphql")
+        transport.register_url("https://semantic-layer.example.com/api/graphql")
+
+        # Unreachable hosts are logged rather than raised
+        await transport.warm_up()
+
+        self.assertEqual(warmed_up_urls, ["https://metadata.example.com/graphql"])
+        await transport.aclose()
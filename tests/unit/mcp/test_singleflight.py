@@ -0,0 +1,98 @@
+import asyncio
+import unittest
+
+from dbt_mcp.mcp.singleflight import SingleFlight, tool_call_key
+
+
+class TestToolCallKey(unittest.TestCase):
+    def test_equivalent_arguments_share_a_key(self):
+        self.assertEqual(
+            tool_call_key("get_dimensions", {"metrics": ["a"], "limit": None}),
+            tool_call_key("get_dimensions", {"metrics": ["a"]}),
+        )
+        self.assertEqual(
+            tool_call_key("query", {"a": 1, "b": 2}),
+            tool_call_key("query", {"b": 2, "a": 1}),
+        )
+        self.assertNotEqual(
+            tool_call_key("get_dimensions", {"metrics": ["a"]}),
+            tool_call_key("get_entities", {"metrics": ["a"]}),
+        )
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_share_one_execution(self):
+        singleflight: SingleFlight[int] = SingleFlight()
+        release = asyncio.Event()
+        num_calls = 0
+
+        async def call() -> int:
+            nonlocal num_calls
+            num_calls += 1
+            await release.wait()
+            return 42
+
+        waiters = [
+            asyncio.create_task(singleflight.do("key", "list_metrics", call))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        self.assertTrue(singleflight.is_in_flight("key"))
+        release.set()
+
+        self.assertEqual(await asyncio.gather(*waiters), [42, 42, 42])
+        self.assertEqual(num_calls, 1)
+        self.assertEqual(singleflight.executions["list_metrics"], 1)
+        self.assertEqual(singleflight.deduplicated["list_metrics"], 2)
+        self.assertFalse(singleflight.is_in_flight("key"))
+
+        # Later calls start a new execution
+        self.assertEqual(await singleflight.do("key", "list_metrics", call), 42)
+        self.assertEqual(num_calls, 2)
+
+    async def test_errors_are_shared_and_cancellation_is_not(self):
+        singleflight: SingleFlight[int] = SingleFlight()
+        release = asyncio.Event()
+
+        async def call() -> int:
+            await release.wait()
+            raise ValueError("boom")
+
+        cancelled = asyncio.create_task(singleflight.do("key", "tool", call))
+        waiter = asyncio.create_task(singleflight.do("key", "tool", call))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        with self.assertRaisesRegex(ValueError, "boom"):
+            await waiter
+
+    async def test_call_is_cancelled_with_its_last_caller(self):
+        singleflight: SingleFlight[int] = SingleFlight()
+        started = asyncio.Event()
+        cancelled = False
+
+        async def call() -> int:
+            nonlocal cancelled
+            started.set()
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            return 42
+
+        waiters = [
+            asyncio.create_task(singleflight.do("key", "tool", call)) for _ in range(2)
+        ]
+        await started.wait()
+        waiters[0].cancel()
+        await asyncio.sleep(0)
+        self.assertFalse(cancelled)
+
+        waiters[1].cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+        self.assertTrue(cancelled)
+        self.assertFalse(singleflight.is_in_flight("key"))
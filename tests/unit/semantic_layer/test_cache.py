@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+
+from dbt_mcp.semantic_layer.cache import SemanticLayerMetadataCache
+
+
+class FakeFetch:
+    def __init__(self, value: str):
+        self.value = value
+        self.num_calls = 0
+
+    async def __call__(self) -> str:
+        self.num_calls += 1
+        await asyncio.sleep(0)
+        return self.value
+
+
+class TestSemanticLayerMetadataCache(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_misses_share_one_fetch(self):
+        cache = SemanticLayerMetadataCache(ttl_seconds=60, max_entries=10)
+        fetch = FakeFetch("metrics")
+
+        results = await asyncio.gather(
+            *(cache.get(("metrics",), "list_metrics", fetch) for _ in range(3))
+        )
+
+        self.assertEqual(results, ["metrics"] * 3)
+        self.assertEqual(fetch.num_calls, 1)
+
+    async def test_stale_entries_are_served_and_refreshed_in_background(self):
+        cache = SemanticLayerMetadataCache(ttl_seconds=0.01, max_entries=10)
+        fetch = FakeFetch("v1")
+        self.assertEqual(await cache.get(("metrics",), "list_metrics", fetch), "v1")
+
+        await asyncio.sleep(0.02)
+        fetch.value = "v2"
+        self.assertEqual(await cache.get(("metrics",), "list_metrics", fetch), "v1")
+        # The refresh is already in flight, so it is not started again
+        self.assertEqual(await cache.get(("metrics",), "list_metrics", fetch), "v1")
+
+        await asyncio.sleep(0.001)
+        self.assertEqual(fetch.num_calls, 2)
+        self.assertEqual(await cache.get(("metrics",), "list_metrics", fetch), "v2")
+
+    async def test_catalog_hash_change_invalidates_dependent_entries(self):
+        cache = SemanticLayerMetadataCache(ttl_seconds=60, max_entries=10)
+        await cache.get(("metrics",), "list_metrics", FakeFetch("metrics"))
+        await cache.get(("dimensions", "revenue"), "get_dimensions", FakeFetch("d"))
+
+        cache.update_catalog_hash("a", ("metrics",))
+        cache.update_catalog_hash("a", ("metrics",))
+        self.assertEqual(len(cache.entries), 2)
+
+        cache.update_catalog_hash("b", ("metrics",))
+        self.assertEqual(len(cache.entries), 1)
+        self.assertIsNotNone(cache.entries.get(("metrics",)))
+
+    async def test_disabled_cache_always_fetches(self):
+        cache = SemanticLayerMetadataCache(ttl_seconds=0, max_entries=10)
+        fetch = FakeFetch("metrics")
+
+        await cache.get(("metrics",), "list_metrics", fetch)
+        await cache.get(("metrics",), "list_metrics", fetch)
+
+        self.assertEqual(fetch.num_calls, 2)
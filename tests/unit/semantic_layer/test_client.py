@@ -0,0 +1,303 @@
+import asyncio
+import json
+import unittest
+from contextlib import asynccontextmanager
+
+import pyarrow as pa
+from dbtsl.api.shared.query_params import GroupByParam, GroupByType
+from dbtsl.error import QueryFailedError
+from dbtsl.models.metric import MetricType
+from gql.transport.exceptions import TransportQueryError
+
+from dbt_mcp.config.config import SemanticLayerConfig
+from dbt_mcp.semantic_layer.client import SemanticLayerFetcher
+from dbt_mcp.semantic_layer.types import (
+    CompileSqlSuccess,
+    MetricQuerySpec,
+    MetricToolResponse,
+    QueryMetricsError,
+    QueryMetricsSuccess,
+)
+
+
+class FakeAsyncSemanticLayerClient:
+    in_flight = 0
+    max_in_flight = 0
+    queries = 0
+    compiles = 0
+
+    def __init__(
+        self,
+        error: Exception | None = None,
+        compile_error: Exception | None = None,
+    ):
+        self.error = error
+        self.compile_error = compile_error
+        self.has_session = False
+
+    @asynccontextmanager
+    async def session(self):
+        assert not self.has_session
+        self.has_session = True
+        try:
+            yield self
+        finally:
+            self.has_session = False
+
+    async def query(self, **kwargs) -> pa.Table:
+        cls = FakeAsyncSemanticLayerClient
+        cls.in_flight += 1
+        cls.queries += 1
+        cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        await asyncio.sleep(0.01)
+        cls.in_flight -= 1
+        if self.error:
+            raise self.error
+        group_by = {g.name.upper(): ["EU", "US"] for g in kwargs["group_by"] or []}
+        return pa.table({**group_by, "REVENUE": [1, 2]})
+
+    async def compile_sql(self, **kwargs) -> str:
+        FakeAsyncSemanticLayerClient.compiles += 1
+        if self.compile_error:
+            raise self.compile_error
+        return f"SELECT {', '.join(kwargs['metrics'])} FROM semantic_layer"
+
+
+def get_fetcher(
+    error: Exception | None = None, compile_error: Exception | None = None
+) -> SemanticLayerFetcher:
+    fetcher = SemanticLayerFetcher(
+        sl_client_factory=lambda: FakeAsyncSemanticLayerClient(error, compile_error),  # type: ignore
+        host="https://semantic-layer.example.com",
+        config=SemanticLayerConfig(
+            multicell_account_prefix=None,
+            host="example.com",
+            prod_environment_id=1,
+            service_token="token",
+            prefetch_metadata=False,
+        ),
+    )
+
+    async def validate_query_metrics_params(**kwargs) -> None:
+        return None
+
+    fetcher.validate_query_metrics_params = validate_query_metrics_params  # type: ignore
+    return fetcher
+
+
+class TestSemanticLayerFetcher(unittest.IsolatedAsyncioTestCase):
+    async def test_queries_run_concurrently(self):
+        fetcher = get_fetcher()
+        FakeAsyncSemanticLayerClient.max_in_flight = 0
+
+        results = await asyncio.gather(
+            fetcher.query_metrics(metrics=["revenue"]),
+            fetcher.query_metrics(metrics=["revenue"]),
+        )
+
+        self.assertEqual(FakeAsyncSemanticLayerClient.max_in_flight, 2)
+        for result in results:
+            assert isinstance(result, QueryMetricsSuccess)
+            self.assertEqual(
+                json.loads(result.result), [{"REVENUE": 1}, {"REVENUE": 2}]
+            )
+
+    async def test_caches_results(self):
+        fetcher = get_fetcher()
+        FakeAsyncSemanticLayerClient.queries = 0
+
+        first = await fetcher.query_metrics(metrics=["revenue"])
+        second = await fetcher.query_metrics(metrics=["Revenue"], output_format="csv")
+
+        self.assertEqual(FakeAsyncSemanticLayerClient.queries, 1)
+        assert isinstance(first, QueryMetricsSuccess)
+        assert isinstance(second, QueryMetricsSuccess)
+        self.assertEqual(second.result, '"REVENUE"\n1\n2\n')
+
+    async def query_after_regional_query(self, fetcher: SemanticLayerFetcher):
+        async def list_metrics() -> list[MetricToolResponse]:
+            return [
+                MetricToolResponse(
+                    name="revenue", type=MetricType.SIMPLE, aggregation="SUM"
+                )
+            ]
+
+        fetcher.list_metrics = list_metrics  # type: ignore
+        await fetcher.query_metrics(
+            metrics=["revenue"],
+            group_by=[GroupByParam("customer__region", GroupByType.DIMENSION, None)],
+        )
+        FakeAsyncSemanticLayerClient.queries = 0
+        return await fetcher.query_metrics(metrics=["revenue"])
+
+    async def test_rolls_up_cached_results(self):
+        fetcher = get_fetcher()
+        fetcher.config.rollup_cached_results = True
+
+        result = await self.query_after_regional_query(fetcher)
+
+        self.assertEqual(FakeAsyncSemanticLayerClient.queries, 0)
+        assert isinstance(result, QueryMetricsSuccess)
+        self.assertEqual(json.loads(result.result), [{"REVENUE": 3}])
+
+    async def test_rollup_is_opt_in(self):
+        fetcher = get_fetcher()
+
+        await self.query_after_regional_query(fetcher)
+
+        self.assertEqual(FakeAsyncSemanticLayerClient.queries, 1)
+
+    async def test_prefetch_query_metadata(self):
+        fetcher = get_fetcher()
+        fetches: list[str] = []
+        cancelled: list[str] = []
+        release = asyncio.Event()
+
+        async def fetch_dimensions(metrics: list[str]) -> list:
+            fetches.append(metrics[0])
+            try:
+                await release.wait()
+            except asyncio.CancelledError:
+                cancelled.append(metrics[0])
+                raise
+            return []
+
+        async def fetch_entities(metrics: list[str]) -> list:
+            return []
+
+        fetcher._fetch_dimensions = fetch_dimensions  # type: ignore
+        fetcher._fetch_entities = fetch_entities  # type: ignore
+
+        picked = fetcher.prefetch_query_metadata(["revenue"])
+        speculative = fetcher.prefetch_query_metadata(["orders"])
+        await asyncio.sleep(0.01)
+        speculative.cancel()
+        release.set()
+        await picked
+        await asyncio.gather(speculative, return_exceptions=True)
+
+        self.assertEqual(cancelled, ["orders"])
+        self.assertEqual(await fetcher.get_dimensions(["revenue"]), [])
+        self.assertEqual(fetches, ["revenue", "orders"])
+
+    async def test_query_metrics_batch(self):
+        fetcher = get_fetcher()
+        FakeAsyncSemanticLayerClient.max_in_flight = 0
+        queries = [
+            MetricQuerySpec(
+                metrics=["revenue"], where=f"{{{{ Dimension('id') }}}} = {i}"
+            )
+            for i in range(6)
+        ]
+
+        results = await fetcher.query_metrics_batch(queries, output_format="csv")
+
+        self.assertEqual(
+            FakeAsyncSemanticLayerClient.max_in_flight,
+            fetcher.config.session_pool_size,
+        )
+        self.assertEqual(len(results), 6)
+        for result in results:
+            self.assertEqual(result.metrics, ["revenue"])
+            self.assertEqual(result.result, '"REVENUE"\n1\n2\n')
+            self.assertIsNone(result.error)
+            self.assertGreaterEqual(result.duration_ms, 10)
+
+    async def test_query_metrics_batch_error(self):
+        fetcher = get_fetcher(error=ValueError("Warehouse unavailable"))
+
+        results = await fetcher.query_metrics_batch(
+            [MetricQuerySpec(metrics=["revenue"])]
+        )
+
+        self.assertIsNone(results[0].result)
+        self.assertEqual(results[0].error, "Warehouse unavailable")
+
+    async def test_compile_sql(self):
+        fetcher = get_fetcher()
+        FakeAsyncSemanticLayerClient.compiles = 0
+        FakeAsyncSemanticLayerClient.queries = 0
+
+        first = await fetcher.compile_sql(metrics=["revenue"])
+        second = await fetcher.compile_sql(metrics=["Revenue "])
+
+        self.assertEqual(FakeAsyncSemanticLayerClient.compiles, 1)
+        self.assertEqual(FakeAsyncSemanticLayerClient.queries, 0)
+        assert isinstance(first, CompileSqlSuccess)
+        self.assertEqual(first.sql, "SELECT revenue FROM semantic_layer")
+        self.assertEqual(second, first)
+
+    async def test_compile_sql_error(self):
+        fetcher = get_fetcher(
+            compile_error=TransportQueryError(
+                "", errors=[{"message": "Metric 'revenue' has no dimension 'x'"}]
+            )
+        )
+
+        result = await fetcher.compile_sql(metrics=["revenue"])
+
+        assert isinstance(result, QueryMetricsError)
+        self.assertEqual(result.error, "Metric 'revenue' has no dimension 'x'")
+        self.assertEqual(fetcher.session_pool.sessions_opened, 1)
+
+    async def test_precompile_rejects_invalid_queries(self):
+        fetcher = get_fetcher(compile_error=QueryFailedError("Invalid where clause"))
+        fetcher.config.precompile_queries = True
+        FakeAsyncSemanticLayerClient.queries = 0
+
+        result = await fetcher.query_metrics(metrics=["revenue"], where="oops")
+
+        assert isinstance(result, QueryMetricsError)
+        self.assertEqual(result.error, "Invalid where clause")
+        self.assertEqual(FakeAsyncSemanticLayerClient.queries, 0)
+
+    async def test_precompile_reuses_compiled_sql(self):
+        fetcher = get_fetcher()
+        fetcher.config.precompile_queries = True
+        FakeAsyncSemanticLayerClient.compiles = 0
+
+        await fetcher.compile_sql(metrics=["revenue"], limit=1)
+        result = await fetcher.query_metrics(metrics=["revenue"], limit=1)
+
+        assert isinstance(result, QueryMetricsSuccess)
+        self.assertEqual(FakeAsyncSemanticLayerClient.compiles, 1)
+
+    async def test_pages_large_results(self):
+        fetcher = get_fetcher()
+        fetcher.config.page_size = 1
+
+        first = await fetcher.query_metrics(metrics=["revenue"])
+
+        assert isinstance(first, QueryMetricsSuccess)
+        self.assertEqual(json.loads(first.result), [{"REVENUE": 1}])
+        self.assertEqual((first.total_rows, first.num_rows), (2, 1))
+        assert first.next_page_token is not None
+        again = await fetcher.query_metrics(metrics=["revenue"])
+        assert isinstance(again, QueryMetricsSuccess)
+        self.assertEqual(again.next_page_token, first.next_page_token)
+        self.assertEqual(len(fetcher.spill_store), 1)
+
+        queries = FakeAsyncSemanticLayerClient.queries
+        second = await fetcher.get_results_page(first.next_page_token, "csv")
+
+        self.assertEqual(FakeAsyncSemanticLayerClient.queries, queries)
+        assert isinstance(second, QueryMetricsSuccess)
+        self.assertEqual(second.result, '"REVENUE"\n2\n')
+        self.assertEqual((second.offset, second.num_rows), (1, 1))
+        self.assertIsNone(second.next_page_token)
+
+    async def test_expired_page_token(self):
+        fetcher = get_fetcher()
+
+        result = await fetcher.get_results_page("unknown:1")
+
+        assert isinstance(result, QueryMetricsError)
+        self.assertIn("expired", result.error)
+
+    async def test_query_error(self):
+        fetcher = get_fetcher(error=ValueError("Warehouse unavailable"))
+
+        result = await fetcher.query_metrics(metrics=["revenue"])
+
+        assert isinstance(result, QueryMetricsError)
+        self.assertEqual(result.error, "Warehouse unavailable")
@@ -0,0 +1,94 @@
+import random
+import string
+import unittest
+
+from dbt_mcp.semantic_layer.levenshtein import (
+    WordIndex,
+    get_closest_words,
+    get_distances,
+    get_misspellings,
+    levenshtein,
+)
+
+
+def dp_levenshtein(s1: str, s2: str) -> int:
+    previous = list(range(len(s2) + 1))
+    for i in range(1, len(s1) + 1):
+        current = [i] + [0] * len(s2)
+        for j in range(1, len(s2) + 1):
+            cost = 0 if s1[i - 1] == s2[j - 1] else 1
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + cost,
+            )
+        previous = current
+    return previous[-1]
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(string.ascii_lowercase[:6] + "_", k=rng.randint(0, 80)))
+
+
+class TestLevenshtein(unittest.TestCase):
+    def test_matches_dynamic_programming(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            s1, s2 = random_word(rng), random_word(rng)
+            self.assertEqual(levenshtein(s1, s2), dp_levenshtein(s1, s2), (s1, s2))
+
+    def test_max_distance_cutoff(self):
+        rng = random.Random(1)
+        for _ in range(500):
+            s1, s2 = random_word(rng), random_word(rng)
+            max_distance = rng.randint(0, 20)
+            expected = min(dp_levenshtein(s1, s2), max_distance + 1)
+            self.assertEqual(levenshtein(s1, s2, max_distance), expected, (s1, s2))
+
+    def test_get_distances(self):
+        words = ["revenue", "revenues", "order_total", "cost"]
+
+        self.assertEqual(
+            get_distances("revenu", words, max_distance=3),
+            [("revenue", 1), ("revenues", 2)],
+        )
+        self.assertEqual(
+            get_distances("cost", words),
+            [(w, dp_levenshtein("cost", w)) for w in words],
+        )
+
+    def test_get_closest_words_and_misspellings(self):
+        words = ["revenue", "revenues", "order_total", "cost"]
+
+        self.assertEqual(
+            get_closest_words("revenues", words, top_k=1, threshold=4), ["revenues"]
+        )
+        misspellings = get_misspellings(["revnue", "cost"], words, top_k=5)
+        self.assertEqual(len(misspellings), 1)
+        self.assertEqual(misspellings[0].word, "revnue")
+        self.assertEqual(misspellings[0].similar_words, ["revenue", "revenues"])
+
+
+class TestWordIndex(unittest.TestCase):
+    def test_matches_linear_scan(self):
+        rng = random.Random(2)
+        words = [random_word(rng)[:12] for _ in range(300)]
+        index = WordIndex(words)
+        for _ in range(200):
+            target = random_word(rng)[:12]
+            top_k = rng.choice([None, 1, 5])
+            threshold = rng.choice([None, 1, max(1, len(target) // 2)])
+            self.assertEqual(
+                index.get_closest_words(target, top_k=top_k, threshold=threshold),
+                get_closest_words(target, list(dict.fromkeys(words)), top_k, threshold),
+                (target, top_k, threshold),
+            )
+
+    def test_get_misspellings_with_index(self):
+        index = WordIndex(["revenue", "revenues", "order_total", "cost"])
+
+        self.assertIn("cost", index)
+        misspellings = get_misspellings(["revnue", "cost"], index, top_k=1)
+        self.assertEqual(len(misspellings), 1)
+        self.assertEqual(misspellings[0].similar_words, ["revenue"])
+        self.assertEqual(WordIndex([]).get_closest_words("revenue"), [])
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from dbt_mcp.config.config import SemanticLayerConfig
+from dbt_mcp.gql.transport import GraphQLTransport
+from dbt_mcp.semantic_layer.client import SemanticLayerFetcher
+from dbt_mcp.semantic_layer.metadata_index import MetricBitsets, merge_dimensions
+from dbt_mcp.semantic_layer.types import DimensionToolResponse
+
+
+def dimension(name: str, granularities: list[str] | None = None):
+    return DimensionToolResponse(
+        name=name,
+        type="TIME" if granularities else "CATEGORICAL",  # type: ignore
+        granularities=granularities or [],
+    )
+
+
+DIMENSIONS = {
+    "revenue": [
+        dimension("metric_time", ["DAY", "MONTH", "YEAR"]),
+        dimension("customer__region"),
+        dimension("order__channel"),
+    ],
+    "customers": [
+        dimension("metric_time", ["MONTH", "YEAR"]),
+        dimension("customer__region"),
+    ],
+    "refunds": [dimension("order__channel")],
+}
+
+
+class TestMetricBitsets(unittest.TestCase):
+    def setUp(self):
+        self.bitsets = MetricBitsets(DIMENSIONS, merge_dimensions)
+
+    def test_single_metric(self):
+        self.assertEqual(self.bitsets.get(["revenue"]), DIMENSIONS["revenue"])
+
+    def test_intersection(self):
+        self.assertEqual(
+            self.bitsets.get(["revenue", "customers"]),
+            [
+                dimension("metric_time", ["MONTH", "YEAR"]),
+                dimension("customer__region"),
+            ],
+        )
+        self.assertEqual(self.bitsets.get(["customers", "refunds"]), [])
+
+    def test_unknown_metric(self):
+        self.assertIsNone(self.bitsets.get(["revenue", "margin"]))
+        self.assertIsNone(self.bitsets.get([]))
+
+    def test_same_list_for_same_combination(self):
+        self.assertIs(
+            self.bitsets.get(["revenue", "customers"]),
+            self.bitsets.get(["customers", "revenue"]),
+        )
+
+
+class TestMetadataPrefetch(unittest.IsolatedAsyncioTestCase):
+    def get_fetcher(self, requests: list[dict]) -> SemanticLayerFetcher:
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            payload = json.loads(request.content)
+            requests.append(payload)
+            if "GetMetrics(" in payload["query"]:
+                metrics = [
+                    {"name": name, "type": "SIMPLE", "measures": []}
+                    for name in DIMENSIONS
+                ]
+                return httpx.Response(200, json={"data": {"metrics": metrics}})
+            data = {}
+            for variable, value in payload["variables"].items():
+                if variable.startswith("metrics"):
+                    i = variable.removeprefix("metrics")
+                    data[f"dimensions{i}"] = [
+                        {
+                            "name": d.name,
+                            "type": d.type,
+                            "queryableGranularities": d.granularities,
+                            "queryableTimeGranularities": [],
+                        }
+                        for d in DIMENSIONS[value[0]["name"]]
+                    ]
+                    data[f"entities{i}"] = []
+            return httpx.Response(200, json={"data": data})
+
+        transport = GraphQLTransport(http_transport=httpx.MockTransport(handler))
+        self.addAsyncCleanup(transport.aclose)
+        get_transport = patch(
+            "dbt_mcp.semantic_layer.gql.gql_request.get_transport",
+            return_value=transport,
+        )
+        get_transport.start()
+        self.addCleanup(get_transport.stop)
+        return SemanticLayerFetcher(
+            sl_client_factory=lambda: None,  # type: ignore
+            host="https://semantic-layer.example.com",
+            config=SemanticLayerConfig(
+                multicell_account_prefix=None,
+                host="example.com",
+                prod_environment_id=1,
+                service_token="token",
+            ),
+        )
+
+    async def test_prefetch_in_batches(self):
+        requests: list[dict] = []
+        fetcher = self.get_fetcher(requests)
+
+        with patch("dbt_mcp.semantic_layer.client.METRICS_PER_METADATA_REQUEST", 2):
+            await fetcher.prefetch_metadata()
+            self.assertEqual(len(requests), 3)
+
+            dimensions = await fetcher.get_dimensions(["revenue", "customers"])
+            self.assertEqual(
+                [(d.name, d.granularities) for d in dimensions],
+                [("metric_time", ["MONTH", "YEAR"]), ("customer__region", [])],
+            )
+            self.assertEqual(await fetcher.get_entities(["refunds"]), [])
+            self.assertEqual(len(requests), 3)
+
+    async def test_falls_back_while_index_is_built(self):
+        requests: list[dict] = []
+        fetcher = self.get_fetcher(requests)
+
+        dimensions = await fetcher.get_dimensions(["customers"])
+
+        self.assertEqual(
+            [d.name for d in dimensions], ["metric_time", "customer__region"]
+        )
+        self.assertTrue(any("dimensions(" in r["query"] for r in requests))
+        await asyncio.gather(*fetcher.cache._refresh_tasks)
+        fetched = len(requests)
+
+        await fetcher.get_dimensions(["revenue", "customers"])
+        self.assertEqual(len(requests), fetched)
@@ -0,0 +1,116 @@
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from dbtsl.models.metric import MetricType
+
+from dbt_mcp.semantic_layer import metric_picker
+from dbt_mcp.semantic_layer.metric_picker import (
+    determine_correct_metric,
+    get_bedrock_client,
+)
+from dbt_mcp.semantic_layer.types import MetricToolResponse
+from tests.mocks.bedrock import StubBedrockServer
+
+METRICS = [
+    MetricToolResponse(
+        name="revenue",
+        type=MetricType.SIMPLE,
+        label="Revenue",
+        description="Sum of order amounts",
+        aggregation="SUM",
+    ),
+    MetricToolResponse(
+        name="order_count",
+        type=MetricType.SIMPLE,
+        label="Orders",
+        description="Number of orders placed",
+    ),
+]
+
+
+class TestDetermineCorrectMetric(unittest.TestCase):
+    def setUp(self):
+        self.server = StubBedrockServer(response_text=str(METRICS[0]))
+        self.server.__enter__()
+        self.addCleanup(self.server.__exit__)
+        env = patch.dict(
+            os.environ,
+            {
+                "AWS_ACCESS_KEY_ID": "test",
+                "AWS_SECRET_ACCESS_KEY": "test",
+                "AWS_REGION": "eu-west-1",
+                "AWS_BEDROCK_MODEL": "test-model",
+                "AWS_BEDROCK_ENDPOINT_URL": self.server.url,
+            },
+        )
+        env.start()
+        self.addCleanup(env.stop)
+        get_bedrock_client.cache_clear()
+        self.addCleanup(get_bedrock_client.cache_clear)
+        metric_picker._decisions.clear()
+
+    def test_reuses_decisions(self):
+        self.assertEqual(
+            determine_correct_metric(METRICS, "How much money did we make?"),
+            ["revenue"],
+        )
+        self.assertEqual(
+            determine_correct_metric(METRICS, "how much money did we make"),
+            ["revenue"],
+        )
+
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.server.requests[0]["path"], "/model/test-model/invoke")
+
+    def test_catalog_change_invalidates_decisions(self):
+        determine_correct_metric(METRICS, "How much money did we make?")
+        determine_correct_metric(
+            [*METRICS, MetricToolResponse(name="refunds", type=MetricType.SIMPLE)],
+            "How much money did we make?",
+        )
+
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_unmatched_response_is_not_reused(self):
+        self.server.response_text = "no idea"
+
+        for _ in range(2):
+            self.assertEqual(
+                determine_correct_metric(METRICS, "How much money did we make?"), []
+            )
+
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_matches_response_without_aggregation(self):
+        # The format of the example response of the prompt
+        self.server.response_text = (
+            "MetricToolResponse(name='revenue', type=<MetricType.SIMPLE: 'SIMPLE'>,"
+            " label='Revenue', description='Sum of order amounts')"
+        )
+
+        self.assertEqual(
+            determine_correct_metric(METRICS, "How much money did we make?"),
+            ["revenue"],
+        )
+
+    def test_exact_match_skips_llm(self):
+        self.assertEqual(
+            determine_correct_metric(METRICS, "Orders by month"), ["order_count"]
+        )
+        self.assertEqual(self.server.requests, [])
+
+    def test_concurrent_queries(self):
+        questions = [f"How much money did we make in week {i % 4}?" for i in range(16)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            decisions = list(
+                executor.map(lambda q: determine_correct_metric(METRICS, q), questions)
+            )
+
+        self.assertEqual(decisions, [["revenue"]] * 16)
+        self.assertEqual(len(metric_picker._decisions), 4)
+
+    def test_reuses_client(self):
+        self.assertIs(get_bedrock_client(), get_bedrock_client())
@@ -0,0 +1,56 @@
+import unittest
+
+from dbtsl.models.metric import MetricType
+
+from dbt_mcp.semantic_layer.metric_retrieval import MetricRetriever
+from dbt_mcp.semantic_layer.types import MetricToolResponse
+
+
+def metric(name: str, label: str, description: str) -> MetricToolResponse:
+    return MetricToolResponse(
+        name=name, type=MetricType.SIMPLE, label=label, description=description
+    )
+
+
+METRICS = [
+    metric("revenue", "Revenue", "Sum of order amounts"),
+    metric("total_revenue", "Total Revenue", "Revenue including taxes and fees"),
+    metric("order_count", "Orders", "Number of orders placed"),
+    metric("active_customers", "Active Customers", "Customers with an order"),
+    metric("churn_rate", "Churn Rate", "Share of customers who cancelled"),
+    metric("refunds", "Refunds", "Amount refunded to customers"),
+]
+
+
+class TestMetricRetriever(unittest.TestCase):
+    def setUp(self):
+        self.retriever = MetricRetriever(METRICS)
+
+    def test_shortlist(self):
+        shortlist = self.retriever.shortlist("how many customers churned?", top_k=2)
+
+        self.assertEqual(
+            [m.name for m in shortlist], ["churn_rate", "active_customers"]
+        )
+
+    def test_shortlist_small_catalog(self):
+        self.assertEqual(self.retriever.shortlist("anything", top_k=10), METRICS)
+
+    def test_exact_match_by_name_or_label(self):
+        self.assertEqual(
+            self.retriever.exact_match("What was order_count last month?"),
+            METRICS[2],
+        )
+        self.assertEqual(
+            self.retriever.exact_match("show me Active Customers by region"),
+            METRICS[3],
+        )
+
+    def test_exact_match_prefers_longest(self):
+        self.assertEqual(
+            self.retriever.exact_match("total revenue in 2024"), METRICS[1]
+        )
+
+    def test_no_exact_match(self):
+        self.assertIsNone(self.retriever.exact_match("revenue and refunds by month"))
+        self.assertIsNone(self.retriever.exact_match("how are we doing?"))
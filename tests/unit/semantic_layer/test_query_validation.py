@@ -0,0 +1,101 @@
+import unittest
+
+from dbtsl.api.shared.query_params import GroupByParam, GroupByType
+from dbtsl.models.dimension import DimensionType
+
+from dbt_mcp.semantic_layer.levenshtein import WordIndex
+from dbt_mcp.semantic_layer.query_validation import (
+    FilterReference,
+    parse_where_references,
+    validate_where_and_grains,
+)
+from dbt_mcp.semantic_layer.types import DimensionToolResponse
+
+DIMENSIONS = [
+    DimensionToolResponse(
+        name="metric_time",
+        type=DimensionType.TIME,
+        granularities=["DAY", "MONTH"],
+    ),
+    DimensionToolResponse(name="customer__region", type=DimensionType.CATEGORICAL),
+]
+
+
+def validate(
+    where: str | None = None, group_by: list[GroupByParam] | None = None
+) -> list[str]:
+    return validate_where_and_grains(
+        where=where,
+        group_by=group_by,
+        dimensions=DIMENSIONS,
+        dimension_index=WordIndex([d.name for d in DIMENSIONS]),
+        entity_index=WordIndex(["customer", "order"]),
+    )
+
+
+class TestParseWhereReferences(unittest.TestCase):
+    def test_references(self):
+        self.assertEqual(
+            parse_where_references(
+                "{{ Dimension('customer__region') }} = 'EU'"
+                " and {{TimeDimension('metric_time', 'month')}} >= '2024-01-01'"
+                " and {{ Dimension('ordered_at', entity_path=['order']).grain('week') }}"
+                ' and {{ Entity("customer") }} = 1'
+                " and {{ Metric('revenue', group_by=['customer']) }} > 0"
+            ),
+            [
+                FilterReference("Dimension", "customer__region"),
+                FilterReference("TimeDimension", "metric_time", "month"),
+                FilterReference("Dimension", "order__ordered_at", "week"),
+                FilterReference("Entity", "customer"),
+            ],
+        )
+
+    def test_no_where(self):
+        self.assertEqual(parse_where_references(None), [])
+
+
+class TestValidateWhereAndGrains(unittest.TestCase):
+    def test_valid(self):
+        self.assertEqual(
+            validate(
+                where="{{ TimeDimension('metric_time', 'day') }} > '2024-01-01'"
+                " and {{ Entity('customer') }} = 1",
+                group_by=[
+                    GroupByParam("metric_time", GroupByType.TIME_DIMENSION, "month")
+                ],
+            ),
+            [],
+        )
+
+    def test_unknown_references(self):
+        self.assertEqual(
+            validate(
+                where="{{ Dimension('customer__regoin') }} = 'EU'"
+                " and {{ Entity('custmer') }} = 1"
+            ),
+            [
+                "Dimension customer__regoin not found. Did you mean: customer__region?",
+                "Entity custmer not found. Did you mean: customer?",
+            ],
+        )
+
+    def test_unavailable_grains(self):
+        self.assertEqual(
+            validate(
+                where="{{ TimeDimension('metric_time', 'week') }} > '2024-01-01'",
+                group_by=[
+                    GroupByParam("customer__region", GroupByType.DIMENSION, "month")
+                ],
+            ),
+            [
+                (
+                    "Grain week is not available for metric_time."
+                    " Available grains: day, month."
+                ),
+                (
+                    "Dimension customer__region is not a time dimension,"
+                    " so it has no grain."
+                ),
+            ],
+        )
@@ -0,0 +1,98 @@
+import unittest
+
+import pyarrow as pa
+from dbtsl.api.shared.query_params import GroupByParam, GroupByType
+
+from dbt_mcp.semantic_layer.result_cache import MetricQuery, QueryResultCache
+from dbt_mcp.semantic_layer.types import OrderByParam
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def revenue_query(**kwargs) -> MetricQuery:
+    return MetricQuery.from_params(metrics=["revenue"], **kwargs)
+
+
+class TestMetricQuery(unittest.TestCase):
+    def test_canonical_form(self):
+        self.assertEqual(
+            MetricQuery.from_params(
+                metrics=[" Revenue"],
+                group_by=[
+                    GroupByParam("Metric_Time", GroupByType.TIME_DIMENSION, "MONTH")
+                ],
+                order_by=[OrderByParam("Metric_Time", True)],
+                where="{{ Dimension('customer__region') }}  =\n 'EU'",
+            ),
+            MetricQuery.from_params(
+                metrics=["revenue"],
+                group_by=[
+                    GroupByParam("metric_time", GroupByType.TIME_DIMENSION, "month")
+                ],
+                order_by=[OrderByParam("metric_time", True)],
+                where="{{ Dimension('customer__region') }} = 'EU'",
+            ),
+        )
+
+    def test_distinguishes_parameters(self):
+        self.assertNotEqual(revenue_query(limit=10), revenue_query())
+        self.assertNotEqual(revenue_query(where="1 = 1"), revenue_query())
+        self.assertEqual(revenue_query(where="  "), revenue_query())
+
+    def test_keeps_whitespace_in_string_literals(self):
+        self.assertNotEqual(
+            revenue_query(where="{{ Dimension('customer__name') }} = 'Jane  Doe'"),
+            revenue_query(where="{{ Dimension('customer__name') }} = 'Jane Doe'"),
+        )
+        self.assertEqual(
+            revenue_query(where="{{ Dimension('customer__name') }}  = 'Jane  Doe' "),
+            revenue_query(where="{{ Dimension('customer__name') }} = 'Jane  Doe'"),
+        )
+
+
+class TestQueryResultCache(unittest.TestCase):
+    def setUp(self):
+        self.timer = FakeTimer()
+        self.table = pa.table({"REVENUE": list(range(100))})
+        self.cache = QueryResultCache(
+            ttl_seconds=60, max_bytes=self.table.nbytes * 2, timer=self.timer
+        )
+
+    def test_expires_entries(self):
+        self.cache.set(revenue_query(), self.table)
+        self.assertIs(self.cache.get(revenue_query()), self.table)
+
+        self.timer.now = 61
+        self.assertIsNone(self.cache.get(revenue_query()))
+        self.assertEqual(self.cache.size_bytes, 0)
+
+    def test_evicts_least_recently_used_over_budget(self):
+        self.cache.set(revenue_query(limit=1), self.table)
+        self.cache.set(revenue_query(limit=2), self.table)
+        self.cache.get(revenue_query(limit=1))
+        self.cache.set(revenue_query(limit=3), self.table)
+
+        self.assertIsNotNone(self.cache.get(revenue_query(limit=1)))
+        self.assertIsNone(self.cache.get(revenue_query(limit=2)))
+        self.assertIsNotNone(self.cache.get(revenue_query(limit=3)))
+        self.assertEqual(self.cache.size_bytes, self.table.nbytes * 2)
+
+    def test_skips_results_over_budget(self):
+        self.cache.set(revenue_query(), pa.concat_tables([self.table] * 3))
+
+        self.assertEqual(len(self.cache), 0)
+
+    def test_catalog_change_invalidates(self):
+        self.cache.update_catalog_hash("v1")
+        self.cache.set(revenue_query(), self.table)
+        self.cache.update_catalog_hash("v1")
+        self.assertIsNotNone(self.cache.get(revenue_query()))
+
+        self.cache.update_catalog_hash("v2")
+        self.assertIsNone(self.cache.get(revenue_query()))
@@ -0,0 +1,146 @@
+import datetime
+import unittest
+
+import pyarrow as pa
+from dbtsl.api.shared.query_params import GroupByParam, GroupByType
+
+from dbt_mcp.semantic_layer.result_cache import MetricQuery
+from dbt_mcp.semantic_layer.rollup import plan_rollup, rollup
+from dbt_mcp.semantic_layer.types import OrderByParam
+
+AGGREGATIONS = {"revenue": "sum", "max_order": "max"}
+TIME_GRANULARITIES = {"metric_time": ["DAY", "WEEK", "MONTH", "QUARTER", "YEAR"]}
+
+
+def metric_time(grain: str) -> GroupByParam:
+    return GroupByParam("metric_time", GroupByType.TIME_DIMENSION, grain)
+
+
+REGION = GroupByParam("customer__region", GroupByType.DIMENSION, None)
+
+DAILY_QUERY = MetricQuery.from_params(
+    metrics=["revenue", "max_order"], group_by=[metric_time("day"), REGION]
+)
+DAILY_RESULT = pa.table(
+    {
+        "METRIC_TIME__DAY": [
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 2),
+            datetime.date(2024, 2, 1),
+            datetime.date(2024, 2, 1),
+        ],
+        "CUSTOMER__REGION": ["EU", "EU", "EU", "US"],
+        "REVENUE": [10, 20, 30, 40],
+        "MAX_ORDER": [5, 8, 3, 9],
+    }
+)
+
+
+def plan_and_rollup(query: MetricQuery, cached_query: MetricQuery = DAILY_QUERY):
+    plan = plan_rollup(
+        query, cached_query, DAILY_RESULT, AGGREGATIONS, TIME_GRANULARITIES
+    )
+    if plan is None:
+        return None
+    return rollup(DAILY_RESULT, plan, AGGREGATIONS, query.limit)
+
+
+class TestRollup(unittest.TestCase):
+    def test_coarser_time_grain(self):
+        result = plan_and_rollup(
+            MetricQuery.from_params(
+                metrics=["revenue", "max_order"],
+                group_by=[metric_time("month")],
+                order_by=[OrderByParam("metric_time", False)],
+            )
+        )
+
+        assert result is not None
+        self.assertEqual(
+            result.to_pylist(),
+            [
+                {
+                    "METRIC_TIME__MONTH": datetime.date(2024, 1, 1),
+                    "REVENUE": 30,
+                    "MAX_ORDER": 8,
+                },
+                {
+                    "METRIC_TIME__MONTH": datetime.date(2024, 2, 1),
+                    "REVENUE": 70,
+                    "MAX_ORDER": 9,
+                },
+            ],
+        )
+
+    def test_fewer_group_bys(self):
+        result = plan_and_rollup(
+            MetricQuery.from_params(
+                metrics=["revenue"],
+                group_by=[REGION],
+                order_by=[OrderByParam("revenue", True)],
+                limit=1,
+            )
+        )
+
+        assert result is not None
+        self.assertEqual(
+            result.to_pylist(), [{"CUSTOMER__REGION": "EU", "REVENUE": 60}]
+        )
+
+    def test_total(self):
+        result = plan_and_rollup(MetricQuery.from_params(metrics=["revenue"]))
+
+        assert result is not None
+        self.assertEqual(result.to_pylist(), [{"REVENUE": 100}])
+
+    def test_unsupported_queries(self):
+        unsupported = {
+            "non-additive metric": MetricQuery.from_params(metrics=["customers"]),
+            "different filter": MetricQuery.from_params(
+                metrics=["revenue"], where="{{ Dimension('customer__region') }} = 'EU'"
+            ),
+            "finer grain": MetricQuery.from_params(
+                metrics=["revenue"], group_by=[metric_time("hour")]
+            ),
+            "days to weeks": MetricQuery.from_params(
+                metrics=["revenue"], group_by=[metric_time("week")]
+            ),
+            "missing group by": MetricQuery.from_params(
+                metrics=["revenue"],
+                group_by=[
+                    GroupByParam("customer__segment", GroupByType.DIMENSION, None)
+                ],
+            ),
+        }
+        for reason, query in unsupported.items():
+            with self.subTest(reason):
+                self.assertIsNone(plan_and_rollup(query))
+
+    def test_limited_cached_result(self):
+        limited_query = MetricQuery.from_params(
+            metrics=["revenue"], group_by=[metric_time("day")], limit=100
+        )
+
+        self.assertIsNone(
+            plan_and_rollup(MetricQuery.from_params(metrics=["revenue"]), limited_query)
+        )
+
+    def test_weeks_do_not_roll_up_to_months(self):
+        weekly_query = MetricQuery.from_params(
+            metrics=["revenue"], group_by=[metric_time("week")]
+        )
+        weekly_result = DAILY_RESULT.rename_columns(
+            ["METRIC_TIME__WEEK", "CUSTOMER__REGION", "REVENUE", "MAX_ORDER"]
+        )
+
+        self.assertIsNone(
+            plan_rollup(
+                MetricQuery.from_params(
+                    metrics=["revenue"], group_by=[metric_time("month")]
+                ),
+                weekly_query,
+                weekly_result,
+                AGGREGATIONS,
+                TIME_GRANULARITIES,
+            )
+        )
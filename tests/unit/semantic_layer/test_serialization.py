@@ -0,0 +1,96 @@
+import base64
+import datetime
+import decimal
+import json
+import unittest
+
+import pyarrow as pa
+
+from dbt_mcp.semantic_layer import serialization
+from dbt_mcp.semantic_layer.serialization import (
+    serialize_table,
+    table_to_arrow_ipc,
+    table_to_csv,
+    table_to_json,
+)
+
+TABLE = pa.table(
+    {
+        "METRIC_TIME__DAY": [datetime.date(2024, 1, 1), datetime.date(2024, 1, 2)],
+        "REVENUE": pa.array(
+            [decimal.Decimal("10.50"), None], type=pa.decimal128(10, 2)
+        ),
+        "ORDERS": [3, 4],
+    }
+)
+
+
+class TestSerialization(unittest.TestCase):
+    def test_table_to_json(self):
+        result = table_to_json(TABLE)
+
+        self.assertNotIn(" ", result)
+        self.assertEqual(
+            json.loads(result),
+            [
+                {"METRIC_TIME__DAY": 1704067200000, "REVENUE": 10.5, "ORDERS": 3},
+                {"METRIC_TIME__DAY": 1704153600000, "REVENUE": None, "ORDERS": 4},
+            ],
+        )
+        self.assertEqual(table_to_json(TABLE.slice(0, 0)), "[]")
+
+    def test_table_to_json_temporal_columns(self):
+        table = pa.table(
+            {
+                "METRIC_TIME__HOUR": [datetime.datetime(2024, 1, 1, 12)],
+                "CREATED_AT": pa.array(
+                    [datetime.datetime(2024, 1, 1, 13, tzinfo=datetime.UTC)],
+                    type=pa.timestamp("us", "Europe/Paris"),
+                ),
+                "DURATION": [datetime.timedelta(seconds=1.5)],
+                "OPENS_AT": [datetime.time(9, 30)],
+            }
+        )
+
+        self.assertEqual(
+            json.loads(table_to_json(table)),
+            [
+                {
+                    "METRIC_TIME__HOUR": 1704110400000,
+                    "CREATED_AT": 1704114000000,
+                    "DURATION": 1500,
+                    "OPENS_AT": "09:30:00",
+                }
+            ],
+        )
+
+    def test_table_to_json_non_finite_floats(self):
+        table = pa.table({"RATIO": [1.5, float("nan"), float("-inf"), None]})
+
+        self.assertEqual(
+            json.loads(table_to_json(table)),
+            [{"RATIO": 1.5}, {"RATIO": None}, {"RATIO": None}, {"RATIO": None}],
+        )
+
+    def test_table_to_json_joins_batches(self):
+        original_batch_size = serialization.JSON_BATCH_SIZE
+        serialization.JSON_BATCH_SIZE = 1
+        try:
+            result = table_to_json(TABLE)
+        finally:
+            serialization.JSON_BATCH_SIZE = original_batch_size
+
+        self.assertEqual([row["ORDERS"] for row in json.loads(result)], [3, 4])
+
+    def test_table_to_csv(self):
+        lines = table_to_csv(TABLE).splitlines()
+
+        self.assertEqual(lines[0], '"METRIC_TIME__DAY","REVENUE","ORDERS"')
+        self.assertEqual(lines[1], "2024-01-01,10.50,3")
+
+    def test_arrow_ipc_round_trip(self):
+        encoded = serialize_table(TABLE, "arrow")
+
+        ipc = base64.b64decode(encoded)
+        self.assertEqual(ipc, table_to_arrow_ipc(TABLE))
+        self.assertTrue(pa.ipc.open_stream(ipc).read_all().equals(TABLE))
@@ -0,0 +1,191 @@
+import asyncio
+import unittest
+from contextlib import asynccontextmanager
+
+from dbtsl.error import QueryFailedError
+
+from dbt_mcp.semantic_layer.session_pool import (
+    PooledSession,
+    SemanticLayerSessionPool,
+)
+
+
+class FakeClient:
+    def __init__(self):
+        self.opened = False
+        self.closed = False
+
+    @asynccontextmanager
+    async def session(self):
+        self.opened = True
+        yield self
+        self.closed = True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSemanticLayerSessionPool(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.clients: list[FakeClient] = []
+        self.clock = FakeClock()
+        self.health_checks = 0
+        self.healthy = True
+
+        def client_factory() -> FakeClient:
+            client = FakeClient()
+            self.clients.append(client)
+            return client
+
+        async def health_check(client: FakeClient) -> None:
+            self.health_checks += 1
+            if not self.healthy:
+                raise ConnectionError("Connection reset")
+
+        self.pool = SemanticLayerSessionPool(
+            client_factory,  # type: ignore
+            max_size=2,
+            idle_timeout_seconds=300,
+            health_check_interval_seconds=60,
+            health_check=health_check,  # type: ignore
+            clock=self.clock,
+        )
+
+    async def run_operation(self) -> FakeClient:
+        async def operation(client: FakeClient) -> FakeClient:
+            return client
+
+        return await self.pool.run(operation)  # type: ignore
+
+    async def test_reuses_session(self):
+        first = await self.run_operation()
+        second = await self.run_operation()
+
+        self.assertIs(first, second)
+        self.assertEqual(self.pool.sessions_opened, 1)
+        self.assertFalse(first.closed)
+
+    async def test_closes_idle_sessions(self):
+        first = await self.run_operation()
+        self.clock.now = 301
+        second = await self.run_operation()
+
+        self.assertIsNot(first, second)
+        self.assertTrue(first.closed)
+
+    async def test_health_check(self):
+        first = await self.run_operation()
+        self.clock.now = 30
+        await self.run_operation()
+        self.assertEqual(self.health_checks, 0)
+
+        self.clock.now = 100
+        self.healthy = False
+        second = await self.run_operation()
+
+        self.assertEqual(self.health_checks, 1)
+        self.assertTrue(first.closed)
+        self.assertIsNot(first, second)
+
+    async def test_reconnects_on_failure(self):
+        first = await self.run_operation()
+
+        async def operation(client: FakeClient) -> FakeClient:
+            if client is first:
+                raise ConnectionRefusedError("Connection refused")
+            return client
+
+        second = await self.pool.run(operation)  # type: ignore
+
+        self.assertTrue(first.closed)
+        self.assertIsNot(first, second)
+        self.assertEqual(self.pool.sessions_opened, 2)
+
+    async def test_does_not_retry_sent_queries(self):
+        first = await self.run_operation()
+        attempts = 0
+
+        async def operation(client: FakeClient) -> FakeClient:
+            nonlocal attempts
+            attempts += 1
+            raise TimeoutError
+
+        with self.assertRaises(TimeoutError):
+            await self.pool.run(operation)  # type: ignore
+
+        self.assertEqual(attempts, 1)
+        self.assertTrue(first.closed)
+
+    async def test_query_errors_keep_session(self):
+        first = await self.run_operation()
+
+        async def operation(client: FakeClient) -> FakeClient:
+            raise QueryFailedError("Invalid metric")
+
+        with self.assertRaises(QueryFailedError):
+            await self.pool.run(operation)  # type: ignore
+
+        self.assertFalse(first.closed)
+        self.assertIs(await self.run_operation(), first)
+
+    async def test_does_not_retry_new_sessions(self):
+        async def operation(client: FakeClient) -> FakeClient:
+            raise ConnectionRefusedError("Connection refused")
+
+        with self.assertRaises(ConnectionRefusedError):
+            await self.pool.run(operation)  # type: ignore
+
+        self.assertEqual(self.pool.sessions_opened, 1)
+        self.assertTrue(self.clients[0].closed)
+
+    async def test_closes_idle_sessions_in_background(self):
+        pool = SemanticLayerSessionPool(
+            FakeClient,  # type: ignore
+            idle_timeout_seconds=0.05,
+        )
+
+        async def operation(client: FakeClient) -> FakeClient:
+            return client
+
+        client = await pool.run(operation)  # type: ignore
+        self.assertFalse(client.closed)
+        await asyncio.sleep(0.2)
+
+        self.assertTrue(client.closed)
+        self.assertEqual(pool.idle, [])
+
+    async def test_aclose(self):
+        client = await self.run_operation()
+
+        await self.pool.aclose()
+
+        self.assertTrue(client.closed)
+        self.assertEqual(self.pool.idle, [])
+
+
+class TestSessionPoolEventLoops(unittest.TestCase):
+    def test_closes_sessions_of_previous_loop(self):
+        pool = SemanticLayerSessionPool(FakeClient)  # type: ignore
+        closed: list[FakeClient] = []
+        close = pool._close
+
+        async def record_close(session: PooledSession) -> None:
+            closed.append(session.client)  # type: ignore
+            await close(session)
+
+        pool._close = record_close  # type: ignore
+
+        async def operation(client: FakeClient) -> FakeClient:
+            return client
+
+        first = asyncio.run(pool.run(operation))  # type: ignore
+        second = asyncio.run(pool.run(operation))  # type: ignore
+
+        self.assertIsNot(first, second)
+        self.assertEqual(closed, [first])
+        self.assertEqual(pool.idle[0].client, second)
@@ -0,0 +1,75 @@
+import tempfile
+import unittest
+
+import pyarrow as pa
+
+from dbt_mcp.semantic_layer.spill_store import ResultSpillStore
+
+
+def table(num_rows: int) -> pa.Table:
+    return pa.table({"REVENUE": list(range(num_rows))})
+
+
+class TestResultSpillStore(unittest.TestCase):
+    def test_reads_pages(self):
+        store = ResultSpillStore(max_bytes=1024 * 1024)
+
+        result_id = store.put(table(10))
+
+        assert result_id is not None
+        self.assertEqual(store.num_rows(result_id), 10)
+        self.assertEqual(
+            store.read(result_id, offset=4, limit=3), pa.table({"REVENUE": [4, 5, 6]})
+        )
+        self.assertEqual(store.read(result_id, offset=8, limit=3).num_rows, 2)  # type: ignore
+
+    def test_unknown_result(self):
+        store = ResultSpillStore(max_bytes=1024 * 1024)
+
+        self.assertIsNone(store.read("unknown", offset=0, limit=1))
+        self.assertIsNone(store.num_rows("unknown"))
+
+    def test_evicts_least_recently_read(self):
+        sizing_store = ResultSpillStore(max_bytes=1024 * 1024)
+        sizing_store.put(table(100))
+        size_bytes = sizing_store.size_bytes
+        with tempfile.TemporaryDirectory() as directory:
+            store = ResultSpillStore(max_bytes=2 * size_bytes, directory=directory)
+            first = store.put(table(100))
+            second = store.put(table(100))
+            store.read(first, offset=0, limit=1)  # type: ignore
+
+            third = store.put(table(100))
+
+            self.assertEqual(len(store), 2)
+            self.assertIsNotNone(store.read(first, offset=0, limit=1))  # type: ignore
+            self.assertIsNone(store.read(second, offset=0, limit=1))  # type: ignore
+            self.assertIsNotNone(store.read(third, offset=0, limit=1))  # type: ignore
+            self.assertEqual(
+                sorted(p.name for p in store.directory.iterdir()),
+                sorted([f"{first}.arrow", f"{third}.arrow"]),
+            )
+
+    def test_too_large(self):
+        store = ResultSpillStore(max_bytes=10)
+
+        self.assertIsNone(store.put(table(100)))
+        self.assertEqual(len(store), 0)
+
+    def test_reuses_stored_table(self):
+        store = ResultSpillStore(max_bytes=1024 * 1024)
+        stored = table(10)
+
+        self.assertEqual(store.put(stored), store.put(stored))
+        self.assertNotEqual(store.put(stored), store.put(table(10)))
+        self.assertEqual(len(store), 2)
+
+    def test_deleted_file(self):
+        store = ResultSpillStore(max_bytes=1024 * 1024)
+        result_id = store.put(table(10))
+        assert result_id is not None
+        (store.directory / f"{result_id}.arrow").unlink()
+
+        self.assertIsNone(store.read(result_id, offset=0, limit=1))
+        self.assertIsNone(store.read(result_id, offset=0, limit=1))
+        self.assertEqual((len(store), store.size_bytes), (0, 0))
@@ -0,0 +1,67 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+
+from dbtsl.api.shared.query_params import GroupByParam, GroupByType
+from dbtsl.models.metric import MetricType
+from mcp.server.fastmcp import FastMCP
+
+from dbt_mcp.semantic_layer.tools import register_sl_tools
+from dbt_mcp.semantic_layer.types import MetricToolResponse, QueryMetricsError
+
+METRICS = [
+    MetricToolResponse(name="revenue", type=MetricType.SIMPLE, label="Revenue"),
+    MetricToolResponse(name="order_count", type=MetricType.SIMPLE, label="Orders"),
+]
+
+
+class FakeSemanticLayerFetcher:
+    def __init__(self):
+        self.queries: list[dict] = []
+
+    async def list_metrics(self) -> list[MetricToolResponse]:
+        return METRICS
+
+    def prefetch_query_metadata(self, metrics: list[str]) -> asyncio.Task[None]:
+        return asyncio.create_task(asyncio.sleep(0))
+
+    async def query_metrics(self, **kwargs) -> QueryMetricsError:
+        self.queries.append(kwargs)
+        return QueryMetricsError(
+            error="Errors: Dimension customer__regoin not found."
+            " Did you mean: customer__region?"
+        )
+
+
+class TestQueryMetricsTool(unittest.IsolatedAsyncioTestCase):
+    async def test_forwards_query_parameters(self):
+        fetcher = FakeSemanticLayerFetcher()
+        dbt_mcp = FastMCP("Test")
+        with patch(
+            "dbt_mcp.semantic_layer.tools.get_semantic_layer_fetcher",
+            return_value=fetcher,
+        ):
+            register_sl_tools(dbt_mcp, MagicMock())
+
+        where = "{{ Dimension('customer__regoin') }} = 'EU'"
+        result = await dbt_mcp.call_tool(
+            "query_metrics",
+            {
+                "query": "Revenue by month",
+                "group_by": [
+                    {"name": "metric_time", "type": "time_dimension", "grain": "MONTH"}
+                ],
+                "where": where,
+                "limit": 10,
+            },
+        )
+
+        self.assertEqual(len(fetcher.queries), 1)
+        query = fetcher.queries[0]
+        self.assertEqual(query["metrics"], ["revenue"])
+        self.assertEqual(
+            query["group_by"],
+            [GroupByParam("metric_time", GroupByType.TIME_DIMENSION, "MONTH")],
+        )
+        self.assertEqual((query["where"], query["limit"]), (where, 10))
+        self.assertIn("Did you mean: customer__region?", result[0].text)  # type: ignore
@@ -0,0 +1,9 @@
+import unittest
+
+from dbt_mcp.text.tokenize import tokenize
+
+
+class TestTokenize(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(tokenize("stg_Orders-v2"), ["stg", "orders", "v2"])
+        self.assertEqual(tokenize(None), [])